@@ -0,0 +1,80 @@
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.utils.diff_engine import DIFF_ENGINES, git_available  # noqa: E402
+
+SIZES = {"small": 200, "medium": 5_000, "large": 50_000}
+
+
+def make_source(line_count: int, seed: int) -> str:
+    rng = random.Random(seed)
+    templates = [
+        "    value_{n} = compute(value_{m}, {k})\n",
+        "    if value_{n} > {k}:\n",
+        "        return value_{m}\n",
+        "\n",
+        "def handler_{n}(request):\n",
+        "    logger.info('processing {n}')\n",
+        "    }}\n",
+    ]
+    return "".join(
+        rng.choice(templates).format(n=i, m=rng.randrange(line_count), k=rng.randrange(100))
+        for i in range(line_count)
+    )
+
+
+def mutate(content: str, ratio: float, seed: int) -> str:
+    rng = random.Random(seed)
+    lines = content.splitlines(keepends=True)
+    for _ in range(max(1, int(len(lines) * ratio))):
+        index = rng.randrange(len(lines))
+        op = rng.random()
+        if op < 0.4:
+            lines[index] = lines[index].replace("value", "result", 1)
+        elif op < 0.7:
+            lines.insert(index, "    # inserted line\n")
+        else:
+            del lines[index]
+    return "".join(lines)
+
+
+def bench(engine: str, old_lines, new_lines, repeat: int) -> float:
+    diff_fn = DIFF_ENGINES[engine]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        diff_fn(old_lines, new_lines, "/bench.py")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark of the diff engines")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--ratio", type=float, default=0.02, help="fraction of lines mutated")
+    args = parser.parse_args()
+
+    engines = [name for name in DIFF_ENGINES if name != "git" or git_available()]
+    print(f"{'size':>8} {'lines':>7} " + " ".join(f"{name:>12}" for name in engines))
+
+    for label, line_count in SIZES.items():
+        old_content = make_source(line_count, seed=line_count)
+        new_content = mutate(old_content, args.ratio, seed=line_count + 1)
+        old_lines = old_content.splitlines(keepends=True)
+        new_lines = new_content.splitlines(keepends=True)
+
+        results = [bench(name, old_lines, new_lines, args.repeat) for name in engines]
+        print(
+            f"{label:>8} {line_count:>7} "
+            + " ".join(f"{seconds * 1000:>10.1f}ms" for seconds in results)
+        )
+
+
+if __name__ == "__main__":
+    main()
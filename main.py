@@ -6,12 +6,16 @@ from fastapi.middleware.cors import CORSMiddleware
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 from src.router import router as pr_analyzer_router
+from src.utils.diff_pool import DiffProcessPool
+from src.utils.http_client import HttpClient
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("🚀 Starting PR analyzer application...")
     yield
+    HttpClient.close()
+    DiffProcessPool.shutdown()
 
 
 app = FastAPI(
@@ -42,3 +46,8 @@ async def root():
 @app.get("/health", tags=["Sistema"])
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics/http", tags=["Sistema"])
+async def http_metrics():
+    return HttpClient.get_pool_metrics()
@@ -10,6 +10,7 @@ from src.core.nodes.performance_agent_node import performance_analysis_node
 from src.core.nodes.reviewer_agent_node import reviewer_analysis_node
 from src.core.nodes.security_agent_node import security_analysis_node
 from src.core.nodes.setup_rag_node import setup_rag_node
+from src.core.nodes.build_context_node import build_context_node
 from src.core.nodes.aggregate_analyses_node import aggregate_analyses_node
 from src.core.nodes.publish_comments_node import publish_comments_node
 from src.core.nodes.cleanup_node import cleanup_resources_node
@@ -21,6 +22,7 @@ workflow = StateGraph(PRAnalysisState)
 
 workflow.add_node("fetch_pr_data", fetch_pr_data_node)
 workflow.add_node("setup_rag", setup_rag_node)
+workflow.add_node("build_context", build_context_node)
 workflow.add_node("security_agent", security_analysis_node)
 workflow.add_node("performance_agent", performance_analysis_node)
 workflow.add_node("clean_coder_agent", clean_coder_analysis_node)
@@ -35,13 +37,15 @@ workflow.set_entry_point("fetch_pr_data")
 workflow.add_conditional_edges(
     "fetch_pr_data",
     should_continue_or_end,
-    {"reviewer_agent": "setup_rag", "END": END},
+    {"reviewer_agent": "setup_rag", "publish_comments": "publish_comments", "END": END},
 )
 
-workflow.add_edge("setup_rag", "security_agent")
-workflow.add_edge("setup_rag", "performance_agent")
-workflow.add_edge("setup_rag", "clean_coder_agent")
-workflow.add_edge("setup_rag", "logical_agent")
+workflow.add_edge("setup_rag", "build_context")
+
+workflow.add_edge("build_context", "security_agent")
+workflow.add_edge("build_context", "performance_agent")
+workflow.add_edge("build_context", "clean_coder_agent")
+workflow.add_edge("build_context", "logical_agent")
 
 workflow.add_edge("security_agent", "aggregate_analyses")
 workflow.add_edge("performance_agent", "aggregate_analyses")
@@ -2,6 +2,9 @@ import logging
 from typing import Dict, Any
 
 from src.core import PRAnalysisState
+from src.utils.analysis_store import ANALYSIS_KEYS
+from src.utils.diff_parser import DiffParser
+from src.utils.thread_index import normalize_path
 
 logger = logging.getLogger(__name__)
 
@@ -36,4 +39,80 @@ async def aggregate_analyses_node(state: PRAnalysisState) -> Dict[str, Any]:
 
     logger.info("[NODE: aggregate_analyses] ✓ All parallel analyses completed successfully")
 
-    return {}
+    pr_data = state.get("pr_data") or {}
+    updates = _snap_issue_lines(state, pr_data)
+
+    if pr_data.get("incremental"):
+        updates.update(_carry_forward_findings({**state, **updates}, pr_data))
+
+    return updates
+
+
+def _snap_issue_lines(state: PRAnalysisState, pr_data: Dict[str, Any]) -> Dict[str, Any]:
+    files_by_path = {normalize_path(f["path"]): f for f in pr_data.get("files", [])}
+
+    updates = {}
+    moved_total = 0
+    for key in ANALYSIS_KEYS:
+        analysis = state.get(key)
+        if not isinstance(analysis, dict) or not analysis.get("issues"):
+            continue
+
+        issues = []
+        for issue in analysis["issues"]:
+            file_info = files_by_path.get(normalize_path(issue.get("file") or ""))
+            line = issue.get("line")
+            if file_info is None or not file_info.get("diff"):
+                issues.append(issue)
+                continue
+
+            line_index = DiffParser.for_file(file_info).line_index
+            snapped = line_index.resolve(line, issue.get("evidence"))
+            if snapped is None or snapped == line:
+                issues.append(issue)
+                continue
+
+            moved = {**issue, "line": snapped}
+            if isinstance(issue.get("final_line"), int) and isinstance(line, int):
+                moved["final_line"] = max(snapped, issue["final_line"] + snapped - line)
+            issues.append(moved)
+            moved_total += 1
+
+        updates[key] = {**analysis, "issues": issues}
+
+    if moved_total:
+        logger.info(
+            f"[NODE: aggregate_analyses] 🎯 Snapped {moved_total} issue line(s) to changed diff lines"
+        )
+
+    return updates
+
+
+def _carry_forward_findings(state: PRAnalysisState, pr_data: Dict[str, Any]) -> Dict[str, Any]:
+    changed_files = {normalize_path(f["path"]) for f in pr_data.get("files", [])}
+    previous_findings = pr_data.get("previous_findings", {})
+
+    updates = {}
+    carried_total = 0
+    for key in ANALYSIS_KEYS:
+        previous_issues = previous_findings.get(key, {}).get("issues", [])
+        carried = [
+            {**issue, "carried_forward": True}
+            for issue in previous_issues
+            if issue.get("file") and normalize_path(issue["file"]) not in changed_files
+        ]
+        if not carried:
+            continue
+
+        current = dict(state.get(key) or {})
+        current["issues"] = list(current.get("issues", [])) + carried
+        updates[key] = current
+        carried_total += len(carried)
+
+    logger.info(
+        f"[NODE: aggregate_analyses] ♻️ Carried forward {carried_total} finding(s) "
+        f"from untouched files (iteration {pr_data.get('base_iteration_id')} → "
+        f"{pr_data.get('iteration_id')})"
+    )
+
+    return updates
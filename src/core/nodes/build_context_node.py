@@ -0,0 +1,224 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.core.nodes.map_reduce import partition_shards, should_map_reduce
+from src.core.state import PRAnalysisState
+from src.settings import Settings
+from src.utils.context_packer import (
+    ContextPacker,
+    PackedContext,
+    get_token_counter,
+    render_file_stub,
+)
+from src.utils.file_router import route_files
+
+logger = logging.getLogger(__name__)
+
+# Headroom for the one-line title each agent prepends to a packed context.
+AGENT_HEADER_TOKENS = 64
+
+# Agents that read code through search_pr_code and only need the file listing.
+LISTING_AGENTS = ("security", "performance")
+
+SEARCH_HINT = "\n💡 Use a tool `search_pr_code()` para buscar trechos específicos do código!"
+
+_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def packed_agent_budgets() -> Dict[str, int]:
+    return {
+        "logical": Settings.CONTEXT_TOKEN_BUDGET_LOGICAL,
+        "clean_code": Settings.CONTEXT_TOKEN_BUDGET_CLEAN_CODE,
+    }
+
+
+def _context_key(pr_data: Dict[str, Any]) -> Optional[Tuple]:
+    # Without a commit-derived key two different diffs can't be told apart,
+    # so such contexts are rebuilt every time instead of cached.
+    if not pr_data.get("cache_key"):
+        return None
+    return (
+        pr_data.get("pr_id"),
+        pr_data["cache_key"],
+        bool(pr_data.get("incremental")),
+        tuple(sorted(packed_agent_budgets().items())),
+        Settings.MAP_REDUCE_MODE,
+        Settings.MAP_REDUCE_SHARD_TOKENS,
+        Settings.FILE_ROUTING_ENABLED,
+        Settings.FILE_ROUTING_MIN_SCORE,
+    )
+
+
+def build_shared_context(pr_data: Dict[str, Any]) -> Dict[str, Any]:
+    files = pr_data["files"]
+
+    summary = (
+        f"Total de arquivos modificados: {pr_data['total_files']} "
+        f"(+{pr_data['total_additions']} -{pr_data['total_deletions']} linhas)\n"
+    )
+
+    routes = route_files(files)
+
+    by_route: Dict[Tuple, Tuple[PackedContext, List[PackedContext]]] = {}
+    packed = {}
+    shards = {}
+    for agent, budget in packed_agent_budgets().items():
+        route_key = (budget, tuple(routes[agent]))
+        if route_key not in by_route:
+            by_route[route_key] = _pack_routed(files, routes[agent], summary, budget)
+        packed[agent], shards[agent] = by_route[route_key]
+
+    listings = {}
+    for agent in LISTING_AGENTS:
+        listings[agent], shards[agent] = _list_routed(files, routes[agent], summary)
+
+    return {
+        "key": _context_key(pr_data),
+        "summary": summary,
+        "routes": routes,
+        "listings": listings,
+        "packed": packed,
+        "shards": shards,
+    }
+
+
+def _render_file_line(file_change: Dict[str, Any]) -> str:
+    if file_change.get("skipped_reason"):
+        return render_file_stub(file_change, f"sem diff ({file_change['skipped_reason']})")
+    return (
+        f"  • {file_change['path']} ({file_change['change_type']}) "
+        f"+{file_change['additions']} -{file_change['deletions']}"
+    )
+
+
+def _render_other_files(others: List[Dict[str, Any]]) -> str:
+    if not others:
+        return ""
+    return "\n".join(
+        ["\n## Demais arquivos do PR (fora do foco desta análise):\n"]
+        + [_render_file_line(file_change) for file_change in others]
+    )
+
+
+def _not_routed(files: List[Dict[str, Any]], routed: List[int]) -> List[Dict[str, Any]]:
+    routed_positions = set(routed)
+    return [file for position, file in enumerate(files) if position not in routed_positions]
+
+
+def _render_listing(files: List[Dict[str, Any]], others: List[Dict[str, Any]]) -> str:
+    listing_parts = ["\n## Arquivos Modificados:\n"]
+    listing_parts.extend(_render_file_line(file_change) for file_change in files)
+    if others:
+        listing_parts.append(_render_other_files(others))
+    listing_parts.append(SEARCH_HINT)
+    return "\n".join(listing_parts)
+
+
+def _list_routed(
+    files: List[Dict[str, Any]], routed: List[int], summary: str
+) -> Tuple[str, List[PackedContext]]:
+    relevant = [files[position] for position in routed]
+    listing = _render_listing(relevant, _not_routed(files, routed))
+
+    if not should_map_reduce(relevant):
+        return listing, []
+
+    # Reuse the token-balanced diff partition so each shard lists the files
+    # whose code it is expected to search, without inlining the diffs.
+    by_path = {file_change["path"]: file_change for file_change in relevant}
+    diff_shards = partition_shards(relevant, header=summary)
+    count = get_token_counter().count
+
+    shards = []
+    for position, diff_shard in enumerate(diff_shards, start=1):
+        paths = list(dict.fromkeys(diff_shard.packed_files + diff_shard.dropped_files))
+        text = (
+            f"{summary}\n## Parte {position} de {len(diff_shards)} do PR\n"
+            + _render_listing([by_path[path] for path in paths], [])
+        )
+        shard = PackedContext(text, Settings.MAP_REDUCE_SHARD_TOKENS)
+        shard.packed_files = paths
+        shard.total_tokens = count(text)
+        shards.append(shard)
+
+    return listing, shards
+
+
+def _pack_routed(
+    files: List[Dict[str, Any]], routed: List[int], summary: str, budget: int
+) -> Tuple[PackedContext, List[PackedContext]]:
+    relevant = [files[position] for position in routed]
+    footer = _render_other_files(_not_routed(files, routed))
+
+    packed = ContextPacker(budget - AGENT_HEADER_TOKENS).pack(
+        relevant, header=summary, footer=footer
+    )
+    shards = partition_shards(relevant, header=summary) if should_map_reduce(relevant) else []
+    return packed, shards
+
+
+def get_shared_context(state: PRAnalysisState) -> Dict[str, Any]:
+    pr_data = state["pr_data"]
+    key = _context_key(pr_data)
+
+    # The state only ever holds this run's context, so it is safe to reuse
+    # even when there is no key for the process-wide cache.
+    shared = state.get("shared_context")
+    if shared is not None and shared.get("key") == key:
+        return shared
+
+    if key is None:
+        logger.warning(
+            f"[NODE: build_context] PR #{pr_data.get('pr_id')} has no cache_key, "
+            f"building shared context without caching"
+        )
+        return build_shared_context(pr_data)
+
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    shared = build_shared_context(pr_data)
+
+    with _cache_lock:
+        _cache[key] = shared
+        while len(_cache) > Settings.SHARED_CONTEXT_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+    return shared
+
+
+def compose_context(title: str, *sections: str) -> str:
+    return "\n".join([title, *sections])
+
+
+def build_context_node(state: PRAnalysisState) -> Dict[str, Any]:
+    pr_data: Optional[Dict[str, Any]] = state.get("pr_data")
+    if pr_data is None:
+        error_msg = "Cannot build context: pr_data is None"
+        logger.error(f"[NODE: build_context] {error_msg}")
+        return {"error": error_msg}
+
+    shared = get_shared_context(state)
+
+    for agent, packed in shared["packed"].items():
+        logger.info(f"[NODE: build_context] 📦 {agent}: {packed.describe()}")
+
+    for agent, agent_shards in shared["shards"].items():
+        if agent_shards:
+            logger.info(
+                f"[NODE: build_context] 🗂️ {agent}: map-reduce over {len(agent_shards)} shard(s) "
+                f"of up to {Settings.MAP_REDUCE_SHARD_TOKENS} tokens"
+            )
+
+    logger.info(
+        f"[NODE: build_context] ✓ Shared context ready for PR #{pr_data['pr_id']} "
+        f"({len(pr_data['files'])} files)"
+    )
+
+    return {"shared_context": shared}
@@ -1,12 +1,11 @@
 import logging
 from typing import Dict, Any
-from pydantic import ValidationError
 
 from src.core import PRAnalysisState
-from src.providers import AgentManager
+from src.core.nodes.build_context_node import compose_context, get_shared_context
+from src.core.nodes.map_reduce import invoke_agent, map_reduce_analysis
 from src.providers.tools.shared_tools import search_knowledge, search_pr_code
 from src.schemas import CleanCodeAnalysis
-from src.utils.json_parser import parse_llm_json_response
 from src.utils.issue_classifier import IssueClassifier
 
 logger = logging.getLogger(__name__)
@@ -35,53 +34,25 @@ async def clean_coder_analysis_node(state: PRAnalysisState) -> Dict[str, Any]:
         f"({total_files} files, +{pr_data['total_additions']}/-{pr_data['total_deletions']} lines)"
     )
 
-    context_parts = []
-    context_parts.append(f"# Pull Request #{pr_id} - Análise de Clean Code\n")
-    context_parts.append(
-        f"Total de arquivos modificados: {total_files} "
-        f"(+{pr_data['total_additions']} -{pr_data['total_deletions']} linhas)\n"
-    )
-
-    for file_change in files:
-        context_parts.append(f"\n## Arquivo: {file_change['path']}")
-        context_parts.append(f"Tipo de mudança: {file_change['change_type']}")
-        context_parts.append(
-            f"Linhas: +{file_change['additions']} -{file_change['deletions']}"
-        )
-        context_parts.append(f"\n```diff\n{file_change['diff']}\n```")
+    title = f"# Pull Request #{pr_id} - Análise de Clean Code\n"
+    shared = get_shared_context(state)
+    shards = shared["shards"]["clean_code"]
+    packed = shared["packed"]["clean_code"]
+    context = compose_context(title, packed.text)
 
-    context = "\n".join(context_parts)
+    logger.info(f"[NODE: clean_code_analysis] 📦 Context packed: {packed.describe()}")
 
     try:
-        callback = AgentManager.get_callback(verbose=True)
-
-        agent = AgentManager.get_agents(
-            tools=[search_knowledge, search_pr_code], agent_name="CleanCoder"
-        )
-
-        response = await agent.ainvoke(
-            {"context": context}, config={"callbacks": [callback]}
-        )
-
-        callback.print_summary()
-
-        if isinstance(response, dict) and "output" in response:
-            analysis_text = response["output"]
-        elif hasattr(response, "content"):
-            if isinstance(response.content, list):
-                analysis_text = str(response.content)
-            else:
-                analysis_text = response.content
+        tools = [search_knowledge, search_pr_code]
+        if shards:
+            logger.info(f"[NODE: clean_code_analysis] 🗂️ Map-reduce over {len(shards)} shard(s)")
+            analysis_result = await map_reduce_analysis(
+                shards, title, "CleanCoder", tools, CleanCodeAnalysis, "clean_code_analysis"
+            )
         else:
-            analysis_text = str(response)
-
-        parsed_data = parse_llm_json_response(analysis_text)
-
-        try:
-            analysis_result = CleanCodeAnalysis(**parsed_data)
-        except ValidationError as e:
-            logger.warning(f"[NODE: clean_code_analysis] Validation error, using fallback: {e}")
-            analysis_result = CleanCodeAnalysis(issues=[], summary="Validation failed")
+            analysis_result = await invoke_agent(
+                "CleanCoder", tools, context, CleanCodeAnalysis, "clean_code_analysis"
+            )
 
         for issue in analysis_result.issues:
             issue.agent_type = "CleanCoder"
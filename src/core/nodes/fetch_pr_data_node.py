@@ -1,17 +1,60 @@
+import asyncio
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 
+from src.core.nodes.aggregate_analyses_node import _carry_forward_findings
+from src.core.nodes.streaming_pipeline import StreamingPRPipeline
 from src.core.state import PRAnalysisState
+from src.settings import Settings
+from src.utils.analysis_store import AnalysisStore
 from src.utils.azure_requests import AzureManager
+from src.utils.diff_compactor import compact_files
+from src.utils.diff_parser import DiffParser
+from src.utils.git_mirror import GitMirrorManager
 
 logger = logging.getLogger(__name__)
 
 
-def fetch_pr_data_node(state: PRAnalysisState) -> Dict[str, Any]:
+async def fetch_pr_data_node(state: PRAnalysisState) -> Dict[str, Any]:
     pr_id = state["pr_id"]
     logger.info(f"[NODE: fetch_pr_data] Starting to fetch consolidated PR #{pr_id}")
 
-    pr_data = AzureManager.get_pr_consolidated_changes(pr_id)
+    if (
+        Settings.STREAMING_PIPELINE_ENABLED
+        and not state.get("incremental")
+        and Settings.PR_FETCH_BACKEND == "rest"
+    ):
+        streamed = await _fetch_with_streaming_pipeline(pr_id)
+        if streamed is not None:
+            pr_data, rag_manager = streamed
+            return {"pr_data": pr_data, "_rag_manager": rag_manager}
+
+    return await asyncio.to_thread(_fetch_pr_data, state)
+
+
+def _fetch_pr_data(state: PRAnalysisState) -> Dict[str, Any]:
+    pr_id = state["pr_id"]
+
+    pr_data = None
+    if state.get("incremental"):
+        previous = AnalysisStore.load(pr_id)
+        if previous and previous.get("source_commit"):
+            pr_data = AzureManager.get_pr_incremental_changes(
+                pr_id, previous["source_commit"]
+            )
+            if pr_data is not None:
+                pr_data["previous_findings"] = previous.get("findings", {})
+        if pr_data is None:
+            logger.info(
+                f"[NODE: fetch_pr_data] No usable previous analysis for PR #{pr_id}, "
+                f"falling back to full analysis"
+            )
+
+    if pr_data is None and Settings.PR_FETCH_BACKEND == "git":
+        pr_data = _fetch_with_git_mirror(pr_id)
+
+    if pr_data is None:
+        pr_data = AzureManager.get_pr_consolidated_changes(pr_id)
 
     if pr_data is None:
         error_msg = (
@@ -20,6 +63,20 @@ def fetch_pr_data_node(state: PRAnalysisState) -> Dict[str, Any]:
         logger.error(f"[NODE: fetch_pr_data] {error_msg}")
         return {"error": error_msg}
 
+    if pr_data.get("incremental") and not pr_data["files"]:
+        logger.info(
+            f"[NODE: fetch_pr_data] ⏭️ PR #{pr_id} has no changes since iteration "
+            f"{pr_data.get('base_iteration_id')}, skipping agents and keeping previous findings"
+        )
+        return {
+            "pr_data": pr_data,
+            "published_comments": [],
+            **_carry_forward_findings(state, pr_data),
+        }
+
+    DiffParser.attach_parsed(pr_data["files"])
+    _compact_diffs(pr_data)
+
     logger.info(
         f"[NODE: fetch_pr_data] ✓ PR #{pr_id} fetched successfully "
         f"({pr_data['source_branch']} → {pr_data['target_branch']}): "
@@ -28,3 +85,53 @@ def fetch_pr_data_node(state: PRAnalysisState) -> Dict[str, Any]:
     )
 
     return {"pr_data": pr_data}
+
+
+def _compact_diffs(pr_data: Dict[str, Any]) -> None:
+    stats = compact_files(pr_data["files"])
+    pr_data["compaction"] = stats
+
+    if stats["files_compacted"]:
+        logger.info(
+            f"[NODE: fetch_pr_data] 🗜️ Compacted {stats['files_compacted']} diff(s) for LLM input: "
+            f"{stats['original_tokens']} → {stats['compact_tokens']} tokens "
+            f"({stats['saved_tokens']} saved)"
+        )
+
+
+async def _fetch_with_streaming_pipeline(pr_id: int) -> Optional[Tuple[Dict[str, Any], Any]]:
+    try:
+        result = await StreamingPRPipeline(pr_id).run()
+    except Exception as e:
+        logger.error(f"[NODE: fetch_pr_data] Streaming pipeline failed: {e}")
+        result = None
+
+    if result is None:
+        logger.warning(
+            f"[NODE: fetch_pr_data] Falling back to staged fetch for PR #{pr_id}"
+        )
+        return None
+
+    pr_data, _ = result
+    logger.info(
+        f"[NODE: fetch_pr_data] ✓ PR #{pr_id} streamed and indexed "
+        f"({pr_data['source_branch']} → {pr_data['target_branch']}): "
+        f"{pr_data['total_files']} files changed, "
+        f"+{pr_data['total_additions']}/-{pr_data['total_deletions']} lines"
+    )
+    return result
+
+
+def _fetch_with_git_mirror(pr_id: int) -> Optional[Dict[str, Any]]:
+    try:
+        pr_info = AzureManager.get_pr_info(pr_id)
+        pr_data = GitMirrorManager().get_pr_consolidated_changes(pr_id, pr_info)
+    except Exception as e:
+        logger.error(f"[NODE: fetch_pr_data] Git mirror backend failed: {e}")
+        pr_data = None
+
+    if pr_data is None:
+        logger.warning(
+            f"[NODE: fetch_pr_data] Falling back to REST backend for PR #{pr_id}"
+        )
+    return pr_data
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import math
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from src.providers.agents import AgentManager
+from src.settings import Settings
+from src.utils.context_packer import (
+    ContextPacker,
+    PackedContext,
+    default_priority,
+    get_token_counter,
+    llm_diff,
+    render_file_section,
+)
+from src.utils.json_parser import parse_llm_json_response
+from src.utils.thread_index import normalize_path
+
+logger = logging.getLogger(__name__)
+
+# Room for the shard header, the search hint and line joins around packed sections.
+SHARD_OVERHEAD_TOKENS = 96
+
+PRIORITY_RANK = {"baixa": 0, "média": 1, "media": 1, "alta": 2, "crítica": 3, "critica": 3}
+
+_TEXT_PATTERN = re.compile(r"\W+")
+
+
+def _section_tokens(file_info: Dict) -> int:
+    return get_token_counter().count(render_file_section(file_info))
+
+
+def should_map_reduce(files: List[Dict]) -> bool:
+    mode = Settings.MAP_REDUCE_MODE
+    if mode == "never":
+        return False
+    if mode == "always":
+        return True
+
+    total = sum(_section_tokens(f) for f in files if f.get("diff") and not f.get("skipped_reason"))
+    return total > Settings.MAP_REDUCE_THRESHOLD_TOKENS
+
+
+def split_file_windows(file_info: Dict, max_tokens: int) -> List[Dict]:
+    if _section_tokens(file_info) <= max_tokens:
+        return [file_info]
+
+    header: List[str] = []
+    hunks: List[List[str]] = []
+    for line in llm_diff(file_info).split("\n"):
+        if line.startswith("@@"):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            header.append(line)
+
+    if len(hunks) < 2:
+        return [file_info]
+
+    count = get_token_counter().count
+    header_tokens = count("\n".join(header)) + _section_tokens({**file_info, "compact_diff": ""})
+
+    groups: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = header_tokens
+    for hunk in hunks:
+        hunk_text = "\n".join(hunk)
+        hunk_tokens = count(hunk_text) + 1
+        if current and current_tokens + hunk_tokens > max_tokens:
+            groups.append(current)
+            current, current_tokens = [], header_tokens
+        current.append(hunk_text)
+        current_tokens += hunk_tokens
+    groups.append(current)
+
+    windows = []
+    for position, group in enumerate(groups, start=1):
+        note = f"⋯ Trecho {position} de {len(groups)} do diff deste arquivo"
+        windows.append(
+            {**file_info, "compact_diff": "\n".join([*header, note, *group]), "window": position}
+        )
+    return windows
+
+
+def partition_shards(files: List[Dict], header: str = "") -> List[PackedContext]:
+    count = get_token_counter().count
+    shard_tokens = Settings.MAP_REDUCE_SHARD_TOKENS
+    max_shards = max(1, Settings.MAP_REDUCE_MAX_SHARDS)
+    capacity = max(1, shard_tokens - count(header) - SHARD_OVERHEAD_TOKENS)
+
+    pieces: List[Tuple[int, int, Dict]] = []
+    for file_info in files:
+        if not file_info.get("diff") or file_info.get("skipped_reason"):
+            continue
+        for window in split_file_windows(file_info, capacity):
+            # +1 for the line join around each packed section.
+            pieces.append((_section_tokens(window) + 1, len(pieces), window))
+
+    if not pieces:
+        return []
+
+    dropped: List[Dict] = []
+    room = capacity * max_shards
+    if sum(tokens for tokens, _, _ in pieces) > room:
+        # More diff than the shard cap can hold: keep the highest-priority
+        # sections and leave the rest out instead of overrunning the budget.
+        kept = []
+        for piece in sorted(pieces, key=lambda piece: (-default_priority(piece[2]), piece[1])):
+            if piece[0] <= room:
+                kept.append(piece)
+                room -= piece[0]
+            else:
+                dropped.append(piece[2])
+        pieces = kept
+
+    total = sum(tokens for tokens, _, _ in pieces)
+    shard_count = max(1, min(max_shards, math.ceil(total / capacity)))
+
+    # Largest pieces first onto the lightest shard keeps token loads balanced.
+    # A piece that overflows the lightest shard opens a new one while the cap
+    # allows; otherwise it is left out.
+    loads = [0] * shard_count
+    assigned: List[List[Tuple[int, Dict]]] = [[] for _ in range(shard_count)]
+    for tokens, order, window in sorted(pieces, key=lambda piece: (-piece[0], piece[1])):
+        shard = min(range(len(loads)), key=loads.__getitem__)
+        if loads[shard] + tokens > capacity:
+            if len(loads) >= max_shards:
+                dropped.append(window)
+                continue
+            loads.append(0)
+            assigned.append([])
+            shard = len(loads) - 1
+        loads[shard] += tokens
+        assigned[shard].append((order, window))
+
+    if dropped:
+        logger.warning(
+            f"[MAP_REDUCE] Shard cap ({max_shards}) reached: left out {len(dropped)} "
+            f"lower-priority diff section(s): "
+            + ", ".join(sorted({window["path"] for window in dropped}))
+        )
+
+    non_empty = [sorted(shard) for shard in assigned if shard]
+    shards = []
+    for position, shard in enumerate(non_empty, start=1):
+        shard_header = f"{header}\n## Parte {position} de {len(non_empty)} do PR\n"
+        shards.append(
+            ContextPacker(shard_tokens).pack([window for _, window in shard], header=shard_header)
+        )
+
+    return shards
+
+
+def extract_response_text(response: Any) -> str:
+    if isinstance(response, dict) and "output" in response:
+        return response["output"]
+    if hasattr(response, "content"):
+        if isinstance(response.content, list):
+            return str(response.content)
+        return response.content
+    return str(response)
+
+
+async def invoke_agent(
+    agent_name: str, tools: List, context: str, schema: Type[BaseModel], log_tag: str
+) -> BaseModel:
+    callback = AgentManager.get_callback(verbose=True)
+    agent = AgentManager.get_agents(tools=tools, agent_name=agent_name)
+
+    response = await agent.ainvoke({"context": context}, config={"callbacks": [callback]})
+
+    callback.print_summary()
+
+    parsed_data = parse_llm_json_response(extract_response_text(response))
+
+    try:
+        return schema(**parsed_data)
+    except ValidationError as e:
+        logger.warning(f"[NODE: {log_tag}] Validation error, using fallback: {e}")
+        return schema(issues=[], summary="Validation failed")
+
+
+def _issue_key(issue: Dict) -> Tuple:
+    label = issue.get("title") or issue.get("type") or issue.get("description") or ""
+    return (
+        normalize_path(issue.get("file") or ""),
+        issue.get("line"),
+        _TEXT_PATTERN.sub(" ", label.lower()).strip()[:80],
+    )
+
+
+def _priority_rank(issue: Dict) -> int:
+    return PRIORITY_RANK.get((issue.get("priority") or "").strip().lower(), -1)
+
+
+def merge_issues(issue_lists: List[List[Dict]]) -> List[Dict]:
+    merged: Dict[Tuple, Dict] = {}
+    for issues in issue_lists:
+        for issue in issues:
+            key = _issue_key(issue)
+            current = merged.get(key)
+            if current is None or _priority_rank(issue) > _priority_rank(current):
+                merged[key] = issue
+    return list(merged.values())
+
+
+async def map_reduce_analysis(
+    shards: List[PackedContext],
+    title: str,
+    agent_name: str,
+    tools: List,
+    schema: Type[BaseModel],
+    log_tag: str,
+) -> BaseModel:
+    semaphore = asyncio.Semaphore(max(1, Settings.MAP_REDUCE_CONCURRENCY))
+
+    async def run_shard(position: int, shard: PackedContext) -> Optional[BaseModel]:
+        async with semaphore:
+            logger.info(
+                f"[NODE: {log_tag}] 🧩 Shard {position}/{len(shards)}: {shard.describe()}"
+            )
+            try:
+                return await invoke_agent(
+                    agent_name, tools, f"{title}\n{shard.text}", schema, log_tag
+                )
+            except Exception as e:
+                logger.warning(f"[NODE: {log_tag}] ⚠️ Shard {position}/{len(shards)} failed: {e}")
+                return None
+
+    results = await asyncio.gather(
+        *(run_shard(position, shard) for position, shard in enumerate(shards, start=1))
+    )
+    completed = [result for result in results if result is not None]
+    if not completed:
+        raise RuntimeError(f"all {len(shards)} shard(s) failed")
+
+    issue_lists = [[issue.model_dump() for issue in result.issues] for result in completed]
+    issues = merge_issues(issue_lists)
+    summaries = [result.summary for result in completed if result.summary]
+
+    logger.info(
+        f"[NODE: {log_tag}] 🔗 Reduced {sum(len(i) for i in issue_lists)} issue(s) "
+        f"from {len(completed)}/{len(shards)} shard(s) into {len(issues)}"
+    )
+
+    return schema(issues=issues, summary="\n\n".join(summaries) or None)
@@ -2,6 +2,7 @@ import logging
 from typing import Dict, Any
 
 from src.core.state import PRAnalysisState
+from src.utils.analysis_store import AnalysisStore
 from src.utils.azure_requests import AzureManager
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,8 @@ def publish_comments_node(state: PRAnalysisState) -> Dict[str, Any]:
             "error": "No PR ID available for publishing comments"
         }
 
+    AnalysisStore.record_from_state(state)
+
     reviewer_analysis = state.get("reviewer_analysis")
 
     if not reviewer_analysis or not reviewer_analysis.get("comments"):
@@ -62,6 +65,13 @@ def publish_comments_node(state: PRAnalysisState) -> Dict[str, Any]:
         f"comments published successfully"
     )
 
+    if publication_stats.get("skipped") or publication_stats.get("replied"):
+        logger.info(
+            f"[NODE: publish_comments] ♻️ Reused existing threads: "
+            f"{publication_stats.get('skipped', 0)} unchanged, "
+            f"{publication_stats.get('replied', 0)} updated with a reply"
+        )
+
     if publication_stats['failed'] > 0:
         logger.warning(
             f"[NODE: publish_comments] ⚠️ {publication_stats['failed']} comments "
@@ -1,12 +1,11 @@
 import logging
 from typing import Dict, Any
-from pydantic import ValidationError
 
 from src.core.state import PRAnalysisState
-from src.providers.agents import AgentManager
+from src.core.nodes.build_context_node import compose_context, get_shared_context
+from src.core.nodes.map_reduce import invoke_agent, map_reduce_analysis
 from src.providers.tools.shared_tools import search_knowledge, search_pr_code
 from src.schemas import SecurityAnalysis
-from src.utils.json_parser import parse_llm_json_response
 from src.utils.issue_classifier import IssueClassifier
 
 from src.providers.prompts.security import Security
@@ -38,56 +37,22 @@ async def security_analysis_node(state: PRAnalysisState) -> Dict[str, Any]:
         f"({total_files} files, +{pr_data['total_additions']}/-{pr_data['total_deletions']} lines)"
     )
 
-    context_parts = []
-    context_parts.append(f"# Pull Request #{pr_id} - Análise de Segurança\n")
-    context_parts.append(
-        f"Total de arquivos modificados: {total_files} "
-        f"(+{pr_data['total_additions']} -{pr_data['total_deletions']} linhas)\n"
-    )
-    context_parts.append("\n## Arquivos Modificados:\n")
-
-    for file_change in files:
-        context_parts.append(
-            f"  • {file_change['path']} ({file_change['change_type']}) "
-            f"+{file_change['additions']} -{file_change['deletions']}"
-        )
-
-    context_parts.append(
-        "\n💡 Use a tool `search_pr_code()` para buscar trechos específicos do código!"
-    )
-
-    context = "\n".join(context_parts)
+    title = f"# Pull Request #{pr_id} - Análise de Segurança\n"
+    shared = get_shared_context(state)
+    shards = shared["shards"]["security"]
+    context = compose_context(title, shared["summary"], shared["listings"]["security"])
 
     try:
-        callback = AgentManager.get_callback(verbose=True)
-
-        agent = AgentManager.get_agents(
-            tools=[search_knowledge, search_pr_code], agent_name="Security"
-        )
-
-        response = await agent.ainvoke(
-            {"context": context}, config={"callbacks": [callback]}
-        )
-
-        callback.print_summary()
-
-        if isinstance(response, dict) and "output" in response:
-            analysis_text = response["output"]
-        elif hasattr(response, "content"):
-            if isinstance(response.content, list):
-                analysis_text = str(response.content)
-            else:
-                analysis_text = response.content
+        tools = [search_knowledge, search_pr_code]
+        if shards:
+            logger.info(f"[NODE: security_analysis] 🗂️ Map-reduce over {len(shards)} shard(s)")
+            analysis_result = await map_reduce_analysis(
+                shards, title, "Security", tools, SecurityAnalysis, "security_analysis"
+            )
         else:
-            analysis_text = str(response)
-
-        parsed_data = parse_llm_json_response(analysis_text)
-
-        try:
-            analysis_result = SecurityAnalysis(**parsed_data)
-        except ValidationError as e:
-            logger.warning(f"[NODE: security_analysis] Validation error, using fallback: {e}")
-            analysis_result = SecurityAnalysis(issues=[], summary="Validation failed")
+            analysis_result = await invoke_agent(
+                "Security", tools, context, SecurityAnalysis, "security_analysis"
+            )
 
         for issue in analysis_result.issues:
             issue.agent_type = "Security"
@@ -17,6 +17,14 @@ def setup_rag_node(state: PRAnalysisState) -> Dict[str, Any]:
         logger.error("[NODE: setup_rag] No pr_data in state, cannot create RAG")
         return {"error": "Missing pr_data for RAG creation"}
 
+    existing = state.get("_rag_manager")
+    if existing is not None and existing.vectorstore is not None:
+        set_rag_manager(existing)
+        logger.info(
+            f"[NODE: setup_rag] ✅ Reusing RAG built by the streaming pipeline for PR #{pr_id}"
+        )
+        return {"rag_created": True}
+
     logger.info(f"[NODE: setup_rag] Creating RAG for PR #{pr_id}")
 
     try:
@@ -0,0 +1,327 @@
+import asyncio
+import logging
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.providers.rag_manager import RAGManager
+from src.settings import Settings
+from src.utils.azure_requests import AzureManager
+from src.utils.diff_compactor import compact_files
+from src.utils.diff_parser import DiffParser
+from src.utils.diff_pool import DiffProcessPool, job_size
+from src.utils.file_filters import (
+    SkippedBlob,
+    build_stat_only_entry,
+    filter_analyzable_files,
+    plan_file_fetches,
+)
+from src.utils.rename_detection import (
+    is_rename,
+    mark_renamed,
+    original_path,
+    split_rename_candidates,
+)
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class StreamingPRPipeline:
+    def __init__(self, pr_id: int, rag_manager: Optional[RAGManager] = None):
+        self.pr_id = pr_id
+        self.rag_manager = rag_manager or RAGManager()
+        self.files: Dict[int, Dict[str, Any]] = {}
+        self.common_commit: Optional[str] = None
+        self.target_commit: Optional[str] = None
+        self.truncated = False
+        self.chunks_indexed = 0
+        self.compaction = {
+            "files_compacted": 0,
+            "original_tokens": 0,
+            "compact_tokens": 0,
+            "saved_tokens": 0,
+        }
+
+    async def run(self) -> Optional[Tuple[Dict[str, Any], RAGManager]]:
+        pr_info = await asyncio.to_thread(AzureManager.get_pr_info, self.pr_id)
+
+        source_ref = pr_info.get("sourceRefName")
+        target_ref = pr_info.get("targetRefName")
+        source_commit = (pr_info.get("lastMergeSourceCommit") or {}).get("commitId")
+        merge_target_commit = (pr_info.get("lastMergeTargetCommit") or {}).get("commitId")
+
+        if not source_ref or not target_ref or not source_commit or not merge_target_commit:
+            logger.error(f"[PIPELINE] Missing branch references or merge commits in PR #{self.pr_id}")
+            return None
+
+        queue_size = Settings.STREAMING_QUEUE_SIZE
+        fetch_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        diff_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        index_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+        fetchers = [
+            asyncio.create_task(self._fetch_worker(fetch_queue, diff_queue))
+            for _ in range(Settings.AZURE_FETCH_CONCURRENCY)
+        ]
+        differs = [
+            asyncio.create_task(self._diff_worker(diff_queue, index_queue))
+            for _ in range(os.cpu_count() or 1)
+        ]
+        indexer = asyncio.create_task(self._index_worker(index_queue))
+        producer = asyncio.create_task(
+            self._produce(fetch_queue, index_queue, merge_target_commit, source_commit)
+        )
+
+        async def drain() -> None:
+            await producer
+            for _ in fetchers:
+                await fetch_queue.put(_DONE)
+            await asyncio.gather(*fetchers)
+            for _ in differs:
+                await diff_queue.put(_DONE)
+            await asyncio.gather(*differs)
+            await index_queue.put(_DONE)
+            await indexer
+
+        # Any stage failing must stop the others, or a producer blocked on a
+        # full queue would wait forever for consumers that are already gone.
+        tasks = [producer, *fetchers, *differs, indexer, asyncio.create_task(drain())]
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        failure = next((task.exception() for task in done if task.exception()), None)
+
+        if failure is not None:
+            logger.error(f"[PIPELINE] Streaming pipeline failed for PR #{self.pr_id}: {failure}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return None
+
+        processed_files = [self.files[index] for index in sorted(self.files)]
+        total_additions = sum(f["additions"] for f in processed_files)
+        total_deletions = sum(f["deletions"] for f in processed_files)
+
+        logger.info(
+            f"[PIPELINE] ✓ PR #{self.pr_id} streamed: {len(processed_files)} files, "
+            f"+{total_additions}/-{total_deletions} lines, {self.chunks_indexed} chunks indexed"
+        )
+
+        pr_data = {
+            "pr_id": self.pr_id,
+            "source_branch": source_ref.replace("refs/heads/", ""),
+            "target_branch": target_ref.replace("refs/heads/", ""),
+            "total_files": len(processed_files),
+            "total_additions": total_additions,
+            "total_deletions": total_deletions,
+            "files": processed_files,
+            "truncated": self.truncated,
+            "incremental": False,
+            "source_commit": source_commit,
+            "target_commit": merge_target_commit,
+            "common_commit": self.common_commit,
+            "cache_key": AzureManager.commit_pair_key(merge_target_commit, source_commit),
+            "iteration_id": None,
+            "compaction": self.compaction,
+        }
+        return pr_data, self.rag_manager
+
+    async def _produce(
+        self,
+        fetch_queue: asyncio.Queue,
+        index_queue: asyncio.Queue,
+        base_commit: str,
+        target_commit: str,
+    ) -> None:
+        pages = AzureManager.iter_commit_diff_pages(
+            base_commit=base_commit, target_commit=target_commit
+        )
+        index = 0
+        rename_candidates: List[Dict] = []
+
+        while True:
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+
+            if self.common_commit is None:
+                self.common_commit = page.get("commonCommit")
+                self.target_commit = page.get("targetCommit")
+            self.truncated = self.truncated or page.get("truncated", False)
+
+            changes = [
+                change
+                for change in page.get("changes", [])
+                if change.get("item", {}).get("path")
+            ]
+            changes, candidates = split_rename_candidates(changes)
+            rename_candidates.extend(candidates)
+
+            index = await self._enqueue(fetch_queue, changes, index)
+
+        if rename_candidates:
+            await self._pair_renames(index_queue, rename_candidates, index)
+
+    async def _pair_renames(
+        self, index_queue: asyncio.Queue, rename_candidates: List[Dict], index: int
+    ) -> None:
+        # Pairing needs every add and delete at once, so the held-back changes
+        # go through the staged path: exact and similarity renames, bulk fetch.
+        files = await asyncio.to_thread(
+            AzureManager.fetch_file_changes,
+            rename_candidates,
+            self.common_commit,
+            self.target_commit,
+        )
+        for file_info in files:
+            self.files[index] = file_info
+            index += 1
+            if file_info.get("skipped_reason"):
+                continue
+            await self._finish(file_info, index_queue)
+
+    async def _enqueue(self, fetch_queue: asyncio.Queue, changes: List[Dict], index: int) -> int:
+        fetch_plan = plan_file_fetches(changes)
+        blob_ids = [
+            blob_id
+            for change, stat_entry in fetch_plan
+            if stat_entry is None
+            for blob_id in AzureManager.blob_ids_for_change(change)
+            if blob_id
+        ]
+        bulk_blobs = None
+        if Settings.AZURE_BULK_FETCH and blob_ids:
+            bulk_blobs = await asyncio.to_thread(AzureManager.get_blobs_bulk, blob_ids)
+
+        for change, stat_entry in fetch_plan:
+            if stat_entry is not None:
+                self.files[index] = stat_entry
+            else:
+                await fetch_queue.put((index, change, bulk_blobs))
+            index += 1
+        return index
+
+    async def _fetch_worker(self, fetch_queue: asyncio.Queue, diff_queue: asyncio.Queue) -> None:
+        while True:
+            job = await fetch_queue.get()
+            if job is _DONE:
+                return
+
+            index, change, bulk_blobs = job
+            file_path = change["item"]["path"]
+            old_id, new_id = AzureManager.blob_ids_for_change(change)
+            change_type = (change.get("changeType") or "").lower()
+
+            old_content, new_content = await asyncio.gather(
+                self._maybe_fetch(
+                    "add" not in change_type,
+                    bulk_blobs,
+                    AzureManager.get_old_file_content,
+                    self.common_commit,
+                    original_path(change) or file_path,
+                    old_id,
+                ),
+                self._maybe_fetch(
+                    "delete" not in change_type,
+                    bulk_blobs,
+                    AzureManager.get_target_file_content,
+                    self.target_commit,
+                    file_path,
+                    new_id,
+                ),
+            )
+
+            skipped = next(
+                (c for c in (old_content, new_content) if isinstance(c, SkippedBlob)), None
+            )
+            if skipped is not None:
+                logger.info(f"[PIPELINE] Keeping {file_path} as stats only ({skipped.reason})")
+                self.files[index] = build_stat_only_entry(change, skipped.reason)
+                continue
+
+            await diff_queue.put((index, change, old_content, new_content))
+
+    @staticmethod
+    async def _maybe_fetch(
+        enabled: bool,
+        bulk_blobs: Optional[Dict[str, Any]],
+        fetch_fn,
+        commit: Optional[str],
+        file_path: str,
+        blob_id: Optional[str],
+    ) -> Any:
+        if not enabled:
+            return None
+        if bulk_blobs is not None and blob_id in bulk_blobs:
+            return bulk_blobs[blob_id]
+        return await asyncio.to_thread(fetch_fn, commit, file_path, blob_id)
+
+    async def _diff_worker(self, diff_queue: asyncio.Queue, index_queue: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+
+        while True:
+            job = await diff_queue.get()
+            if job is _DONE:
+                return
+
+            index, change, old_content, new_content = job
+            diff_job = (old_content, new_content, change["item"]["path"])
+
+            diff_result = None
+            if (
+                Settings.DIFF_PROCESS_POOL_ENABLED
+                and job_size(diff_job) >= Settings.DIFF_PROCESS_MIN_BYTES
+            ):
+                executor = DiffProcessPool.get_executor()
+                try:
+                    diff_result = await loop.run_in_executor(
+                        executor, AzureManager.calculate_diff, *diff_job
+                    )
+                except BrokenProcessPool as e:
+                    logger.warning(
+                        f"[PIPELINE] Process pool broke ({e}), diffing {diff_job[2]} in a thread"
+                    )
+                    DiffProcessPool.discard(executor)
+            if diff_result is None:
+                diff_result = await asyncio.to_thread(AzureManager.calculate_diff, *diff_job)
+
+            diff_result["change_type_azure"] = change.get("changeType")
+            diff_result["object_id"] = change.get("item", {}).get("objectId")
+            if is_rename(change):
+                mark_renamed(diff_result, original_path(change))
+            self.files[index] = diff_result
+            await self._finish(diff_result, index_queue)
+
+    async def _finish(self, diff_result: Dict[str, Any], index_queue: asyncio.Queue) -> None:
+        DiffParser.for_file(diff_result)
+        for key, value in compact_files([diff_result]).items():
+            self.compaction[key] += value
+
+        analyzable, _ = filter_analyzable_files([diff_result])
+        if analyzable:
+            await index_queue.put(diff_result)
+
+    async def _index_worker(self, index_queue: asyncio.Queue) -> None:
+        batch: List = []
+
+        while True:
+            file_info = await index_queue.get()
+            if file_info is _DONE:
+                break
+
+            document = RAGManager.document_for_file(file_info)
+            if document is None:
+                continue
+
+            batch.extend(RAGManager.split_documents([document]))
+            if len(batch) >= Settings.STREAMING_EMBED_BATCH_SIZE:
+                await self._flush(batch)
+                batch = []
+
+        if batch:
+            await self._flush(batch)
+
+    async def _flush(self, chunks: List) -> None:
+        await asyncio.to_thread(self.rag_manager.add_chunks, chunks)
+        self.chunks_indexed += len(chunks)
+        logger.debug(f"[PIPELINE] Indexed {len(chunks)} chunk(s) ({self.chunks_indexed} total)")
@@ -6,12 +6,20 @@ from src.core import PRAnalysisState
 logger = logging.getLogger(__name__)
 
 
-def should_continue_or_end(state: PRAnalysisState) -> Literal["reviewer_agent", "END"]:
+def should_continue_or_end(
+    state: PRAnalysisState,
+) -> Literal["reviewer_agent", "publish_comments", "END"]:
     if state.get("error"):
         logger.error(
             f"[ROUTER: should_continue_or_end] Error detected, ending workflow"
         )
         return "END"
+    pr_data = state.get("pr_data") or {}
+    if pr_data.get("incremental") and not pr_data.get("files"):
+        logger.info(
+            f"[ROUTER: should_continue_or_end] No changed files, recording carried-forward findings"
+        )
+        return "publish_comments"
     logger.info(f"[ROUTER: should_continue_or_end] No errors, proceeding to analyses")
     return "reviewer_agent"
 
@@ -3,7 +3,9 @@ from typing import TypedDict, Optional, Dict, List, Any
 
 class PRAnalysisState(TypedDict):
     pr_id: int
+    incremental: bool
     pr_data: Optional[Dict[str, Any]]
+    shared_context: Optional[Dict[str, Any]]
     error: Optional[str]
     security_analysis: Optional[Dict[str, Any]]
     performance_analysis: Optional[Dict[str, Any]]
@@ -15,10 +17,12 @@ class PRAnalysisState(TypedDict):
     _rag_manager: Optional[Any]
 
 
-def create_initial_state(pr_id: int) -> PRAnalysisState:
+def create_initial_state(pr_id: int, incremental: bool = False) -> PRAnalysisState:
     return {
         "pr_id": pr_id,
+        "incremental": incremental,
         "pr_data": None,
+        "shared_context": None,
         "error": None,
         "security_analysis": None,
         "performance_analysis": None,
@@ -1,12 +1,13 @@
 import logging
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
 from langchain.schema import Document
 
 from src.settings import Settings
+from src.utils.context_packer import llm_diff
 from src.utils.diff_parser import DiffParser
 
 logging.basicConfig(level=logging.INFO)
@@ -37,51 +38,15 @@ class RAGManager:
             logger.warning("[RAG] No files in PR data, skipping RAG creation")
             return
 
-        documents = []
-
-        for file_info in files:
-            file_path = file_info.get("path", "unknown")
-            diff_text = file_info.get("diff", "")
-
-            if not diff_text or diff_text.strip() == "":
-                logger.debug(f"[RAG] Skipping empty diff for {file_path}")
-                continue
-
-            parsed_diff = DiffParser.parse_diff(diff_text)
-            line_ranges = DiffParser.get_changed_line_ranges(diff_text)
-
-            line_start = line_ranges[0][0] if line_ranges else None
-            line_end = line_ranges[-1][1] if line_ranges else None
-
-            doc = Document(
-                page_content=diff_text,
-                metadata={
-                    "file": file_path,
-                    "change_type": file_info.get("change_type", "unknown"),
-                    "additions": file_info.get("additions", 0),
-                    "deletions": file_info.get("deletions", 0),
-                    "extension": (
-                        file_path.split(".")[-1] if "." in file_path else "unknown"
-                    ),
-                    "line_start": line_start,
-                    "line_end": line_end,
-                    "total_chunks": parsed_diff["total_chunks"],
-                },
-            )
-            documents.append(doc)
+        documents = [
+            doc for doc in (self.document_for_file(file_info) for file_info in files) if doc
+        ]
 
         logger.info(
             f"[RAG] Prepared {len(documents)} documents from {len(files)} files"
         )
 
-        splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=120,
-            separators=["\n@@", "\n\n", "\n", " "],
-            length_function=len,
-        )
-
-        chunks = splitter.split_documents(documents)
+        chunks = self.split_documents(documents, chunk_size=chunk_size)
 
         logger.info(f"[RAG] Split into {len(chunks)} chunks (chunk_size={chunk_size})")
 
@@ -91,12 +56,59 @@ class RAGManager:
 
         logger.info("[RAG] Creating embeddings and FAISS index...")
 
-        try:
-            self.vectorstore = FAISS.from_documents(
-                documents=chunks, embedding=self.embeddings
-            )
+        self.add_chunks(chunks)
+
+        logger.info(f"[RAG] ✅ Vectorstore created with {len(chunks)} chunks")
+
+    @staticmethod
+    def document_for_file(file_info: Dict) -> Optional[Document]:
+        file_path = file_info.get("path", "unknown")
+        diff_text = file_info.get("diff", "")
+
+        if not diff_text or diff_text.strip() == "":
+            logger.debug(f"[RAG] Skipping empty diff for {file_path}")
+            return None
+
+        parsed_diff = DiffParser.for_file(file_info)
+        line_ranges = parsed_diff.changed_line_ranges()
+
+        line_start = line_ranges[0][0] if line_ranges else None
+        line_end = line_ranges[-1][1] if line_ranges else None
+
+        return Document(
+            page_content=llm_diff(file_info),
+            metadata={
+                "file": file_path,
+                "change_type": file_info.get("change_type", "unknown"),
+                "additions": file_info.get("additions", 0),
+                "deletions": file_info.get("deletions", 0),
+                "extension": (
+                    file_path.split(".")[-1] if "." in file_path else "unknown"
+                ),
+                "line_start": line_start,
+                "line_end": line_end,
+                "total_chunks": parsed_diff.total_chunks,
+            },
+        )
+
+    @staticmethod
+    def split_documents(documents: List[Document], chunk_size: int = 800) -> List[Document]:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=120,
+            separators=["\n@@", "\n\n", "\n", " "],
+            length_function=len,
+        )
+        return splitter.split_documents(documents)
 
-            logger.info(f"[RAG] ✅ Vectorstore created with {len(chunks)} chunks")
+    def add_chunks(self, chunks: List[Document]) -> None:
+        try:
+            if self.vectorstore is None:
+                self.vectorstore = FAISS.from_documents(
+                    documents=chunks, embedding=self.embeddings
+                )
+            else:
+                self.vectorstore.add_documents(chunks)
 
         except Exception as e:
             logger.error(f"[RAG] ❌ Error creating vectorstore: {e}")
@@ -20,7 +20,9 @@ async def analyze_pr(request: AnalyzePRRequest):
 
     try:
         logger.info(f"[API] Creating initial state for PR #{request.pull_request_id}")
-        initial_state = create_initial_state(request.pull_request_id)
+        initial_state = create_initial_state(
+            request.pull_request_id, incremental=request.incremental
+        )
 
         logger.info(
             f"[API] Starting LangGraph workflow for PR #{request.pull_request_id}"
@@ -53,6 +53,7 @@ class ReviewerAnalysis(BaseModel):
 
 class AnalyzePRRequest(BaseModel):
     pull_request_id: int
+    incremental: bool = Field(False, description="Analyze only the iterations pushed since the last analysis")
 
 
 class AnalyzePRResponse(BaseModel):
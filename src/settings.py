@@ -16,3 +16,63 @@ class Settings:
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     PINECONE_INDEX_NAME = os.getenv("PINECONE_INDEX_NAME")
     PINECONE_API_KEY = os.getenv("PINECONE_API_KEY", "").strip()
+    AZURE_FETCH_CONCURRENCY = int(os.getenv("AZURE_FETCH_CONCURRENCY", "16"))
+    AZURE_HTTP_POOL_CONNECTIONS = int(os.getenv("AZURE_HTTP_POOL_CONNECTIONS", "4"))
+    AZURE_HTTP_POOL_MAXSIZE = int(os.getenv("AZURE_HTTP_POOL_MAXSIZE", "32"))
+    AZURE_HTTP_CONNECT_TIMEOUT = float(os.getenv("AZURE_HTTP_CONNECT_TIMEOUT", "5"))
+    AZURE_HTTP_READ_TIMEOUT = float(os.getenv("AZURE_HTTP_READ_TIMEOUT", "60"))
+    BLOB_CACHE_ENABLED = os.getenv("BLOB_CACHE_ENABLED", "true").lower() == "true"
+    BLOB_CACHE_DIR = os.getenv("BLOB_CACHE_DIR", ".cache/blobs")
+    BLOB_CACHE_MAX_BYTES = int(os.getenv("BLOB_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    BLOB_CACHE_ZSTD = os.getenv("BLOB_CACHE_ZSTD", "false").lower() == "true"
+    DIFF_CACHE_DIR = os.getenv("DIFF_CACHE_DIR", ".cache/diffs")
+    DIFF_CACHE_MAX_BYTES = int(os.getenv("DIFF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    AZURE_BULK_FETCH = os.getenv("AZURE_BULK_FETCH", "true").lower() == "true"
+    AZURE_BULK_FETCH_BATCH_SIZE = int(os.getenv("AZURE_BULK_FETCH_BATCH_SIZE", "250"))
+    AZURE_DIFF_PAGE_SIZE = int(os.getenv("AZURE_DIFF_PAGE_SIZE", "1000"))
+    AZURE_DIFF_MAX_CHANGES = int(os.getenv("AZURE_DIFF_MAX_CHANGES", "10000"))
+    AZURE_HTTP_MAX_RETRIES = int(os.getenv("AZURE_HTTP_MAX_RETRIES", "5"))
+    AZURE_HTTP_BACKOFF_BASE = float(os.getenv("AZURE_HTTP_BACKOFF_BASE", "0.5"))
+    AZURE_HTTP_BACKOFF_MAX = float(os.getenv("AZURE_HTTP_BACKOFF_MAX", "30"))
+    AZURE_CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("AZURE_CIRCUIT_FAILURE_THRESHOLD", "5"))
+    AZURE_CIRCUIT_RESET_TIMEOUT = float(os.getenv("AZURE_CIRCUIT_RESET_TIMEOUT", "30"))
+    AZURE_PUBLISH_CONCURRENCY = int(os.getenv("AZURE_PUBLISH_CONCURRENCY", "8"))
+    ANALYSIS_STORE_DIR = os.getenv("ANALYSIS_STORE_DIR", ".cache/analyses")
+    MAX_FILE_BYTES = int(os.getenv("MAX_FILE_BYTES", str(1024 * 1024)))
+    BINARY_SNIFF_BYTES = int(os.getenv("BINARY_SNIFF_BYTES", "8192"))
+    PR_FETCH_BACKEND = os.getenv("PR_FETCH_BACKEND", "rest").lower()
+    AZURE_GIT_REMOTE_URL = os.getenv("AZURE_GIT_REMOTE_URL")
+    GIT_MIRROR_DIR = os.getenv("GIT_MIRROR_DIR", ".cache/git-mirror")
+    GIT_MIRROR_TIMEOUT_SECONDS = float(os.getenv("GIT_MIRROR_TIMEOUT_SECONDS", "300"))
+    AZURE_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("AZURE_RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    AZURE_CACHE_TTL_PR_INFO = float(os.getenv("AZURE_CACHE_TTL_PR_INFO", "15"))
+    AZURE_CACHE_TTL_ITERATIONS = float(os.getenv("AZURE_CACHE_TTL_ITERATIONS", "15"))
+    AZURE_CACHE_TTL_THREADS = float(os.getenv("AZURE_CACHE_TTL_THREADS", "0"))
+    DIFF_ENGINE = os.getenv("DIFF_ENGINE", "auto").lower()
+    DIFF_ENGINE_MIN_LINES = int(os.getenv("DIFF_ENGINE_MIN_LINES", "2000"))
+    DIFF_ENGINE_TIMEOUT = float(os.getenv("DIFF_ENGINE_TIMEOUT", "30"))
+    DIFF_PROCESS_POOL_ENABLED = os.getenv("DIFF_PROCESS_POOL_ENABLED", "true").lower() == "true"
+    DIFF_PROCESS_WORKERS = int(os.getenv("DIFF_PROCESS_WORKERS", "0"))
+    DIFF_PROCESS_MIN_BYTES = int(os.getenv("DIFF_PROCESS_MIN_BYTES", "65536"))
+    STREAMING_PIPELINE_ENABLED = os.getenv("STREAMING_PIPELINE_ENABLED", "false").lower() == "true"
+    STREAMING_QUEUE_SIZE = int(os.getenv("STREAMING_QUEUE_SIZE", "64"))
+    STREAMING_EMBED_BATCH_SIZE = int(os.getenv("STREAMING_EMBED_BATCH_SIZE", "64"))
+    RENAME_DETECTION_ENABLED = os.getenv("RENAME_DETECTION_ENABLED", "true").lower() == "true"
+    RENAME_SIMILARITY_THRESHOLD = float(os.getenv("RENAME_SIMILARITY_THRESHOLD", "0.5"))
+    CONTEXT_TOKEN_ENCODING = os.getenv("CONTEXT_TOKEN_ENCODING", "o200k_base")
+    CONTEXT_TOKEN_BUDGET_LOGICAL = int(os.getenv("CONTEXT_TOKEN_BUDGET_LOGICAL", "60000"))
+    CONTEXT_TOKEN_BUDGET_CLEAN_CODE = int(os.getenv("CONTEXT_TOKEN_BUDGET_CLEAN_CODE", "60000"))
+    SHARED_CONTEXT_CACHE_SIZE = int(os.getenv("SHARED_CONTEXT_CACHE_SIZE", "8"))
+    DIFF_COMPACT_ENABLED = os.getenv("DIFF_COMPACT_ENABLED", "true").lower() == "true"
+    DIFF_COMPACT_DELETED_FILES = os.getenv("DIFF_COMPACT_DELETED_FILES", "true").lower() == "true"
+    DIFF_COMPACT_CONTEXT_LINES = int(os.getenv("DIFF_COMPACT_CONTEXT_LINES", "2"))
+    DIFF_COMPACT_FOLD_WHITESPACE = os.getenv("DIFF_COMPACT_FOLD_WHITESPACE", "true").lower() == "true"
+    DIFF_COMPACT_ELIDE_IMPORTS = os.getenv("DIFF_COMPACT_ELIDE_IMPORTS", "true").lower() == "true"
+    MAP_REDUCE_MODE = os.getenv("MAP_REDUCE_MODE", "auto").lower()
+    MAP_REDUCE_THRESHOLD_TOKENS = int(os.getenv("MAP_REDUCE_THRESHOLD_TOKENS", "120000"))
+    MAP_REDUCE_SHARD_TOKENS = int(os.getenv("MAP_REDUCE_SHARD_TOKENS", "30000"))
+    MAP_REDUCE_MAX_SHARDS = int(os.getenv("MAP_REDUCE_MAX_SHARDS", "12"))
+    MAP_REDUCE_CONCURRENCY = int(os.getenv("MAP_REDUCE_CONCURRENCY", "4"))
+    FILE_ROUTING_ENABLED = os.getenv("FILE_ROUTING_ENABLED", "true").lower() == "true"
+    FILE_ROUTING_MIN_SCORE = float(os.getenv("FILE_ROUTING_MIN_SCORE", "1.0"))
+    LINE_SNAP_MAX_DISTANCE = int(os.getenv("LINE_SNAP_MAX_DISTANCE", "3"))
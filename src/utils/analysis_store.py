@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_KEYS = (
+    "security_analysis",
+    "performance_analysis",
+    "clean_code_analysis",
+    "logical_analysis",
+)
+
+
+class AnalysisStore:
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _path_for(pr_id: int) -> str:
+        return os.path.join(Settings.ANALYSIS_STORE_DIR, f"pr-{pr_id}.json")
+
+    @staticmethod
+    def load(pr_id: int) -> Optional[Dict[str, Any]]:
+        path = AnalysisStore._path_for(pr_id)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"[ANALYSIS_STORE] Could not read record for PR #{pr_id}: {e}")
+            return None
+
+    @staticmethod
+    def save(pr_id: int, record: Dict[str, Any]) -> None:
+        path = AnalysisStore._path_for(pr_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with AnalysisStore._lock:
+            try:
+                fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(record, f, ensure_ascii=False, default=str)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"[ANALYSIS_STORE] Could not save record for PR #{pr_id}: {e}")
+                return
+
+        logger.info(
+            f"[ANALYSIS_STORE] Recorded PR #{pr_id} at iteration {record.get('iteration_id')} "
+            f"({(record.get('source_commit') or '')[:8]})"
+        )
+
+    @staticmethod
+    def record_from_state(state: Dict[str, Any]) -> None:
+        pr_data = state.get("pr_data") or {}
+        pr_id = state.get("pr_id")
+
+        if state.get("error") or not pr_id or not pr_data.get("source_commit"):
+            return
+
+        findings = {}
+        for key in ANALYSIS_KEYS:
+            analysis = state.get(key)
+            if isinstance(analysis, dict):
+                findings[key] = {"issues": analysis.get("issues", [])}
+
+        AnalysisStore.save(
+            pr_id,
+            {
+                "pr_id": pr_id,
+                "source_commit": pr_data.get("source_commit"),
+                "iteration_id": pr_data.get("iteration_id"),
+                "analyzed_at": datetime.now(timezone.utc).isoformat(),
+                "findings": findings,
+            },
+        )
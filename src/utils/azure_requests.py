@@ -1,8 +1,39 @@
+import hashlib
+import json
 import logging
+import tempfile
+import zipfile
 import requests
-from typing import Dict, List, Optional, Any
-from difflib import unified_diff
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Any, Tuple, Union
 from src.settings import Settings
+from src.utils.blob_cache import get_blob_cache, get_diff_cache
+from src.utils.diff_engine import compute_diff
+from src.utils.diff_pool import DiffProcessPool
+from src.utils.file_filters import (
+    SkippedBlob,
+    build_stat_only_entry,
+    looks_binary,
+    plan_file_fetches,
+)
+from src.utils.http_client import HttpClient
+from src.utils.rename_detection import (
+    find_similar_renames,
+    is_rename,
+    mark_renamed,
+    merge_exact_renames,
+    original_path,
+    split_rename_candidates,
+)
+from src.utils.thread_index import (
+    ACTIVE_THREAD_STATUSES,
+    AGENT_TYPE_PROPERTY,
+    FINGERPRINT_PROPERTY,
+    IDEMPOTENCY_PROPERTY,
+    ThreadIndex,
+    comment_fingerprint,
+    normalize_path,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -16,15 +47,10 @@ class AzureManager:
     @staticmethod
     def get_pr_consolidated_changes(pr_id: int) -> Optional[Dict]:
         logger.info(
-            f"Fetching consolidated changes for PR #{pr_id} (branch comparison)"
+            f"Fetching consolidated changes for PR #{pr_id} (commit comparison)"
         )
         try:
-            pr_url = f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/pullrequests/{pr_id}?api-version={Settings.AZURE_API_VERSION}"
-
-            logger.debug(f"Fetching PR info: {pr_url}")
-            pr_response = requests.get(pr_url, headers=headers)
-            pr_response.raise_for_status()
-            pr_info = pr_response.json()
+            pr_info = AzureManager.get_pr_info(pr_id)
 
             source_ref = pr_info.get("sourceRefName")
             target_ref = pr_info.get("targetRefName")
@@ -36,59 +62,58 @@ class AzureManager:
             source_branch = source_ref.replace("refs/heads/", "")
             target_branch = target_ref.replace("refs/heads/", "")
 
-            logger.info(f"Comparing branches: {source_branch} → {target_branch}")
-
-            diff_url = (
-                f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/diffs/commits?"
-                f"api-version={Settings.AZURE_API_VERSION}&"
-                f"baseVersionType=branch&baseVersion={target_branch}&"
-                f"targetVersionType=branch&targetVersion={source_branch}&"
-                f"diffCommonCommit=true&$top=1000"
-            )
+            pr_source_commit = (pr_info.get("lastMergeSourceCommit") or {}).get("commitId")
+            pr_target_commit = (pr_info.get("lastMergeTargetCommit") or {}).get("commitId")
 
-            logger.debug(f"Fetching branch diff: {diff_url}")
-            diff_response = requests.get(diff_url, headers=headers)
-            diff_response.raise_for_status()
-            changes_data = diff_response.json()
-
-            file_changes = [
-                change
-                for change in changes_data.get("changes", [])
-                if not change.get("item", {}).get("isFolder", False)
-            ]
+            if not pr_source_commit or not pr_target_commit:
+                logger.error(f"Missing merge commits in PR #{pr_id}")
+                return None
 
-            logger.info(f"Found {len(file_changes)} file(s) changed in PR #{pr_id}")
+            logger.info(
+                f"Comparing commits: {source_branch}@{pr_source_commit[:8]} → "
+                f"{target_branch}@{pr_target_commit[:8]}"
+            )
 
             processed_files = []
-            common_commit = changes_data.get("commonCommit")
-            target_commit = changes_data.get("targetCommit")
-
-            for change in file_changes:
-                item = change.get("item", {})
-                file_path = item.get("path")
-
-                if not file_path:
-                    logger.warning("Change without file path, skipping...")
-                    continue
+            rename_candidates = []
+            common_commit = None
+            target_commit = None
+            truncated = False
+
+            for changes_data in AzureManager.iter_commit_diff_pages(
+                base_commit=pr_target_commit, target_commit=pr_source_commit
+            ):
+                if common_commit is None:
+                    common_commit = changes_data.get("commonCommit")
+                    target_commit = changes_data.get("targetCommit")
+
+                page_changes = [
+                    change
+                    for change in changes_data.get("changes", [])
+                    if not change.get("item", {}).get("isFolder", False)
+                ]
+
+                logger.info(
+                    f"Found {len(page_changes)} file(s) changed in PR #{pr_id} "
+                    f"(page at $skip={changes_data['skip']})"
+                )
 
-                logger.debug(f"Processing file: {file_path}")
+                truncated = truncated or changes_data.get("truncated", False)
 
-                old_content = AzureManager.get_old_file_content(
-                    common_commit, file_path
-                )
-                new_content = AzureManager.get_target_file_content(
-                    target_commit, file_path
+                # Diffing this page overlaps with the prefetch of the next one.
+                ready, candidates = split_rename_candidates(page_changes)
+                rename_candidates.extend(candidates)
+                processed_files.extend(
+                    AzureManager.fetch_file_changes(ready, common_commit, target_commit)
                 )
 
-                diff_result = AzureManager.calculate_diff(
-                    old_content, new_content, file_path
+            if rename_candidates:
+                processed_files.extend(
+                    AzureManager.fetch_file_changes(
+                        rename_candidates, common_commit, target_commit
+                    )
                 )
 
-                diff_result["change_type_azure"] = change.get("changeType")
-                diff_result["object_id"] = item.get("objectId")
-
-                processed_files.append(diff_result)
-
             total_additions = sum(f["additions"] for f in processed_files)
             total_deletions = sum(f["deletions"] for f in processed_files)
             total_files = len(processed_files)
@@ -101,8 +126,20 @@ class AzureManager:
                 "total_additions": total_additions,
                 "total_deletions": total_deletions,
                 "files": processed_files,
+                "truncated": truncated,
+                "incremental": False,
+                "source_commit": pr_source_commit,
+                "target_commit": pr_target_commit,
+                "common_commit": common_commit,
+                "cache_key": AzureManager.commit_pair_key(pr_target_commit, pr_source_commit),
+                "iteration_id": None,
             }
 
+            if truncated:
+                logger.warning(
+                    f"PR #{pr_id} diff truncated at {Settings.AZURE_DIFF_MAX_CHANGES} changes"
+                )
+
             logger.info(
                 f"✓ PR #{pr_id} consolidated ({source_branch} → {target_branch}): "
                 f"{total_files} files, +{total_additions}/-{total_deletions} lines"
@@ -124,6 +161,528 @@ class AzureManager:
             )
             return None
 
+    @staticmethod
+    def get_pr_info(pr_id: int) -> Dict:
+        pr_url = f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/pullrequests/{pr_id}?api-version={Settings.AZURE_API_VERSION}"
+
+        logger.debug(f"Fetching PR info: {pr_url}")
+        return HttpClient.get_json(
+            pr_url, ttl=Settings.AZURE_CACHE_TTL_PR_INFO, headers=headers
+        )
+
+    @staticmethod
+    def get_pr_iterations(pr_id: int) -> List[Dict]:
+        url = (
+            f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/"
+            f"pullRequests/{pr_id}/iterations?api-version={Settings.AZURE_API_VERSION}"
+        )
+
+        logger.debug(f"Fetching PR iterations: {url}")
+        data = HttpClient.get_json(
+            url, ttl=Settings.AZURE_CACHE_TTL_ITERATIONS, headers=headers
+        )
+        return sorted(data.get("value", []), key=lambda it: it.get("id", 0))
+
+    @staticmethod
+    def get_iteration_changes(
+        pr_id: int, iteration_id: int, compare_to: int
+    ) -> List[Dict]:
+        change_entries = []
+        skip = 0
+
+        while True:
+            url = (
+                f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/"
+                f"pullRequests/{pr_id}/iterations/{iteration_id}/changes?"
+                f"api-version={Settings.AZURE_API_VERSION}&$compareTo={compare_to}&"
+                f"$top={Settings.AZURE_DIFF_PAGE_SIZE}&$skip={skip}"
+            )
+
+            logger.debug(f"Fetching iteration changes: {url}")
+            response = HttpClient.get(url, headers=headers)
+            response.raise_for_status()
+            data = response.json()
+
+            change_entries.extend(data.get("changeEntries", []))
+
+            next_skip = data.get("nextSkip") or 0
+            if next_skip <= skip:
+                return change_entries
+            skip = next_skip
+
+    @staticmethod
+    def get_pr_incremental_changes(pr_id: int, base_commit: str) -> Optional[Dict]:
+        logger.info(
+            f"Fetching incremental changes for PR #{pr_id} since {base_commit[:8]}"
+        )
+        try:
+            pr_info = AzureManager.get_pr_info(pr_id)
+            iterations = AzureManager.get_pr_iterations(pr_id)
+
+            if not iterations:
+                logger.warning(f"PR #{pr_id} has no iterations")
+                return None
+
+            latest = iterations[-1]
+            base = next(
+                (
+                    it
+                    for it in reversed(iterations)
+                    if (it.get("sourceRefCommit") or {}).get("commitId") == base_commit
+                ),
+                None,
+            )
+
+            if base is None:
+                logger.warning(
+                    f"Commit {base_commit[:8]} is not an iteration of PR #{pr_id} "
+                    f"(force push?), incremental analysis unavailable"
+                )
+                return None
+
+            source_commit = latest["sourceRefCommit"]["commitId"]
+            source_branch = pr_info.get("sourceRefName", "").replace("refs/heads/", "")
+            target_branch = pr_info.get("targetRefName", "").replace("refs/heads/", "")
+
+            file_changes = []
+            if base["id"] != latest["id"]:
+                file_changes = [
+                    change
+                    for change in AzureManager.get_iteration_changes(
+                        pr_id, latest["id"], base["id"]
+                    )
+                    if not change.get("item", {}).get("isFolder", False)
+                ]
+
+            logger.info(
+                f"Iteration {base['id']} → {latest['id']}: "
+                f"{len(file_changes)} file(s) changed in PR #{pr_id}"
+            )
+
+            processed_files = AzureManager.fetch_file_changes(
+                file_changes, base_commit, source_commit
+            )
+
+            total_additions = sum(f["additions"] for f in processed_files)
+            total_deletions = sum(f["deletions"] for f in processed_files)
+
+            return {
+                "pr_id": pr_id,
+                "source_branch": source_branch,
+                "target_branch": target_branch,
+                "total_files": len(processed_files),
+                "total_additions": total_additions,
+                "total_deletions": total_deletions,
+                "files": processed_files,
+                "truncated": False,
+                "incremental": True,
+                "source_commit": source_commit,
+                "target_commit": (pr_info.get("lastMergeTargetCommit") or {}).get("commitId"),
+                "base_commit": base_commit,
+                "cache_key": AzureManager.commit_pair_key(base_commit, source_commit),
+                "iteration_id": latest["id"],
+                "base_iteration_id": base["id"],
+            }
+
+        except requests.exceptions.HTTPError as e:
+            logger.error(
+                f"HTTP error fetching iterations of PR #{pr_id}: {e.response.status_code} - {e.response.text}"
+            )
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error fetching iterations of PR #{pr_id}: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(
+                f"Unexpected error fetching incremental changes of PR #{pr_id}: {str(e)}",
+                exc_info=True,
+            )
+            return None
+
+    @staticmethod
+    def _get_diff_page(
+        base_version: str,
+        base_version_type: str,
+        target_version: str,
+        target_version_type: str,
+        top: int,
+        skip: int,
+    ) -> Dict:
+        diff_url = (
+            f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/diffs/commits?"
+            f"api-version={Settings.AZURE_API_VERSION}&"
+            f"baseVersionType={base_version_type}&baseVersion={base_version}&"
+            f"targetVersionType={target_version_type}&targetVersion={target_version}&"
+            f"diffCommonCommit=true&$top={top}&$skip={skip}"
+        )
+
+        logger.debug(f"Fetching diff page: {diff_url}")
+        diff_response = HttpClient.get(diff_url, headers=headers)
+        diff_response.raise_for_status()
+        return diff_response.json()
+
+    @staticmethod
+    def iter_diff_pages(
+        base_version: str,
+        base_version_type: str,
+        target_version: str,
+        target_version_type: str,
+        page_size: Optional[int] = None,
+        max_changes: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        page_size = page_size or Settings.AZURE_DIFF_PAGE_SIZE
+        max_changes = max_changes or Settings.AZURE_DIFF_MAX_CHANGES
+
+        def fetch(skip: int, top: Optional[int] = None) -> Dict:
+            return AzureManager._get_diff_page(
+                base_version,
+                base_version_type,
+                target_version,
+                target_version_type,
+                top=top or min(page_size, max_changes - skip),
+                skip=skip,
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="azure-diff-page"
+        ) as executor:
+            skip = 0
+            next_page = executor.submit(fetch, skip)
+
+            while next_page is not None:
+                page = next_page.result()
+                page_changes = page.get("changes", [])
+                fetched = skip + len(page_changes)
+
+                has_more = (
+                    len(page_changes) >= min(page_size, max_changes - skip)
+                    and not page.get("allChangesIncluded", False)
+                )
+
+                next_page = None
+                if has_more and fetched < max_changes:
+                    next_page = executor.submit(fetch, fetched)
+
+                truncated = False
+                if has_more and fetched >= max_changes:
+                    # A full page at the cap may just be the last one: only a
+                    # change beyond it proves the diff was cut short.
+                    truncated = bool(fetch(fetched, top=1).get("changes"))
+
+                page["skip"] = skip
+                page["truncated"] = truncated
+
+                yield page
+
+                skip = fetched
+
+    @staticmethod
+    def commit_pair_key(
+        base_commit: Optional[str], target_commit: Optional[str]
+    ) -> Optional[str]:
+        if not base_commit or not target_commit:
+            return None
+        return f"{base_commit}..{target_commit}"
+
+    @staticmethod
+    def iter_commit_diff_pages(base_commit: str, target_commit: str) -> Iterator[Dict]:
+        diff_cache = get_diff_cache()
+        cache_key = hashlib.sha1(
+            AzureManager.commit_pair_key(base_commit, target_commit).encode("utf-8")
+        ).hexdigest()
+
+        cached = diff_cache.get(cache_key) if diff_cache is not None else None
+        if cached is not None:
+            logger.info(
+                f"Reusing cached diff for {base_commit[:8]}..{target_commit[:8]}, "
+                f"skipping diffs/commits"
+            )
+            yield from json.loads(cached.decode("utf-8"))
+            return
+
+        pages = []
+        for page in AzureManager.iter_diff_pages(
+            base_version=base_commit,
+            base_version_type="commit",
+            target_version=target_commit,
+            target_version_type="commit",
+        ):
+            pages.append(
+                {
+                    key: page.get(key)
+                    for key in ("commonCommit", "targetCommit", "changes", "skip", "truncated")
+                }
+            )
+            yield page
+
+        if diff_cache is not None:
+            diff_cache.put(cache_key, json.dumps(pages).encode("utf-8"))
+
+    @staticmethod
+    def fetch_file_changes(
+        file_changes: List[Dict],
+        common_commit: str,
+        target_commit: str,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict]:
+        changes_with_path = []
+        for change in file_changes:
+            if not change.get("item", {}).get("path"):
+                logger.warning("Change without file path, skipping...")
+                continue
+            changes_with_path.append(change)
+
+        if not changes_with_path:
+            return []
+
+        if Settings.RENAME_DETECTION_ENABLED:
+            changes_with_path = merge_exact_renames(changes_with_path)
+
+        fetch_plan = plan_file_fetches(changes_with_path)
+        changes_to_fetch = [change for change, stat_entry in fetch_plan if stat_entry is None]
+
+        workers = max(
+            1,
+            min(
+                max_workers or Settings.AZURE_FETCH_CONCURRENCY,
+                2 * len(changes_to_fetch),
+            ),
+        )
+        logger.info(
+            f"Fetching contents of {len(changes_to_fetch)} file(s) "
+            f"with {workers} concurrent worker(s)"
+        )
+
+        bulk_blobs: Optional[Dict[str, Union[str, SkippedBlob]]] = None
+        if Settings.AZURE_BULK_FETCH and changes_to_fetch:
+            bulk_blobs = AzureManager.get_blobs_bulk(
+                [
+                    blob_id
+                    for change in changes_to_fetch
+                    for blob_id in AzureManager.blob_ids_for_change(change)
+                    if blob_id
+                ]
+            )
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="azure-fetch"
+        ) as executor:
+            pending = []
+            for change, stat_entry in fetch_plan:
+                if stat_entry is not None:
+                    pending.append((change, None, None, stat_entry))
+                    continue
+
+                file_path = change["item"]["path"]
+                logger.debug(f"Processing file: {file_path}")
+                old_id, new_id = AzureManager.blob_ids_for_change(change)
+                change_type = (change.get("changeType") or "").lower()
+
+                if bulk_blobs is not None and "add" in change_type:
+                    old_future = AzureManager._resolved_future(None)
+                elif bulk_blobs is not None and old_id in bulk_blobs:
+                    old_future = AzureManager._resolved_future(bulk_blobs[old_id])
+                else:
+                    old_future = executor.submit(
+                        AzureManager.get_old_file_content,
+                        common_commit,
+                        original_path(change) or file_path,
+                        old_id,
+                    )
+
+                if bulk_blobs is not None and "delete" in change_type:
+                    new_future = AzureManager._resolved_future(None)
+                elif bulk_blobs is not None and new_id in bulk_blobs:
+                    new_future = AzureManager._resolved_future(bulk_blobs[new_id])
+                else:
+                    new_future = executor.submit(
+                        AzureManager.get_target_file_content,
+                        target_commit,
+                        file_path,
+                        new_id,
+                    )
+
+                pending.append((change, old_future, new_future, None))
+
+            processed_files: List[Optional[Dict]] = []
+            diff_jobs = []
+            diff_slots = []
+            for change, old_future, new_future, stat_entry in pending:
+                if stat_entry is not None:
+                    processed_files.append(stat_entry)
+                    continue
+
+                item = change.get("item", {})
+                file_path = item["path"]
+                old_content = old_future.result()
+                new_content = new_future.result()
+
+                skipped = next(
+                    (
+                        content
+                        for content in (old_content, new_content)
+                        if isinstance(content, SkippedBlob)
+                    ),
+                    None,
+                )
+                if skipped is not None:
+                    logger.info(f"Keeping {file_path} as stats only ({skipped.reason})")
+                    processed_files.append(build_stat_only_entry(change, skipped.reason))
+                    continue
+
+                diff_slots.append((len(processed_files), change))
+                diff_jobs.append((old_content, new_content, file_path))
+                processed_files.append(None)
+
+        rename_sources = {
+            position: original_path(change)
+            for position, (_, change) in enumerate(diff_slots)
+            if is_rename(change)
+        }
+        if Settings.RENAME_DETECTION_ENABLED:
+            AzureManager._pair_similar_renames(diff_slots, diff_jobs, rename_sources)
+
+        positions = [
+            position for position, (slot, _) in enumerate(diff_slots) if slot is not None
+        ]
+        diff_results = DiffProcessPool.compute(
+            AzureManager.calculate_diff, [diff_jobs[position] for position in positions]
+        )
+        for position, diff_result in zip(positions, diff_results):
+            slot, change = diff_slots[position]
+            diff_result["change_type_azure"] = change.get("changeType")
+            diff_result["object_id"] = change.get("item", {}).get("objectId")
+            if position in rename_sources:
+                mark_renamed(diff_result, rename_sources[position])
+            processed_files[slot] = diff_result
+
+        return [file_info for file_info in processed_files if file_info is not None]
+
+    @staticmethod
+    def _pair_similar_renames(
+        diff_slots: List[Tuple[Optional[int], Dict]],
+        diff_jobs: List[Tuple[Optional[str], Optional[str], str]],
+        rename_sources: Dict[int, str],
+    ) -> None:
+        deleted = {}
+        added = {}
+        for position, (_, change) in enumerate(diff_slots):
+            old_content, new_content, _ = diff_jobs[position]
+            change_type = (change.get("changeType") or "").lower()
+            if change_type == "delete" and old_content:
+                deleted[position] = old_content
+            elif change_type == "add" and new_content:
+                added[position] = new_content
+
+        for deleted_position, added_position, _ in find_similar_renames(deleted, added):
+            old_content, _, old_path = diff_jobs[deleted_position]
+            _, new_content, new_path = diff_jobs[added_position]
+
+            diff_jobs[added_position] = (old_content, new_content, new_path)
+            rename_sources[added_position] = old_path
+
+            diff_slots[deleted_position] = (None, diff_slots[deleted_position][1])
+
+    @staticmethod
+    def blob_ids_for_change(change: Dict) -> Tuple[Optional[str], Optional[str]]:
+        item = change.get("item", {})
+        change_type = (change.get("changeType") or "").lower()
+
+        old_id = None if "add" in change_type else item.get("originalObjectId")
+        new_id = None if "delete" in change_type else item.get("objectId")
+        return old_id, new_id
+
+    @staticmethod
+    def _resolved_future(value: Any) -> Future:
+        future = Future()
+        future.set_result(value)
+        return future
+
+    @staticmethod
+    def get_blobs_bulk(object_ids: List[str]) -> Dict[str, Union[str, SkippedBlob]]:
+        blobs: Dict[str, Union[str, SkippedBlob]] = {}
+        blob_cache = get_blob_cache()
+
+        missing = []
+        for object_id in dict.fromkeys(object_ids):
+            cached = blob_cache.get_text(object_id) if blob_cache is not None else None
+            if cached is not None:
+                blobs[object_id] = cached
+            else:
+                missing.append(object_id)
+
+        logger.info(
+            f"Bulk blob fetch: {len(blobs)} cached, {len(missing)} to download"
+        )
+
+        batch_size = Settings.AZURE_BULK_FETCH_BATCH_SIZE
+        for start in range(0, len(missing), batch_size):
+            batch = missing[start : start + batch_size]
+            downloaded = AzureManager.get_blobs_zip(batch)
+
+            if blob_cache is not None:
+                for object_id, content in downloaded.items():
+                    if isinstance(content, str):
+                        blob_cache.put_text(object_id, content)
+
+            blobs.update(downloaded)
+
+        return blobs
+
+    @staticmethod
+    def get_blobs_zip(object_ids: List[str]) -> Dict[str, Union[str, SkippedBlob]]:
+        if not object_ids:
+            return {}
+
+        logger.debug(f"Downloading {len(object_ids)} blob(s) as zip")
+        try:
+            url = (
+                f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/blobs"
+                f"?api-version={Settings.AZURE_API_VERSION}"
+            )
+
+            response = HttpClient.post(
+                url,
+                json=object_ids,
+                headers={**headers, "Accept": "application/zip"},
+                stream=True,
+            )
+            response.raise_for_status()
+
+            blobs: Dict[str, Union[str, SkippedBlob]] = {}
+            with tempfile.SpooledTemporaryFile(max_size=16 * 1024 * 1024) as buffer:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    buffer.write(chunk)
+                buffer.seek(0)
+
+                with zipfile.ZipFile(buffer) as archive:
+                    for entry in archive.infolist():
+                        if entry.is_dir():
+                            continue
+                        object_id = entry.filename.rsplit("/", 1)[-1]
+                        if entry.file_size > Settings.MAX_FILE_BYTES:
+                            blobs[object_id] = SkippedBlob("too_large")
+                            continue
+
+                        data = archive.read(entry)
+                        if looks_binary(data):
+                            blobs[object_id] = SkippedBlob("binary")
+                            continue
+
+                        blobs[object_id] = data.decode("utf-8", errors="replace")
+
+            logger.info(f"✓ Downloaded {len(blobs)}/{len(object_ids)} blob(s) in one request")
+            return blobs
+
+        except requests.exceptions.HTTPError as e:
+            logger.error(
+                f"HTTP error downloading blobs zip: {e.response.status_code} - {e.response.text}"
+            )
+            return {}
+        except (requests.exceptions.RequestException, zipfile.BadZipFile) as e:
+            logger.error(f"Error downloading blobs zip: {str(e)}")
+            return {}
+
     @staticmethod
     def get_commit_changes(id: str):
         logger.debug(f"Fetching commit changes from Azure DevOps")
@@ -133,7 +692,7 @@ class AzureManager:
                 f"baseVersionType=branch&baseVersion=develop&targetVersionType=commit&targetVersion={id}&diffCommonCommit=true&$top=100"
             )
 
-            response = requests.get(url, headers=headers)
+            response = HttpClient.get(url, headers=headers)
             data = response.json()
             return data
         except requests.exceptions.HTTPError as e:
@@ -149,8 +708,49 @@ class AzureManager:
             return None
 
     @staticmethod
-    def get_old_file_content(commonCommit: str, path: str) -> Optional[str]:
+    def _download_text(url: str) -> Union[str, SkippedBlob]:
+        max_bytes = Settings.MAX_FILE_BYTES
+
+        response = HttpClient.get(url, headers=headers, stream=True)
+        try:
+            response.raise_for_status()
+
+            declared_size = int(response.headers.get("Content-Length") or 0)
+            if declared_size > max_bytes:
+                return SkippedBlob("too_large")
+
+            buffer = bytearray()
+            sniffed = False
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                buffer.extend(chunk)
+
+                if len(buffer) > max_bytes:
+                    return SkippedBlob("too_large")
+
+                if not sniffed and len(buffer) >= Settings.BINARY_SNIFF_BYTES:
+                    if looks_binary(bytes(buffer)):
+                        return SkippedBlob("binary")
+                    sniffed = True
+
+            if not sniffed and looks_binary(bytes(buffer)):
+                return SkippedBlob("binary")
+
+            return buffer.decode("utf-8", errors="replace")
+        finally:
+            response.close()
+
+    @staticmethod
+    def get_old_file_content(
+        commonCommit: str, path: str, object_id: Optional[str] = None
+    ) -> Optional[Union[str, SkippedBlob]]:
         logger.debug(f"Fetching old file content: {path} @ {commonCommit[:8]}")
+        blob_cache = get_blob_cache()
+        if blob_cache is not None:
+            cached = blob_cache.get_text(object_id)
+            if cached is not None:
+                logger.debug(f"Blob cache hit for {path} ({object_id[:8]})")
+                return cached
+
         try:
             clean_path = path.lstrip("/")
             url = (
@@ -159,10 +759,12 @@ class AzureManager:
                 f"&api-version={Settings.AZURE_API_VERSION}"
             )
 
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            content = AzureManager._download_text(url)
+
+            if blob_cache is not None and isinstance(content, str):
+                blob_cache.put_text(object_id, content)
 
-            return response.text
+            return content
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -177,8 +779,17 @@ class AzureManager:
             return None
 
     @staticmethod
-    def get_target_file_content(commitId: str, path: str) -> Optional[str]:
+    def get_target_file_content(
+        commitId: str, path: str, object_id: Optional[str] = None
+    ) -> Optional[Union[str, SkippedBlob]]:
         logger.debug(f"Fetching target file content: {path} @ {commitId[:8]}")
+        blob_cache = get_blob_cache()
+        if blob_cache is not None:
+            cached = blob_cache.get_text(object_id)
+            if cached is not None:
+                logger.debug(f"Blob cache hit for {path} ({object_id[:8]})")
+                return cached
+
         try:
             clean_path = path.lstrip("/")
             url = (
@@ -187,10 +798,12 @@ class AzureManager:
                 f"&api-version={Settings.AZURE_API_VERSION}"
             )
 
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
+            content = AzureManager._download_text(url)
 
-            return response.text
+            if blob_cache is not None and isinstance(content, str):
+                blob_cache.put_text(object_id, content)
+
+            return content
 
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 404:
@@ -244,27 +857,8 @@ class AzureManager:
                 "deletions": 0,
             }
 
-        old_lines = old_content.splitlines(keepends=True)
-        new_lines = new_content.splitlines(keepends=True)
-
-        diff = unified_diff(
-            old_lines,
-            new_lines,
-            fromfile=f"a{file_path}",
-            tofile=f"b{file_path}",
-            lineterm="",
-        )
-        diff_text = "\n".join(diff)
-
-        additions = sum(
-            1
-            for line in diff_text.split("\n")
-            if line.startswith("+") and not line.startswith("+++")
-        )
-        deletions = sum(
-            1
-            for line in diff_text.split("\n")
-            if line.startswith("-") and not line.startswith("---")
+        old_lines, new_lines, (diff_text, additions, deletions) = compute_diff(
+            old_content, new_content, file_path
         )
 
         return {
@@ -283,6 +877,7 @@ class AzureManager:
         file_path: str,
         line_number: Optional[int] = None,
         comment_text: str = "",
+        properties: Optional[Dict[str, str]] = None,
     ) -> Optional[Dict]:
         logger.info(f"Creating comment thread on PR #{pr_id} for file {file_path} at line {line_number}")
 
@@ -302,8 +897,11 @@ class AzureManager:
                 "status": 1,
             }
 
+            if properties:
+                payload["properties"] = AzureManager._typed_properties(properties)
+
             if line_number is not None:
-                normalized_path = file_path if file_path.startswith("/") else f"/{file_path}"
+                normalized_path = normalize_path(file_path)
                 payload["threadContext"] = {
                     "filePath": normalized_path,
                     "rightFileStart": {"line": line_number, "offset": 1},
@@ -312,7 +910,7 @@ class AzureManager:
                 logger.info(f"Thread context set: filePath={normalized_path}, line={line_number}")
 
             logger.debug(f"Payload: {payload}")
-            response = requests.post(url, json=payload, headers=headers)
+            response = HttpClient.post(url, json=payload, headers=headers)
             response.raise_for_status()
 
             thread_data = response.json()
@@ -359,7 +957,7 @@ class AzureManager:
                 payload["parentCommentId"] = parent_comment_id
 
             logger.debug(f"Payload: {payload}")
-            response = requests.post(url, json=payload, headers=headers)
+            response = HttpClient.post(url, json=payload, headers=headers)
             response.raise_for_status()
 
             comment_data = response.json()
@@ -383,6 +981,126 @@ class AzureManager:
             logger.error(f"Unexpected error adding comment: {str(e)}", exc_info=True)
             return None
 
+    @staticmethod
+    def get_pr_threads(pr_id: int) -> Optional[List[Dict]]:
+        logger.debug(f"Fetching existing threads of PR #{pr_id}")
+        try:
+            url = (
+                f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/"
+                f"pullRequests/{pr_id}/threads?api-version={Settings.AZURE_API_VERSION}"
+            )
+
+            data = HttpClient.get_json(
+                url, ttl=Settings.AZURE_CACHE_TTL_THREADS, headers=headers
+            )
+
+            return data.get("value", [])
+
+        except requests.exceptions.HTTPError as e:
+            logger.error(
+                f"HTTP error fetching threads of PR #{pr_id}: "
+                f"{e.response.status_code} - {e.response.text}"
+            )
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error fetching threads: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error fetching threads: {str(e)}", exc_info=True)
+            return None
+
+    @staticmethod
+    def update_pr_thread(
+        pr_id: int,
+        thread_id: int,
+        status: Optional[int] = None,
+        properties: Optional[Dict[str, str]] = None,
+    ) -> Optional[Dict]:
+        logger.info(f"Updating thread #{thread_id} on PR #{pr_id}")
+
+        try:
+            url = (
+                f"{Settings.AZURE_BASE_URL}/repositories/{Settings.AZURE_REPOSITORY_ID}/"
+                f"pullRequests/{pr_id}/threads/{thread_id}?"
+                f"api-version={Settings.AZURE_API_VERSION}"
+            )
+
+            payload: Dict[str, Any] = {}
+            if status is not None:
+                payload["status"] = status
+            if properties:
+                payload["properties"] = AzureManager._typed_properties(properties)
+
+            response = HttpClient.patch(url, json=payload, headers=headers)
+            response.raise_for_status()
+
+            return response.json()
+
+        except requests.exceptions.HTTPError as e:
+            logger.error(
+                f"HTTP error updating thread #{thread_id}: "
+                f"{e.response.status_code} - {e.response.text}"
+            )
+            return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error updating thread: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error updating thread: {str(e)}", exc_info=True)
+            return None
+
+    @staticmethod
+    def _typed_properties(properties: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+        return {
+            name: {"$type": "System.String", "$value": value}
+            for name, value in properties.items()
+        }
+
+    @staticmethod
+    def comment_idempotency_key(
+        file_path: str, line_number: Optional[int], message: str
+    ) -> str:
+        raw = f"{normalize_path(file_path)}\n{line_number}\n{message.strip()}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _reply_to_thread(
+        pr_id: int, thread: Dict, message: str, properties: Dict[str, str]
+    ) -> Optional[Dict]:
+        thread_id = thread.get("id")
+        comment_result = AzureManager.add_comment_to_thread(
+            pr_id=pr_id, thread_id=thread_id, comment_text=message
+        )
+        if comment_result is None:
+            return None
+
+        status = None if thread.get("status") in ACTIVE_THREAD_STATUSES else 1
+        AzureManager.update_pr_thread(
+            pr_id=pr_id, thread_id=thread_id, status=status, properties=properties
+        )
+        return {"id": thread_id}
+
+    @staticmethod
+    def _pending_thread(
+        action_position: int,
+        file_path: str,
+        line_number: Optional[int],
+        message: str,
+        properties: Dict[str, str],
+    ) -> Dict:
+        thread = {
+            "pending": action_position,
+            "status": 1,
+            "comments": [{"content": message}],
+            "properties": AzureManager._typed_properties(properties),
+        }
+        if line_number is not None:
+            thread["threadContext"] = {
+                "filePath": normalize_path(file_path),
+                "rightFileStart": {"line": line_number},
+            }
+        return thread
+
     @staticmethod
     def publish_analysis_comments(pr_id: int, comments: List[Dict]) -> Dict[str, Any]:
         logger.info(f"Publishing analysis comments to PR #{pr_id}")
@@ -391,46 +1109,132 @@ class AzureManager:
             "total_comments": 0,
             "successful": 0,
             "failed": 0,
+            "skipped": 0,
+            "replied": 0,
             "threads_created": [],
             "errors": [],
             "published_comments": []
         }
 
         try:
+            thread_index = ThreadIndex(AzureManager.get_pr_threads(pr_id) or [])
+
+            actions = []
+            # Action position for every input comment, so results come back in
+            # input order even for comments collapsed into an earlier one.
+            slots: List[Tuple[int, bool]] = []
+            action_by_key: Dict[str, int] = {}
             for comment in comments:
                 stats["total_comments"] += 1
 
                 file_path = comment.get("file", "")
                 line_number = comment.get("line")
                 message = comment.get("message", "")
+                agent_type = comment.get("agent_type")
+                key = AzureManager.comment_idempotency_key(file_path, line_number, message)
+                fingerprint = comment_fingerprint(message)
+
+                if key in action_by_key:
+                    slots.append((action_by_key[key], True))
+                    continue
+                action_by_key[key] = len(actions)
+                slots.append((len(actions), False))
+
+                properties = {
+                    IDEMPOTENCY_PROPERTY: key,
+                    FINGERPRINT_PROPERTY: fingerprint,
+                }
+                if agent_type:
+                    properties[AGENT_TYPE_PROPERTY] = agent_type
 
-                thread_result = AzureManager.create_pr_thread(
-                    pr_id=pr_id,
-                    file_path=file_path,
-                    line_number=line_number,
-                    comment_text=message
+                duplicate = thread_index.find_duplicate(
+                    file_path, line_number, fingerprint, key
                 )
+                if duplicate is not None:
+                    actions.append(("skip", file_path, line_number, message, duplicate, properties))
+                    continue
 
-                if thread_result:
-                    stats["successful"] += 1
-                    stats["threads_created"].append(thread_result.get("id"))
-                    stats["published_comments"].append({
-                        "file": file_path,
-                        "line": line_number,
-                        "message": message,
-                        "thread_id": thread_result.get("id")
-                    })
+                existing = thread_index.find_updatable(file_path, line_number, agent_type)
+                if existing is not None:
+                    properties = thread_index.attach(existing, properties)
+                    actions.append(("reply", file_path, line_number, message, existing, properties))
                 else:
-                    stats["failed"] += 1
-                    stats["errors"].append({
-                        "file": file_path,
-                        "line": line_number,
-                        "error": "Failed to create thread"
-                    })
+                    thread_index.add(
+                        AzureManager._pending_thread(
+                            len(actions), file_path, line_number, message, properties
+                        )
+                    )
+                    actions.append(("create", file_path, line_number, message, None, properties))
+
+            workers = max(1, min(Settings.AZURE_PUBLISH_CONCURRENCY, len(actions)))
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="azure-publish"
+            ) as executor:
+                futures: Dict[int, Future] = {}
+                deferred = []
+                for position, (action, file_path, line_number, message, thread, properties) in (
+                    enumerate(actions)
+                ):
+                    if thread is not None and "pending" in thread:
+                        deferred.append(position)
+                    elif action == "skip":
+                        futures[position] = AzureManager._resolved_future(thread)
+                    elif action == "reply":
+                        futures[position] = executor.submit(
+                            AzureManager._reply_to_thread, pr_id, thread, message, properties
+                        )
+                    else:
+                        futures[position] = executor.submit(
+                            AzureManager.create_pr_thread,
+                            pr_id=pr_id,
+                            file_path=file_path,
+                            line_number=line_number,
+                            comment_text=message,
+                            properties=properties,
+                        )
+
+                results: List[Optional[Dict]] = [None] * len(actions)
+                for position, future in futures.items():
+                    results[position] = future.result()
+
+                # Duplicates of a thread created earlier in this run resolve to
+                # that thread once it exists.
+                for position in deferred:
+                    thread = actions[position][4]
+                    results[position] = results[thread["pending"]]
+
+                for position, batch_duplicate in slots:
+                    action, file_path, line_number, message, _, _ = actions[position]
+                    thread_result = results[position]
+                    if batch_duplicate:
+                        action = "skip"
+
+                    if thread_result:
+                        stats["successful"] += 1
+                        if action == "create":
+                            stats["threads_created"].append(thread_result.get("id"))
+                        elif action == "reply":
+                            stats["replied"] += 1
+                        else:
+                            stats["skipped"] += 1
+                        stats["published_comments"].append({
+                            "file": file_path,
+                            "line": line_number,
+                            "message": message,
+                            "thread_id": thread_result.get("id")
+                        })
+                    else:
+                        stats["failed"] += 1
+                        stats["errors"].append({
+                            "file": file_path,
+                            "line": line_number,
+                            "error": f"Failed to {action} thread"
+                        })
 
             logger.info(
                 f"✓ Published {stats['successful']}/{stats['total_comments']} comments "
-                f"to PR #{pr_id}"
+                f"to PR #{pr_id} ({len(stats['threads_created'])} created, "
+                f"{stats['replied']} replied, {stats['skipped']} already present)"
             )
 
         except Exception as e:
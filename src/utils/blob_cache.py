@@ -0,0 +1,218 @@
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, Optional, Tuple
+
+from src.settings import Settings
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_ZSTD_SUFFIX = ".zst"
+
+
+class BlobCache:
+    def __init__(self, cache_dir: str, max_bytes: int, compress: bool = False):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compress = compress and ZSTD_AVAILABLE
+        self._lock = threading.Lock()
+        self._sizes: Dict[str, Tuple[str, int]] = {}
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if compress and not ZSTD_AVAILABLE:
+            logger.warning(
+                "[BLOB_CACHE] zstd compression requested but 'zstandard' is not installed, "
+                "storing blobs uncompressed"
+            )
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+        logger.info(
+            f"[BLOB_CACHE] Initialized at {self.cache_dir} "
+            f"({len(self._sizes)} blobs, {self._total_bytes} bytes, "
+            f"max={self.max_bytes}, compress={self.compress})"
+        )
+
+    def _load_index(self) -> None:
+        for root, _, filenames in os.walk(self.cache_dir):
+            for filename in filenames:
+                if filename.startswith("."):
+                    continue
+                file_path = os.path.join(root, filename)
+                key = filename[: -len(_ZSTD_SUFFIX)] if filename.endswith(_ZSTD_SUFFIX) else filename
+                if key in self._sizes:
+                    # Both variants survived a compression toggle: keep the one
+                    # for the current mode and drop the other.
+                    if file_path != self._path_for(key):
+                        self._remove(file_path)
+                        continue
+                    self._remove(self._sizes[key][0])
+                    self._forget(key)
+                size = os.path.getsize(file_path)
+                self._sizes[key] = (file_path, size)
+                self._total_bytes += size
+
+    def _path_for(self, key: str) -> str:
+        suffix = _ZSTD_SUFFIX if self.compress else ""
+        return os.path.join(self.cache_dir, key[:2], f"{key}{suffix}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not key:
+            return None
+
+        with self._lock:
+            entry = self._sizes.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+        file_path, _ = entry
+        try:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            os.utime(file_path)
+        except OSError:
+            with self._lock:
+                self._forget(key)
+                self.misses += 1
+            return None
+
+        if file_path.endswith(_ZSTD_SUFFIX):
+            if not ZSTD_AVAILABLE:
+                with self._lock:
+                    self.misses += 1
+                return None
+            data = zstandard.ZstdDecompressor().decompress(data)
+
+        with self._lock:
+            self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        if not key or data is None:
+            return
+
+        payload = zstandard.ZstdCompressor(level=3).compress(data) if self.compress else data
+        if len(payload) > self.max_bytes:
+            logger.debug(f"[BLOB_CACHE] Blob {key[:8]} larger than cache, not stored")
+            return
+
+        file_path = self._path_for(key)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, file_path)
+        except OSError as e:
+            logger.warning(f"[BLOB_CACHE] Could not store blob {key[:8]}: {e}")
+            return
+
+        with self._lock:
+            previous = self._sizes.get(key)
+            self._forget(key)
+            self._sizes[key] = (file_path, len(payload))
+            self._total_bytes += len(payload)
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+        # A blob stored before compression was toggled lives under the other name.
+        if previous is not None and previous[0] != file_path:
+            self._remove(previous[0])
+
+    def get_text(self, key: Optional[str]) -> Optional[str]:
+        data = self.get(key) if key else None
+        return data.decode("utf-8") if data is not None else None
+
+    def put_text(self, key: Optional[str], text: Optional[str]) -> None:
+        if key and text is not None:
+            self.put(key, text.encode("utf-8"))
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+    def _forget(self, key: str) -> None:
+        entry = self._sizes.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+
+    def _evict(self) -> None:
+        def last_used(item):
+            try:
+                return os.path.getmtime(item[1][0])
+            except OSError:
+                return 0.0
+
+        evicted = 0
+        for key, (file_path, size) in sorted(self._sizes.items(), key=last_used):
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._remove(file_path)
+            self._forget(key)
+            evicted += 1
+
+        self.evictions += evicted
+
+        logger.info(
+            f"[BLOB_CACHE] Evicted {evicted} blob(s), {self._total_bytes} bytes remaining"
+        )
+
+
+_blob_cache: Optional[BlobCache] = None
+_blob_cache_lock = threading.Lock()
+
+
+def get_blob_cache() -> Optional[BlobCache]:
+    global _blob_cache
+
+    if not Settings.BLOB_CACHE_ENABLED:
+        return None
+
+    if _blob_cache is None:
+        with _blob_cache_lock:
+            if _blob_cache is None:
+                _blob_cache = BlobCache(
+                    cache_dir=Settings.BLOB_CACHE_DIR,
+                    max_bytes=Settings.BLOB_CACHE_MAX_BYTES,
+                    compress=Settings.BLOB_CACHE_ZSTD,
+                )
+    return _blob_cache
+
+
+_diff_cache: Optional[BlobCache] = None
+
+
+def get_diff_cache() -> Optional[BlobCache]:
+    # Diff listings are keyed by commit pair rather than by git object id, so
+    # they live in their own directory and never compete with blob contents.
+    global _diff_cache
+
+    if not Settings.BLOB_CACHE_ENABLED:
+        return None
+
+    if _diff_cache is None:
+        with _blob_cache_lock:
+            if _diff_cache is None:
+                _diff_cache = BlobCache(
+                    cache_dir=Settings.DIFF_CACHE_DIR,
+                    max_bytes=Settings.DIFF_CACHE_MAX_BYTES,
+                    compress=Settings.BLOB_CACHE_ZSTD,
+                )
+    return _diff_cache
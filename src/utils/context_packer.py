@@ -0,0 +1,228 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+CHARS_PER_TOKEN_ESTIMATE = 4
+
+OTHER_FILES_HEADING = "\n## Outros arquivos modificados (diff não incluído):\n"
+SEARCH_HINT = "\n💡 Use a tool `search_pr_code()` para buscar trechos dos arquivos não incluídos!"
+
+
+class TokenCounter:
+    def __init__(self, encoding_name: Optional[str] = None, max_entries: int = 4096):
+        self.encoding_name = encoding_name or Settings.CONTEXT_TOKEN_ENCODING
+        self.max_entries = max_entries
+        self._encoding = None
+        self._cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if TIKTOKEN_AVAILABLE:
+            try:
+                self._encoding = tiktoken.get_encoding(self.encoding_name)
+            except Exception as e:
+                logger.warning(
+                    f"[CONTEXT] tiktoken encoding '{self.encoding_name}' unavailable ({e}), "
+                    f"estimating tokens from length"
+                )
+        else:
+            logger.info("[CONTEXT] tiktoken not installed, estimating tokens from length")
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+
+        key = hashlib.blake2b(text.encode("utf-8", errors="replace"), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return cached
+
+        if self._encoding is not None:
+            tokens = len(self._encoding.encode(text, disallowed_special=()))
+        else:
+            tokens = (len(text) + CHARS_PER_TOKEN_ESTIMATE - 1) // CHARS_PER_TOKEN_ESTIMATE
+
+        with self._lock:
+            self._cache[key] = tokens
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return tokens
+
+
+_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    global _counter
+    if _counter is None:
+        _counter = TokenCounter()
+    return _counter
+
+
+def llm_diff(file_info: Dict) -> str:
+    compact = file_info.get("compact_diff")
+    return compact if compact is not None else file_info.get("diff", "")
+
+
+def render_file_section(file_info: Dict) -> str:
+    return (
+        f"\n## Arquivo: {file_info['path']}\n"
+        f"Tipo de mudança: {file_info['change_type']}\n"
+        f"Linhas: +{file_info['additions']} -{file_info['deletions']}\n"
+        f"\n```diff\n{llm_diff(file_info)}\n```"
+    )
+
+
+def render_file_stub(file_info: Dict, reason: str) -> str:
+    return (
+        f"  • {file_info['path']} ({file_info['change_type']}) "
+        f"+{file_info['additions']} -{file_info['deletions']} — {reason}"
+    )
+
+
+def render_omitted_stubs(count: int) -> str:
+    return f"  • … e mais {count} arquivo(s) omitido(s) por falta de espaço no contexto"
+
+
+def default_priority(file_info: Dict) -> float:
+    weight = 0.2 if file_info.get("change_type") == "deleted" else 1.0
+    return weight * (file_info.get("additions", 0) + 0.5 * file_info.get("deletions", 0))
+
+
+class PackedContext:
+    def __init__(self, text: str, budget: int):
+        self.text = text
+        self.budget = budget
+        self.packed_files: List[str] = []
+        self.dropped_files: List[str] = []
+        self.packed_tokens = 0
+        self.dropped_tokens = 0
+        self.total_tokens = 0
+
+    def describe(self) -> str:
+        return (
+            f"{len(self.packed_files)} file(s) packed ({self.packed_tokens} tokens), "
+            f"{len(self.dropped_files)} stubbed ({self.dropped_tokens} tokens dropped), "
+            f"{self.total_tokens}/{self.budget} tokens used"
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "budget": self.budget,
+            "total_tokens": self.total_tokens,
+            "packed_tokens": self.packed_tokens,
+            "dropped_tokens": self.dropped_tokens,
+            "packed_files": list(self.packed_files),
+            "dropped_files": list(self.dropped_files),
+        }
+
+
+class ContextPacker:
+    def __init__(self, budget_tokens: int, counter: Optional[TokenCounter] = None):
+        self.budget_tokens = budget_tokens
+        self.counter = counter or get_token_counter()
+
+    def pack(
+        self,
+        files: List[Dict],
+        header: str = "",
+        priority: Optional[Callable[[Dict], float]] = None,
+        footer: str = "",
+    ) -> PackedContext:
+        priority = priority or default_priority
+        count = self.counter.count
+
+        sections: Dict[int, str] = {}
+        section_tokens: Dict[int, int] = {}
+        stubs: Dict[int, str] = {}
+        stub_tokens: Dict[int, int] = {}
+
+        for position, file_info in enumerate(files):
+            if file_info.get("diff") and not file_info.get("skipped_reason"):
+                sections[position] = render_file_section(file_info)
+                section_tokens[position] = count(sections[position])
+                reason = f"não incluído (~{section_tokens[position]} tokens)"
+            else:
+                reason = f"sem diff ({file_info.get('skipped_reason') or 'vazio'})"
+            stubs[position] = render_file_stub(file_info, reason)
+            stub_tokens[position] = count(stubs[position]) + 1
+
+        # Every file costs at least its stub line; packing a diff only spends
+        # the difference, so stubs for whatever is dropped always fit.
+        available = (
+            self.budget_tokens
+            - count(header)
+            - count(footer)
+            - count(SEARCH_HINT)
+            - count(OTHER_FILES_HEADING)
+        )
+
+        listed = set(range(len(files)))
+        if sum(stub_tokens.values()) > available:
+            # Not even one line per file fits: list the most relevant files
+            # and fold the rest into a single count line.
+            available -= count(render_omitted_stubs(len(files))) + 1
+            listed = set()
+            for position in sorted(
+                range(len(files)), key=lambda position: (-priority(files[position]), position)
+            ):
+                if stub_tokens[position] > available:
+                    break
+                listed.add(position)
+                available -= stub_tokens[position]
+        else:
+            available -= sum(stub_tokens.values())
+
+        ranked = sorted(
+            (position for position in sections if position in listed),
+            key=lambda position: (-priority(files[position]), section_tokens[position]),
+        )
+        packed = set()
+        for position in ranked:
+            # +1 for the line join around the section.
+            extra = section_tokens[position] + 1 - stub_tokens[position]
+            if extra <= available:
+                packed.add(position)
+                available -= extra
+
+        body = [sections[position] for position in sorted(packed)]
+        remaining = [stubs[position] for position in sorted(listed - packed)]
+        omitted = len(files) - len(listed)
+
+        parts = [header, *body]
+        if remaining or omitted:
+            parts.append(OTHER_FILES_HEADING)
+            parts.extend(remaining)
+            if omitted:
+                parts.append(render_omitted_stubs(omitted))
+            if any(position in sections for position in range(len(files)) if position not in packed):
+                parts.append(SEARCH_HINT)
+        if footer:
+            parts.append(footer)
+
+        result = PackedContext("\n".join(parts), self.budget_tokens)
+        for position, file_info in enumerate(files):
+            if position in packed:
+                result.packed_files.append(file_info["path"])
+                result.packed_tokens += section_tokens[position]
+            elif position in sections:
+                result.dropped_files.append(file_info["path"])
+                result.dropped_tokens += section_tokens[position]
+        result.total_tokens = count(result.text)
+
+        return result
@@ -0,0 +1,235 @@
+import logging
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.settings import Settings
+from src.utils.context_packer import get_token_counter
+
+logger = logging.getLogger(__name__)
+
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_IMPORT_PATTERN = re.compile(
+    r"^\s*(import\s|from\s+\S+\s+import\s|using\s+[\w.]+\s*;|#include\s|package\s|"
+    r"(const|let|var)\s+.+=\s*require\(|require\(|@import\s)"
+)
+_DEFINITION_PATTERN = re.compile(
+    r"^\s*(export\s+)?(async\s+)?(def|class|function|interface|func|struct|enum|type)\s+\w+|"
+    r"^\s*(public|private|protected|internal)\s+[\w<>\[\], ]+\s+\w+\s*\("
+)
+
+MAX_DELETED_DEFINITIONS = 20
+
+# Indentation is syntax in these files, so only trailing-whitespace churn is folded.
+INDENT_SENSITIVE_EXTENSIONS = {".py", ".pyi", ".yml", ".yaml", ".mk", ".sass", ".pug", ".haml"}
+INDENT_SENSITIVE_FILENAMES = {"makefile", "gnumakefile"}
+
+
+def is_indent_sensitive(path: str) -> bool:
+    name = os.path.basename(path or "").lower()
+    return (
+        name in INDENT_SENSITIVE_FILENAMES
+        or os.path.splitext(name)[1] in INDENT_SENSITIVE_EXTENSIONS
+    )
+
+
+def _normalize(line: str) -> str:
+    return _WHITESPACE_PATTERN.sub("", line)
+
+
+def _format_range(start: int, length: int) -> str:
+    if length == 1:
+        return str(start)
+    if length == 0:
+        return f"{start - 1},0"
+    return f"{start},{length}"
+
+
+def collapse_deleted_file(file_info: Dict) -> str:
+    body = [line[1:].strip() for line in file_info["diff"].splitlines() if line.startswith("-")]
+    definitions = [line for line in body if _DEFINITION_PATTERN.match(line)]
+
+    parts = [
+        f"--- a{file_info['path']}",
+        "+++ /dev/null",
+        f"⋯ Arquivo removido ({file_info.get('deletions', len(body))} linhas); conteúdo omitido.",
+    ]
+    if definitions:
+        parts.append("Definições removidas:")
+        parts.extend(f"- {line}" for line in definitions[:MAX_DELETED_DEFINITIONS])
+        if len(definitions) > MAX_DELETED_DEFINITIONS:
+            parts.append(f"⋯ mais {len(definitions) - MAX_DELETED_DEFINITIONS} definição(ões)")
+    return "\n".join(parts)
+
+
+def _classify_group(
+    removed: List[str], added: List[str], indent_sensitive: bool = False
+) -> Optional[str]:
+    changed = [line for line in removed + added if line.strip()]
+    normalize = str.rstrip if indent_sensitive else _normalize
+
+    if Settings.DIFF_COMPACT_FOLD_WHITESPACE and (
+        not changed or [normalize(r) for r in removed] == [normalize(a) for a in added]
+    ):
+        return "whitespace"
+
+    if Settings.DIFF_COMPACT_ELIDE_IMPORTS and changed and all(
+        _IMPORT_PATTERN.match(line) for line in changed
+    ):
+        return "imports"
+
+    return None
+
+
+def _compact_hunk(
+    old_start: int,
+    new_start: int,
+    body: List[Tuple[str, str]],
+    folded: Dict[str, int],
+    indent_sensitive: bool = False,
+) -> List[str]:
+    entries = []
+    old_no, new_no = old_start, new_start
+    for tag, text in body:
+        entries.append([tag, text, old_no, new_no, None])
+        if tag in (" ", "-"):
+            old_no += 1
+        if tag in (" ", "+"):
+            new_no += 1
+
+    position = 0
+    while position < len(entries):
+        if entries[position][0] == " ":
+            position += 1
+            continue
+        end = position
+        while end < len(entries) and entries[end][0] != " ":
+            end += 1
+        group = entries[position:end]
+        kind = _classify_group(
+            [e[1] for e in group if e[0] == "-"],
+            [e[1] for e in group if e[0] == "+"],
+            indent_sensitive,
+        )
+        for entry in group:
+            entry[4] = kind
+        if kind:
+            folded[kind] += len(group)
+        position = end
+
+    anchors = [
+        index for index, entry in enumerate(entries) if entry[0] != " " and entry[4] is None
+    ]
+    context_cap = Settings.DIFF_COMPACT_CONTEXT_LINES
+
+    keep = [False] * len(entries)
+    for anchor in anchors:
+        keep[anchor] = True
+        for index in range(max(0, anchor - context_cap), min(len(entries), anchor + context_cap + 1)):
+            if entries[index][0] == " ":
+                keep[index] = True
+
+    folded["context"] += sum(
+        1 for index, entry in enumerate(entries) if entry[0] == " " and not keep[index]
+    )
+
+    output = []
+    index = 0
+    while index < len(entries):
+        if not keep[index]:
+            index += 1
+            continue
+        end = index
+        while end < len(entries) and keep[end]:
+            end += 1
+        segment = entries[index:end]
+        old_len = sum(1 for e in segment if e[0] in (" ", "-"))
+        new_len = sum(1 for e in segment if e[0] in (" ", "+"))
+        output.append(
+            f"@@ -{_format_range(segment[0][2], old_len)} "
+            f"+{_format_range(segment[0][3], new_len)} @@"
+        )
+        output.extend(f"{e[0]}{e[1]}" for e in segment)
+        index = end
+
+    return output
+
+
+def compact_unified_diff(diff_text: str, indent_sensitive: bool = False) -> str:
+    lines = [line.rstrip("\r") for line in diff_text.split("\n") if line]
+
+    output: List[str] = []
+    folded = {"whitespace": 0, "imports": 0, "context": 0}
+    hunk: Optional[Tuple[int, int]] = None
+    body: List[Tuple[str, str]] = []
+
+    def flush():
+        if hunk is not None:
+            output.extend(_compact_hunk(hunk[0], hunk[1], body, folded, indent_sensitive))
+
+    for line in lines:
+        match = _HUNK_HEADER.match(line) if line.startswith("@@") else None
+        if match:
+            flush()
+            hunk = (int(match.group(1)), int(match.group(3)))
+            body = []
+        elif hunk is None:
+            output.append(line)
+        elif line[:1] in (" ", "-", "+"):
+            body.append((line[:1], line[1:]))
+    flush()
+
+    notes = []
+    if folded["whitespace"]:
+        notes.append(f"{folded['whitespace']} linha(s) com mudanças só de espaço")
+    if folded["imports"]:
+        notes.append(f"{folded['imports']} linha(s) de imports")
+    if folded["context"]:
+        notes.append(f"{folded['context']} linha(s) de contexto")
+    if notes:
+        output.append(f"⋯ Omitidas: {', '.join(notes)}")
+
+    return "\n".join(output)
+
+
+def compact_file(file_info: Dict) -> Optional[str]:
+    diff_text = file_info.get("diff") or ""
+    if not diff_text or file_info.get("skipped_reason"):
+        return None
+
+    if file_info.get("change_type") == "deleted":
+        if not Settings.DIFF_COMPACT_DELETED_FILES:
+            return None
+        return collapse_deleted_file(file_info)
+
+    if diff_text.startswith("--- "):
+        return compact_unified_diff(diff_text, is_indent_sensitive(file_info.get("path", "")))
+
+    return None
+
+
+def compact_files(files: List[Dict]) -> Dict[str, int]:
+    count = get_token_counter().count
+    stats = {"files_compacted": 0, "original_tokens": 0, "compact_tokens": 0, "saved_tokens": 0}
+
+    if not Settings.DIFF_COMPACT_ENABLED:
+        return stats
+
+    for file_info in files:
+        compact = compact_file(file_info)
+        if compact is None:
+            continue
+
+        original_tokens = count(file_info["diff"])
+        compact_tokens = count(compact)
+        if compact_tokens >= original_tokens:
+            continue
+
+        file_info["compact_diff"] = compact
+        stats["files_compacted"] += 1
+        stats["original_tokens"] += original_tokens
+        stats["compact_tokens"] += compact_tokens
+
+    stats["saved_tokens"] = stats["original_tokens"] - stats["compact_tokens"]
+    return stats
@@ -0,0 +1,179 @@
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from difflib import unified_diff
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+DiffResult = Tuple[str, int, int]
+
+_HUNK_HEADER = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_NON_LF_LINE_BREAKS = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class DiffEngineError(Exception):
+    pass
+
+
+@lru_cache(maxsize=1)
+def git_available() -> bool:
+    return shutil.which("git") is not None
+
+
+def _headers(file_path: str) -> List[str]:
+    return [f"--- a{file_path}", f"+++ b{file_path}"]
+
+
+def difflib_diff(old_lines: List[str], new_lines: List[str], file_path: str) -> DiffResult:
+    output = []
+    additions = deletions = 0
+
+    diff = unified_diff(
+        old_lines,
+        new_lines,
+        fromfile=f"a{file_path}",
+        tofile=f"b{file_path}",
+        lineterm="",
+    )
+
+    for index, line in enumerate(diff):
+        output.append(line)
+        if index < 2:
+            continue
+        tag = line[:1]
+        if tag == "+":
+            additions += 1
+        elif tag == "-":
+            deletions += 1
+
+    return "\n".join(output), additions, deletions
+
+
+def git_diff(old_lines: List[str], new_lines: List[str], file_path: str) -> DiffResult:
+    # git only supplies the hunk layout; line text comes from the splitlines()
+    # lists so the output keeps difflib's format. Requires "\n"-only content.
+    with tempfile.TemporaryDirectory(prefix="pr-diff-") as tmp_dir:
+        old_path = os.path.join(tmp_dir, "old")
+        new_path = os.path.join(tmp_dir, "new")
+        with open(old_path, "w", encoding="utf-8", errors="replace", newline="") as f:
+            f.write("".join(old_lines))
+        with open(new_path, "w", encoding="utf-8", errors="replace", newline="") as f:
+            f.write("".join(new_lines))
+
+        try:
+            result = subprocess.run(
+                [
+                    "git", "-c", "core.quotePath=false",
+                    "diff", "--no-index", "--no-color", "--no-ext-diff",
+                    "--histogram", "-U3", old_path, new_path,
+                ],
+                capture_output=True,
+                timeout=Settings.DIFF_ENGINE_TIMEOUT,
+                check=False,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise DiffEngineError(f"git diff failed for {file_path}: {e}")
+
+    if result.returncode not in (0, 1):
+        raise DiffEngineError(
+            f"git diff failed for {file_path} ({result.returncode}): "
+            f"{result.stderr.decode('utf-8', errors='replace').strip()}"
+        )
+
+    if result.returncode == 0:
+        return "", 0, 0
+
+    output = _headers(file_path)
+    additions = deletions = 0
+    old_index = new_index = 0
+    in_hunk = False
+
+    for raw in result.stdout.split(b"\n"):
+        if raw.startswith(b"@@"):
+            match = _HUNK_HEADER.match(raw)
+            if match is None:
+                raise DiffEngineError(f"Unexpected hunk header in git diff for {file_path}")
+            old_start, old_len, new_start, new_len = match.groups()
+            old_index = int(old_start) - (0 if old_len == b"0" else 1)
+            new_index = int(new_start) - (0 if new_len == b"0" else 1)
+            output.append(match.group(0).decode())
+            in_hunk = True
+            continue
+
+        if not in_hunk:
+            continue
+
+        tag = raw[:1]
+        if tag == b" ":
+            output.append(" " + old_lines[old_index])
+            old_index += 1
+            new_index += 1
+        elif tag == b"-":
+            output.append("-" + old_lines[old_index])
+            old_index += 1
+            deletions += 1
+        elif tag == b"+":
+            output.append("+" + new_lines[new_index])
+            new_index += 1
+            additions += 1
+
+    return "\n".join(output), additions, deletions
+
+
+DIFF_ENGINES: Dict[str, Callable[[List[str], List[str], str], DiffResult]] = {
+    "difflib": difflib_diff,
+    "git": git_diff,
+}
+
+
+def _git_compatible(old_content: str, new_content: str) -> bool:
+    return not (
+        _NON_LF_LINE_BREAKS.search(old_content) or _NON_LF_LINE_BREAKS.search(new_content)
+    )
+
+
+def select_engine(
+    old_content: str, new_content: str, old_lines: List[str], new_lines: List[str]
+) -> str:
+    engine = Settings.DIFF_ENGINE
+    if engine != "auto":
+        return engine
+
+    if (
+        max(len(old_lines), len(new_lines)) >= Settings.DIFF_ENGINE_MIN_LINES
+        and git_available()
+        and _git_compatible(old_content, new_content)
+    ):
+        return "git"
+    return "difflib"
+
+
+def compute_diff(
+    old_content: str, new_content: str, file_path: str, engine: Optional[str] = None
+) -> Tuple[List[str], List[str], DiffResult]:
+    old_lines = old_content.splitlines(keepends=True)
+    new_lines = new_content.splitlines(keepends=True)
+
+    engine = engine or select_engine(old_content, new_content, old_lines, new_lines)
+    if engine == "git" and not _git_compatible(old_content, new_content):
+        engine = "difflib"
+
+    diff_fn = DIFF_ENGINES.get(engine)
+    if diff_fn is None:
+        logger.warning(f"Unknown diff engine '{engine}', falling back to difflib")
+        diff_fn = difflib_diff
+
+    try:
+        result = diff_fn(old_lines, new_lines, file_path)
+    except DiffEngineError as e:
+        logger.warning(f"{e}; falling back to difflib")
+        result = difflib_diff(old_lines, new_lines, file_path)
+
+    return old_lines, new_lines, result
@@ -1,116 +1,200 @@
 import re
 import logging
-from typing import Dict, List, Tuple, Optional
+from array import array
+from typing import Any, Dict, Iterator, List, Tuple, Optional, Union
+
+from src.utils.line_index import LineIndex
 
 logger = logging.getLogger(__name__)
 
+CHANGE_ADD = 1
+CHANGE_REMOVE = -1
+
+_CHANGE_TYPE_NAMES = {CHANGE_ADD: 'add', CHANGE_REMOVE: 'remove'}
+
+
+class DiffHunk:
+    __slots__ = (
+        'old_start', 'new_start', 'new_length', 'header', 'kinds', 'line_numbers', 'contents'
+    )
+
+    def __init__(self, old_start: int, new_start: int, new_length: int, header: str):
+        self.old_start = old_start
+        self.new_start = new_start
+        self.new_length = new_length
+        self.header = header
+        self.kinds = array('b')
+        self.line_numbers = array('l')
+        self.contents: List[str] = []
+
+    def append(self, kind: int, line_number: int, content: str) -> None:
+        self.kinds.append(kind)
+        self.line_numbers.append(line_number)
+        self.contents.append(content)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def added_lines(self) -> List[int]:
+        return [
+            line for kind, line in zip(self.kinds, self.line_numbers) if kind == CHANGE_ADD
+        ]
+
+    def new_range(self) -> Tuple[int, int]:
+        return self.new_start, self.new_start + max(self.new_length, 1) - 1
+
+    def iter_changes(self) -> Iterator[Tuple[str, int, str]]:
+        for kind, line, content in zip(self.kinds, self.line_numbers, self.contents):
+            yield _CHANGE_TYPE_NAMES[kind], line, content
+
+
+class ParsedDiff:
+    __slots__ = ('hunks', 'line_map', '_line_index')
+
+    def __init__(self):
+        self.hunks: List[DiffHunk] = []
+        self.line_map: Dict[str, int] = {}
+        self._line_index: Optional[LineIndex] = None
+
+    @property
+    def total_chunks(self) -> int:
+        return len(self.hunks)
+
+    def changed_line_ranges(self) -> List[Tuple[int, int]]:
+        ranges = []
+        for hunk in self.hunks:
+            lines = hunk.added_lines()
+            if lines:
+                ranges.append((min(lines), max(lines)))
+        return ranges
+
+    @property
+    def line_index(self) -> LineIndex:
+        if self._line_index is None:
+            self._line_index = LineIndex(
+                added=(
+                    (line, content)
+                    for hunk in self.hunks
+                    for kind, line, content in zip(hunk.kinds, hunk.line_numbers, hunk.contents)
+                    if kind == CHANGE_ADD
+                ),
+                hunk_ranges=(hunk.new_range() for hunk in self.hunks),
+            )
+        return self._line_index
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'chunks': [
+                {
+                    'old_start': hunk.old_start,
+                    'new_start': hunk.new_start,
+                    'header': hunk.header,
+                    'changes': [
+                        {'type': change_type, 'line': line, 'content': content}
+                        for change_type, line, content in hunk.iter_changes()
+                    ],
+                }
+                for hunk in self.hunks
+            ],
+            'line_map': dict(self.line_map),
+            'total_chunks': self.total_chunks,
+        }
+
+
+DiffInput = Union[str, ParsedDiff]
+
 
 class DiffParser:
     HUNK_HEADER_PATTERN = re.compile(r'@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
 
     @staticmethod
-    def parse_diff(diff_text: str) -> Dict[str, any]:
-        chunks = []
-        line_map = {}
+    def parse(diff_text: str) -> ParsedDiff:
+        parsed = ParsedDiff()
+        line_map = parsed.line_map
+        hunk: Optional[DiffHunk] = None
 
-        lines = diff_text.split('\n')
         current_old_line = 0
         current_new_line = 0
-        in_hunk = False
-
-        for line in lines:
-            match = DiffParser.HUNK_HEADER_PATTERN.search(line)
-            if match:
-                old_start = int(match.group(1))
-                new_start = int(match.group(3))
-
-                current_old_line = old_start
-                current_new_line = new_start
-                in_hunk = True
-
-                chunks.append({
-                    'old_start': old_start,
-                    'new_start': new_start,
-                    'header': line,
-                    'changes': []
-                })
-
-                logger.debug(f"Found hunk: old={old_start}, new={new_start}")
-                continue
 
-            if not in_hunk:
+        for line in diff_text.split('\n'):
+            if line.startswith('@@'):
+                match = DiffParser.HUNK_HEADER_PATTERN.search(line)
+                if match:
+                    current_old_line = int(match.group(1))
+                    current_new_line = int(match.group(3))
+                    new_length = int(match.group(4)) if match.group(4) is not None else 1
+                    hunk = DiffHunk(current_old_line, current_new_line, new_length, line)
+                    parsed.hunks.append(hunk)
+                    continue
+
+            if hunk is None:
                 continue
 
-            if line.startswith('+') and not line.startswith('+++'):
+            tag = line[:1]
+            if tag == '+' and not line.startswith('+++'):
                 content = line[1:].strip()
                 if content:
                     line_map[content] = current_new_line
-                    chunks[-1]['changes'].append({
-                        'type': 'add',
-                        'line': current_new_line,
-                        'content': content
-                    })
+                    hunk.append(CHANGE_ADD, current_new_line, content)
                 current_new_line += 1
 
-            elif line.startswith('-') and not line.startswith('---'):
-                content = line[1:].strip()
-                chunks[-1]['changes'].append({
-                    'type': 'remove',
-                    'line': current_old_line,
-                    'content': content
-                })
+            elif tag == '-' and not line.startswith('---'):
+                hunk.append(CHANGE_REMOVE, current_old_line, line[1:].strip())
                 current_old_line += 1
 
-            elif line.startswith(' '):
+            elif tag == ' ':
                 current_old_line += 1
                 current_new_line += 1
 
-        return {
-            'chunks': chunks,
-            'line_map': line_map,
-            'total_chunks': len(chunks)
-        }
+        return parsed
 
     @staticmethod
-    def find_line_for_code(diff_text: str, code_snippet: str) -> Optional[int]:
-        parsed = DiffParser.parse_diff(diff_text)
-
-        code_clean = code_snippet.strip()
-        if code_clean in parsed['line_map']:
-            return parsed['line_map'][code_clean]
+    def ensure_parsed(diff: DiffInput) -> ParsedDiff:
+        if isinstance(diff, ParsedDiff):
+            return diff
+        return DiffParser.parse(diff or '')
 
-        code_partial = code_clean[:50]
-        for content, line_num in parsed['line_map'].items():
-            if content.startswith(code_partial):
-                return line_num
+    @staticmethod
+    def for_file(file_info: Dict[str, Any]) -> ParsedDiff:
+        parsed = file_info.get('parsed_diff')
+        if parsed is None:
+            parsed = DiffParser.parse(file_info.get('diff') or '')
+            file_info['parsed_diff'] = parsed
+        return parsed
 
-        return None
+    @staticmethod
+    def attach_parsed(files: List[Dict[str, Any]]) -> None:
+        for file_info in files:
+            DiffParser.for_file(file_info)
 
     @staticmethod
-    def get_changed_line_ranges(diff_text: str) -> List[Tuple[int, int]]:
-        parsed = DiffParser.parse_diff(diff_text)
-        ranges = []
+    def parse_diff(diff_text: str) -> Dict[str, any]:
+        return DiffParser.parse(diff_text).to_dict()
 
-        for chunk in parsed['chunks']:
-            if chunk['changes']:
-                lines = [c['line'] for c in chunk['changes'] if c['type'] == 'add']
-                if lines:
-                    ranges.append((min(lines), max(lines)))
+    @staticmethod
+    def find_line_for_code(
+        diff: DiffInput, code_snippet: str, near: Optional[int] = None
+    ) -> Optional[int]:
+        return DiffParser.ensure_parsed(diff).line_index.lookup(code_snippet, near=near)
 
-        return ranges
+    @staticmethod
+    def get_changed_line_ranges(diff: DiffInput) -> List[Tuple[int, int]]:
+        return DiffParser.ensure_parsed(diff).changed_line_ranges()
 
     @staticmethod
-    def annotate_diff_with_lines(diff_text: str) -> str:
-        parsed = DiffParser.parse_diff(diff_text)
+    def annotate_diff_with_lines(diff: DiffInput) -> str:
+        parsed = DiffParser.ensure_parsed(diff)
         annotated_lines = []
 
-        for chunk in parsed['chunks']:
-            annotated_lines.append(f"\n{chunk['header']}")
-            annotated_lines.append(f"  (Lines {chunk['new_start']} onwards)")
+        for hunk in parsed.hunks:
+            annotated_lines.append(f"\n{hunk.header}")
+            annotated_lines.append(f"  (Lines {hunk.new_start} onwards)")
 
-            for change in chunk['changes'][:5]:
+            for index in range(min(5, len(hunk))):
+                change_type = _CHANGE_TYPE_NAMES[hunk.kinds[index]]
                 annotated_lines.append(
-                    f"  [{change['line']:4d}] {change['type']:6s}: {change['content'][:60]}"
+                    f"  [{hunk.line_numbers[index]:4d}] {change_type:6s}: "
+                    f"{hunk.contents[index][:60]}"
                 )
 
         return '\n'.join(annotated_lines)
@@ -0,0 +1,109 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+DiffJob = Tuple[Optional[str], Optional[str], str]
+
+
+def job_size(job: DiffJob) -> int:
+    old_content, new_content, _ = job
+    return len(old_content or "") + len(new_content or "")
+
+
+class DiffProcessPool:
+    _executor: Optional[ProcessPoolExecutor] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def get_workers() -> int:
+        return Settings.DIFF_PROCESS_WORKERS or os.cpu_count() or 1
+
+    @staticmethod
+    def get_executor() -> ProcessPoolExecutor:
+        if DiffProcessPool._executor is None:
+            with DiffProcessPool._lock:
+                if DiffProcessPool._executor is None:
+                    workers = DiffProcessPool.get_workers()
+                    # spawn: forking a process that holds HTTP/thread-pool locks is unsafe
+                    DiffProcessPool._executor = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    logger.info(f"[DIFF_POOL] Process pool started with {workers} worker(s)")
+        return DiffProcessPool._executor
+
+    @staticmethod
+    def compute(diff_fn: Callable[..., Dict], jobs: List[DiffJob]) -> List[Dict]:
+        large = [
+            index for index, job in enumerate(jobs)
+            if job_size(job) >= Settings.DIFF_PROCESS_MIN_BYTES
+        ]
+
+        use_pool = (
+            Settings.DIFF_PROCESS_POOL_ENABLED
+            and len(large) >= 2
+            and DiffProcessPool.get_workers() > 1
+        )
+        if not use_pool:
+            return [diff_fn(*job) for job in jobs]
+
+        logger.info(
+            f"[DIFF_POOL] Diffing {len(large)} large file(s) across processes, "
+            f"{len(jobs) - len(large)} in-process"
+        )
+
+        futures: Dict[int, Future] = {}
+        executor = DiffProcessPool.get_executor()
+        try:
+            for index in large:
+                futures[index] = executor.submit(diff_fn, *jobs[index])
+        except (BrokenProcessPool, RuntimeError) as e:
+            logger.warning(f"[DIFF_POOL] Could not submit to process pool ({e}), diffing in-process")
+            DiffProcessPool.discard(executor)
+            for future in futures.values():
+                future.cancel()
+            futures = {}
+
+        results: List[Optional[Dict]] = [
+            None if index in futures else diff_fn(*job) for index, job in enumerate(jobs)
+        ]
+
+        for index, future in futures.items():
+            try:
+                results[index] = future.result()
+            except (BrokenProcessPool, CancelledError) as e:
+                logger.warning(
+                    f"[DIFF_POOL] Pool job lost ({e.__class__.__name__}), "
+                    f"diffing {jobs[index][2]} in-process"
+                )
+                DiffProcessPool.discard(executor)
+                results[index] = diff_fn(*jobs[index])
+
+        return results
+
+    @staticmethod
+    def discard(executor: ProcessPoolExecutor) -> None:
+        # Only retire the executor the caller saw break; other analyses may
+        # still be waiting on a replacement created in the meantime, and
+        # cancelling their futures would fail them too.
+        with DiffProcessPool._lock:
+            if DiffProcessPool._executor is not executor:
+                return
+            DiffProcessPool._executor = None
+        executor.shutdown(wait=False)
+        logger.info("[DIFF_POOL] Replaced broken process pool")
+
+    @staticmethod
+    def shutdown() -> None:
+        with DiffProcessPool._lock:
+            if DiffProcessPool._executor is not None:
+                DiffProcessPool._executor.shutdown(wait=False, cancel_futures=True)
+            DiffProcessPool._executor = None
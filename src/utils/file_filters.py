@@ -1,5 +1,8 @@
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+from src.settings import Settings
+from src.utils.rename_detection import build_rename_entry, is_pure_rename
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +27,31 @@ IGNORED_PATTERNS = [
 ]
 
 
+class SkippedBlob:
+    __slots__ = ("reason",)
+
+    def __init__(self, reason: str):
+        self.reason = reason
+
+    def __repr__(self) -> str:
+        return f"SkippedBlob({self.reason!r})"
+
+
+def looks_binary(head: bytes) -> bool:
+    return b"\x00" in head[: Settings.BINARY_SNIFF_BYTES]
+
+
+def should_ignore_path(file_path: str) -> bool:
+    extension = file_path.split(".")[-1].lower() if "." in file_path else ""
+
+    filename = file_path.split("/")[-1]
+
+    return (
+        extension in IGNORED_EXTENSIONS or
+        any(pattern in filename for pattern in IGNORED_PATTERNS)
+    )
+
+
 def filter_analyzable_files(files: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
     analyzable = []
     ignored = []
@@ -31,19 +59,70 @@ def filter_analyzable_files(files: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
     for file_info in files:
         file_path = file_info.get("path", "")
 
-        extension = file_path.split(".")[-1].lower() if "." in file_path else ""
-
-        filename = file_path.split("/")[-1]
-
-        should_ignore = (
-            extension in IGNORED_EXTENSIONS or
-            any(pattern in filename for pattern in IGNORED_PATTERNS)
-        )
-
-        if should_ignore:
+        if file_info.get("skipped_reason") or should_ignore_path(file_path):
             ignored.append(file_info)
             logger.debug(f"[FILTER] Ignoring file: {file_path}")
         else:
             analyzable.append(file_info)
 
-    return analyzable, ignored
\ No newline at end of file
+    return analyzable, ignored
+
+
+def build_stat_only_entry(change: Dict, reason: str) -> Dict:
+    item = change.get("item", {})
+    change_type_azure = change.get("changeType") or ""
+
+    if "add" in change_type_azure:
+        change_type = "added"
+    elif "delete" in change_type_azure:
+        change_type = "deleted"
+    else:
+        change_type = "modified"
+
+    return {
+        "path": item.get("path", ""),
+        "change_type": change_type,
+        "old_lines": 0,
+        "new_lines": 0,
+        "diff": "",
+        "additions": 0,
+        "deletions": 0,
+        "change_type_azure": change_type_azure,
+        "object_id": item.get("objectId"),
+        "skipped_reason": reason,
+    }
+
+
+def plan_file_fetches(changes: List[Dict]) -> List[Tuple[Dict, Optional[Dict]]]:
+    plan = []
+    skipped = 0
+
+    for change in changes:
+        item = change.get("item", {})
+        file_path = item.get("path", "")
+
+        if item.get("isFolder", False):
+            continue
+
+        stat_entry = None
+        if is_pure_rename(change):
+            stat_entry = build_rename_entry(change)
+        elif should_ignore_path(file_path):
+            stat_entry = build_stat_only_entry(change, "ignored")
+        elif (item.get("size") or 0) > Settings.MAX_FILE_BYTES:
+            stat_entry = build_stat_only_entry(change, "too_large")
+
+        if stat_entry is not None:
+            skipped += 1
+            logger.debug(
+                f"[FILTER] Not fetching {file_path} ({stat_entry['skipped_reason']})"
+            )
+
+        plan.append((change, stat_entry))
+
+    logger.info(
+        f"[FILTER] Fetch plan: {len(plan) - skipped} file(s) to download, "
+        f"{skipped} kept as stats only"
+    )
+
+    return plan
@@ -0,0 +1,173 @@
+import logging
+import os
+import re
+from typing import Dict, List, Pattern, Tuple
+
+from src.settings import Settings
+from src.utils.context_packer import llm_diff
+
+logger = logging.getLogger(__name__)
+
+AGENTS = ("security", "performance", "logical", "clean_code")
+
+CODE_EXTENSIONS = {
+    ".py", ".js", ".jsx", ".ts", ".tsx", ".java", ".kt", ".cs", ".go", ".rb", ".php",
+    ".rs", ".c", ".cc", ".cpp", ".h", ".hpp", ".swift", ".scala", ".sql", ".sh", ".ps1",
+    ".vue", ".svelte", ".dart", ".lua",
+}
+CONFIG_EXTENSIONS = {
+    ".yml", ".yaml", ".toml", ".ini", ".cfg", ".conf", ".env", ".properties", ".xml", ".tf",
+}
+CONFIG_FILENAMES = {"dockerfile", "docker-compose.yml", "requirements.txt", "package.json", "pom.xml"}
+
+# (pattern, weight) per agent, matched against the lower-cased file path.
+PATH_SIGNALS: Dict[str, List[Tuple[Pattern, float]]] = {
+    "security": [
+        (re.compile(
+            r"auth|login|logout|passw|secret|token|crypt|secur|permission|session|oauth|jwt|acl"
+        ), 2.0),
+        (re.compile(r"middleware|controller|route|handler|endpoint|api/|upload|webhook"), 1.0),
+    ],
+    "performance": [
+        (re.compile(
+            r"repositor|dao|query|queries|cache|worker|job|queue|batch|pipeline|stream"
+        ), 2.0),
+        (re.compile(r"service|client|db|database|model|loader|index|search"), 1.0),
+    ],
+    "logical": [],
+    "clean_code": [],
+}
+
+# (pattern, weight) per agent, matched against the added lines of the diff.
+CONTENT_SIGNALS: Dict[str, List[Tuple[Pattern, float]]] = {
+    "security": [
+        (re.compile(
+            r"passw(or)?d|secret|api[_-]?key|private[_-]?key|\btoken\b|credential|"
+            r"encrypt|decrypt|\bcipher|\bhash(lib)?\b|md5|sha1|bcrypt|hmac|jwt|oauth|"
+            r"csrf|cors|cookie|\bsession\b|authori[sz]|authenticat|permission|sanitiz|escape",
+            re.IGNORECASE,
+        ), 2.0),
+        (re.compile(
+            r"\beval\(|\bexec\(|os\.system|subprocess|shell\s*=\s*true|pickle\.loads?|"
+            r"yaml\.load\(|innerhtml|dangerouslysetinnerhtml|verify\s*=\s*false|"
+            r"\b(select|insert|update|delete)\b.+\b(from|into|set|where)\b|\.raw\(|format\(.*sql",
+            re.IGNORECASE,
+        ), 2.0),
+        (re.compile(
+            r"request\.|req\.(body|query|params)|\binput\(|open\(|redirect", re.IGNORECASE
+        ), 1.0),
+    ],
+    "performance": [
+        (re.compile(
+            r"\b(select|insert|update|delete)\b.+\b(from|into|set|where)\b|\.execute\(|"
+            r"\.query\(|\.filter\(|\.all\(\)|\bjoin\b|n\s*\+\s*1",
+            re.IGNORECASE,
+        ), 2.0),
+        (re.compile(
+            r"threading|\block\b|semaphore|mutex|asyncio|\bawait\b|concurrent|executor|"
+            r"thread|goroutine|\bsync\.|atomic|parallel",
+            re.IGNORECASE,
+        ), 1.5),
+        (re.compile(
+            r"requests\.|httpx|fetch\(|axios|urlopen|\.read\(|\.write\(|open\(|sleep\(|"
+            r"cache|sorted\(|\.sort\(|deepcopy|json\.(loads|dumps)|regex|re\.compile",
+            re.IGNORECASE,
+        ), 1.0),
+    ],
+    "logical": [
+        (re.compile(
+            r"\b(if|elif|else|switch|case|while|for|return|try|catch|except|raise|throw)\b"
+        ), 1.0),
+    ],
+    "clean_code": [
+        (re.compile(r"\b(def|class|function|interface|struct|func|fn)\b|=>"), 1.0),
+    ],
+}
+
+_LOOP_PATTERN = re.compile(r"^\s*(for|while)\b|\.(forEach|map)\(", re.IGNORECASE)
+_IO_PATTERN = re.compile(
+    r"\.execute\(|\.query\(|requests\.|fetch\(|urlopen|\.get\(|\.post\(|open\(|\.save\(|\.read\(",
+    re.IGNORECASE,
+)
+LOOP_IO_WINDOW = 6
+
+# Code files lean towards logic and readability review, but the base stays
+# below FILE_ROUTING_MIN_SCORE so content signals still decide the route.
+CODE_BASE_SCORE = {"security": 0.0, "performance": 0.0, "logical": 0.5, "clean_code": 0.5}
+CONFIG_SECURITY_SCORE = 1.0
+
+
+def _added_lines(file_info: Dict) -> List[str]:
+    return [
+        line[1:]
+        for line in llm_diff(file_info).split("\n")
+        if line.startswith("+") and not line.startswith("+++")
+    ]
+
+
+def _has_loop_over_io(lines: List[str]) -> bool:
+    for position, line in enumerate(lines):
+        following = lines[position + 1: position + LOOP_IO_WINDOW]
+        if _LOOP_PATTERN.search(line) and any(_IO_PATTERN.search(text) for text in following):
+            return True
+    return False
+
+
+def score_file(file_info: Dict) -> Dict[str, float]:
+    path = (file_info.get("path") or "").lower()
+    name = os.path.basename(path)
+    extension = os.path.splitext(name)[1]
+    is_code = extension in CODE_EXTENSIONS
+    is_config = extension in CONFIG_EXTENSIONS or name in CONFIG_FILENAMES
+
+    lines = _added_lines(file_info)
+    added_text = "\n".join(lines)
+
+    scores = {}
+    for agent in AGENTS:
+        score = CODE_BASE_SCORE[agent] if is_code else 0.0
+        if agent == "security" and is_config:
+            score += CONFIG_SECURITY_SCORE
+        score += sum(weight for pattern, weight in PATH_SIGNALS[agent] if pattern.search(path))
+        score += sum(
+            weight for pattern, weight in CONTENT_SIGNALS[agent] if pattern.search(added_text)
+        )
+        scores[agent] = score
+
+    if _has_loop_over_io(lines):
+        scores["performance"] += 2.0
+
+    return scores
+
+
+def route_files(files: List[Dict]) -> Dict[str, List[int]]:
+    candidates = [
+        position
+        for position, file_info in enumerate(files)
+        if file_info.get("diff") and not file_info.get("skipped_reason")
+    ]
+
+    if not Settings.FILE_ROUTING_ENABLED:
+        return {agent: list(candidates) for agent in AGENTS}
+
+    scores = {position: score_file(files[position]) for position in candidates}
+    min_score = Settings.FILE_ROUTING_MIN_SCORE
+
+    routes = {}
+    for agent in AGENTS:
+        routed = [position for position in candidates if scores[position][agent] >= min_score]
+        # A prefilter that matches nothing is more likely wrong than the PR
+        # being irrelevant to the agent, so fall back to every file with any
+        # signal at all, and only then to the full set.
+        routes[agent] = (
+            routed
+            or [position for position in candidates if scores[position][agent] > 0]
+            or list(candidates)
+        )
+
+    logger.info(
+        "[ROUTER] Files routed per agent: "
+        + ", ".join(f"{agent}={len(routes[agent])}/{len(candidates)}" for agent in AGENTS)
+    )
+
+    return routes
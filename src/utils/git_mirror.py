@@ -0,0 +1,358 @@
+import logging
+import os
+import subprocess
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from src.settings import Settings
+from src.utils.azure_requests import AzureManager
+from src.utils.file_filters import (
+    SkippedBlob,
+    build_stat_only_entry,
+    looks_binary,
+    plan_file_fetches,
+)
+from src.utils.rename_detection import merge_exact_renames
+
+logger = logging.getLogger(__name__)
+
+_NULL_SHA = "0" * 40
+
+# git diff has no --pathspec-from-file, so long path lists are split into
+# several invocations that each stay far below ARG_MAX.
+MAX_PATHSPEC_BYTES = 64 * 1024
+
+_STATUS_TO_CHANGE_TYPE = {
+    "A": "add",
+    "D": "delete",
+    "M": "edit",
+    "T": "edit",
+}
+
+
+class GitMirrorError(Exception):
+    pass
+
+
+def _pathspec_batches(paths: List[str]) -> List[List[str]]:
+    batches: List[List[str]] = []
+    size = MAX_PATHSPEC_BYTES
+    for path in paths:
+        path_bytes = len(path.encode("utf-8")) + 1
+        if size + path_bytes > MAX_PATHSPEC_BYTES:
+            batches.append([])
+            size = 0
+        batches[-1].append(path)
+        size += path_bytes
+    return batches
+
+
+def _parse_patch(output: str) -> Dict[str, Tuple[str, int, int]]:
+    diffs: Dict[str, Tuple[str, int, int]] = {}
+    current_path = None
+    current_lines: List[str] = []
+    additions = deletions = 0
+    in_hunk = False
+
+    def flush():
+        if current_path is not None:
+            diffs[current_path] = ("\n".join(current_lines), additions, deletions)
+
+    for line in output.split("\n"):
+        if line.startswith("diff --git "):
+            flush()
+            current_path = None
+            current_lines = []
+            additions = deletions = 0
+            in_hunk = False
+            continue
+
+        if not in_hunk:
+            if line.startswith("+++ "):
+                current_path = "/" + line[4:].rstrip("\t").split("/", 1)[-1]
+                current_lines.append(f"+++ b{current_path}")
+            elif line.startswith("--- "):
+                current_lines.append(line.rstrip("\t"))
+            elif line.startswith("@@"):
+                in_hunk = True
+                current_lines.append(line)
+            continue
+
+        if line.startswith("@@") or line.startswith(" ") or line.startswith("\\"):
+            current_lines.append(line)
+        elif line.startswith("+"):
+            current_lines.append(line)
+            additions += 1
+        elif line.startswith("-"):
+            current_lines.append(line)
+            deletions += 1
+
+    flush()
+    return diffs
+
+
+class GitMirrorManager:
+    _lock = threading.Lock()
+
+    def __init__(self, remote_url: Optional[str] = None, mirror_dir: Optional[str] = None):
+        self.remote_url = remote_url or Settings.AZURE_GIT_REMOTE_URL
+        self.mirror_dir = mirror_dir or Settings.GIT_MIRROR_DIR
+
+        if not self.remote_url:
+            raise GitMirrorError("AZURE_GIT_REMOTE_URL must be defined to use the git backend")
+
+    def _env(self) -> Dict[str, str]:
+        env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+        if Settings.AZURE_OAUTH_TOKEN and self.remote_url.startswith("http"):
+            env.update(
+                {
+                    "GIT_CONFIG_COUNT": "1",
+                    "GIT_CONFIG_KEY_0": "http.extraHeader",
+                    "GIT_CONFIG_VALUE_0": f"Authorization: Bearer {Settings.AZURE_OAUTH_TOKEN}",
+                }
+            )
+        return env
+
+    def _run(self, args: List[str], input_bytes: Optional[bytes] = None) -> bytes:
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                input=input_bytes,
+                capture_output=True,
+                env=self._env(),
+                timeout=Settings.GIT_MIRROR_TIMEOUT_SECONDS,
+                check=False,
+            )
+        except subprocess.TimeoutExpired:
+            raise GitMirrorError(
+                f"git {args[0]} timed out after {Settings.GIT_MIRROR_TIMEOUT_SECONDS}s"
+            )
+        if result.returncode != 0:
+            raise GitMirrorError(
+                f"git {args[0]} failed ({result.returncode}): "
+                f"{result.stderr.decode('utf-8', errors='replace').strip()}"
+            )
+        return result.stdout
+
+    def _git(self, *args: str, input_bytes: Optional[bytes] = None) -> bytes:
+        return self._run(["--git-dir", self.mirror_dir, *args], input_bytes=input_bytes)
+
+    def _has_commit(self, commit: str) -> bool:
+        try:
+            self._git("cat-file", "-e", f"{commit}^{{commit}}")
+            return True
+        except GitMirrorError:
+            return False
+
+    def sync(self, required_commits: List[str]) -> None:
+        with GitMirrorManager._lock:
+            if not os.path.isdir(self.mirror_dir):
+                logger.info(f"[GIT_MIRROR] Cloning bare mirror into {self.mirror_dir}")
+                os.makedirs(os.path.dirname(os.path.abspath(self.mirror_dir)), exist_ok=True)
+                self._run(["clone", "--mirror", "--quiet", self.remote_url, self.mirror_dir])
+            elif all(self._has_commit(commit) for commit in required_commits):
+                logger.info("[GIT_MIRROR] Mirror already has the required commits")
+            else:
+                logger.info("[GIT_MIRROR] Refreshing mirror with incremental fetch")
+                self._git("fetch", "--prune", "--quiet", "origin")
+
+        missing = [commit for commit in required_commits if not self._has_commit(commit)]
+        if missing:
+            raise GitMirrorError(f"Commits not found in mirror: {', '.join(missing)}")
+
+    def merge_base(self, base_commit: str, target_commit: str) -> str:
+        return self._git("merge-base", base_commit, target_commit).decode().strip()
+
+    def list_changes(self, base_commit: str, target_commit: str) -> List[Dict]:
+        output = self._git(
+            "diff", "--raw", "-z", "--no-renames", "--no-abbrev", base_commit, target_commit
+        )
+
+        changes = []
+        fields = output.split(b"\0")
+        for meta, path in zip(fields[0::2], fields[1::2]):
+            if not meta.startswith(b":"):
+                continue
+            _, _, old_sha, new_sha, status = meta[1:].decode().split(" ")
+            change_type = _STATUS_TO_CHANGE_TYPE.get(status[0], "edit")
+            changes.append(
+                {
+                    "changeType": change_type,
+                    "item": {
+                        "path": "/" + path.decode("utf-8", errors="replace"),
+                        "objectId": None if new_sha == _NULL_SHA else new_sha,
+                        "originalObjectId": None if old_sha == _NULL_SHA else old_sha,
+                    },
+                }
+            )
+
+        return changes
+
+    def blob_sizes(self, object_ids: List[str]) -> Dict[str, int]:
+        output = self._git(
+            "cat-file",
+            "--batch-check",
+            input_bytes="".join(f"{oid}\n" for oid in object_ids).encode(),
+        )
+
+        sizes = {}
+        for object_id, line in zip(object_ids, output.decode().splitlines()):
+            header = line.split(" ")
+            if len(header) >= 3 and header[1] != "missing":
+                sizes[object_id] = int(header[2])
+        return sizes
+
+    def read_blobs(self, object_ids: List[str]) -> Dict[str, Union[str, SkippedBlob]]:
+        object_ids = list(dict.fromkeys(oid for oid in object_ids if oid))
+        if not object_ids:
+            return {}
+
+        # Sizes first, so blobs over the cap are never loaded into memory.
+        sizes = self.blob_sizes(object_ids)
+        blobs: Dict[str, Union[str, SkippedBlob]] = {
+            object_id: SkippedBlob("too_large")
+            for object_id, size in sizes.items()
+            if size > Settings.MAX_FILE_BYTES
+        }
+        wanted = [object_id for object_id in sizes if object_id not in blobs]
+        if not wanted:
+            return blobs
+
+        output = self._git(
+            "cat-file", "--batch", input_bytes="".join(f"{oid}\n" for oid in wanted).encode()
+        )
+
+        position = 0
+        for object_id in wanted:
+            header_end = output.index(b"\n", position)
+            header = output[position:header_end].decode().split(" ")
+            position = header_end + 1
+
+            if len(header) < 3 or header[1] == "missing":
+                continue
+
+            size = int(header[2])
+            data = output[position : position + size]
+            position += size + 1
+
+            if looks_binary(data):
+                blobs[object_id] = SkippedBlob("binary")
+            else:
+                blobs[object_id] = data.decode("utf-8", errors="replace")
+
+        return blobs
+
+    def diff_paths(
+        self, base_commit: str, target_commit: str, paths: List[str]
+    ) -> Dict[str, Tuple[str, int, int]]:
+        diffs: Dict[str, Tuple[str, int, int]] = {}
+        for batch in _pathspec_batches([path.lstrip("/") for path in paths]):
+            output = self._git(
+                "--literal-pathspecs", "-c", "core.quotePath=false",
+                "diff", "--no-color", "--no-ext-diff", "--no-renames", "-U3",
+                base_commit, target_commit, "--", *batch,
+            ).decode("utf-8", errors="replace")
+            diffs.update(_parse_patch(output))
+        return diffs
+
+    def get_pr_consolidated_changes(self, pr_id: int, pr_info: Dict) -> Optional[Dict]:
+        try:
+            source_branch = pr_info.get("sourceRefName", "").replace("refs/heads/", "")
+            target_branch = pr_info.get("targetRefName", "").replace("refs/heads/", "")
+            source_commit = (pr_info.get("lastMergeSourceCommit") or {}).get("commitId")
+            target_commit = (pr_info.get("lastMergeTargetCommit") or {}).get("commitId")
+
+            if not source_commit or not target_commit:
+                logger.error(f"[GIT_MIRROR] Missing merge commits in PR #{pr_id}")
+                return None
+
+            self.sync([source_commit, target_commit])
+            common_commit = self.merge_base(target_commit, source_commit)
+
+            changes = self.list_changes(common_commit, source_commit)
+            if Settings.RENAME_DETECTION_ENABLED:
+                changes = merge_exact_renames(changes)
+            fetch_plan = plan_file_fetches(changes)
+
+            blobs = self.read_blobs(
+                [
+                    object_id
+                    for change, stat_entry in fetch_plan
+                    if stat_entry is None
+                    for object_id in AzureManager.blob_ids_for_change(change)
+                ]
+            )
+
+            modified_paths = [
+                change["item"]["path"]
+                for change, stat_entry in fetch_plan
+                if stat_entry is None and change["changeType"] == "edit"
+            ]
+            git_diffs = self.diff_paths(common_commit, source_commit, modified_paths)
+
+            processed_files = []
+            for change, stat_entry in fetch_plan:
+                if stat_entry is not None:
+                    processed_files.append(stat_entry)
+                    continue
+
+                item = change["item"]
+                file_path = item["path"]
+                old_id, new_id = AzureManager.blob_ids_for_change(change)
+                old_content = blobs.get(old_id) if old_id else None
+                new_content = blobs.get(new_id) if new_id else None
+
+                skipped = next(
+                    (c for c in (old_content, new_content) if isinstance(c, SkippedBlob)),
+                    None,
+                )
+                if skipped is not None:
+                    processed_files.append(build_stat_only_entry(change, skipped.reason))
+                    continue
+
+                if file_path in git_diffs:
+                    diff_text, additions, deletions = git_diffs[file_path]
+                    diff_result = {
+                        "path": file_path,
+                        "change_type": "modified",
+                        "old_lines": len(old_content.splitlines()) if old_content else 0,
+                        "new_lines": len(new_content.splitlines()) if new_content else 0,
+                        "diff": diff_text,
+                        "additions": additions,
+                        "deletions": deletions,
+                    }
+                else:
+                    diff_result = AzureManager.calculate_diff(old_content, new_content, file_path)
+
+                diff_result["change_type_azure"] = change["changeType"]
+                diff_result["object_id"] = item.get("objectId")
+                processed_files.append(diff_result)
+
+            total_additions = sum(f["additions"] for f in processed_files)
+            total_deletions = sum(f["deletions"] for f in processed_files)
+
+            logger.info(
+                f"[GIT_MIRROR] ✓ PR #{pr_id} computed locally ({source_branch} → {target_branch}): "
+                f"{len(processed_files)} files, +{total_additions}/-{total_deletions} lines"
+            )
+
+            return {
+                "pr_id": pr_id,
+                "source_branch": source_branch,
+                "target_branch": target_branch,
+                "total_files": len(processed_files),
+                "total_additions": total_additions,
+                "total_deletions": total_deletions,
+                "files": processed_files,
+                "truncated": False,
+                "incremental": False,
+                "source_commit": source_commit,
+                "target_commit": target_commit,
+                "common_commit": common_commit,
+                "cache_key": AzureManager.commit_pair_key(target_commit, source_commit),
+                "iteration_id": None,
+            }
+
+        except (GitMirrorError, OSError, ValueError) as e:
+            logger.error(f"[GIT_MIRROR] Error computing PR #{pr_id} locally: {e}")
+            return None
@@ -0,0 +1,276 @@
+import copy
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.settings import Settings
+from src.utils.response_cache import ResponseCache
+from src.utils.throttling import (
+    CircuitOpenError,
+    ThrottlingState,
+    compute_backoff,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+THROTTLE_STATUS = {429, 503}
+
+
+class HttpClient:
+    _session: Optional[requests.Session] = None
+    _adapter: Optional[HTTPAdapter] = None
+    _lock = threading.Lock()
+    _requests_sent = 0
+    _throttling: Optional[ThrottlingState] = None
+    _response_cache = ResponseCache(max_entries=Settings.AZURE_RESPONSE_CACHE_MAX_ENTRIES)
+
+    @staticmethod
+    def get_session() -> requests.Session:
+        if HttpClient._session is None:
+            with HttpClient._lock:
+                if HttpClient._session is None:
+                    HttpClient._session = HttpClient._create_session()
+        return HttpClient._session
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        adapter = HTTPAdapter(
+            pool_connections=Settings.AZURE_HTTP_POOL_CONNECTIONS,
+            pool_maxsize=Settings.AZURE_HTTP_POOL_MAXSIZE,
+            pool_block=True,
+        )
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+
+        HttpClient._adapter = adapter
+
+        logger.info(
+            f"[HTTP] Shared session created (pool_maxsize={Settings.AZURE_HTTP_POOL_MAXSIZE}, "
+            f"timeout=({Settings.AZURE_HTTP_CONNECT_TIMEOUT}s, {Settings.AZURE_HTTP_READ_TIMEOUT}s))"
+        )
+        return session
+
+    @staticmethod
+    def get_timeout() -> tuple:
+        return (Settings.AZURE_HTTP_CONNECT_TIMEOUT, Settings.AZURE_HTTP_READ_TIMEOUT)
+
+    @staticmethod
+    def get_throttling() -> ThrottlingState:
+        if HttpClient._throttling is None:
+            with HttpClient._lock:
+                if HttpClient._throttling is None:
+                    HttpClient._throttling = ThrottlingState(
+                        failure_threshold=Settings.AZURE_CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=Settings.AZURE_CIRCUIT_RESET_TIMEOUT,
+                        initial_limit=Settings.AZURE_FETCH_CONCURRENCY,
+                        max_limit=Settings.AZURE_HTTP_POOL_MAXSIZE,
+                    )
+        return HttpClient._throttling
+
+    @staticmethod
+    def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+        kwargs.setdefault("timeout", HttpClient.get_timeout())
+        session = HttpClient.get_session()
+        throttling = HttpClient.get_throttling()
+        breaker = throttling.breaker_for(urlparse(url).netloc)
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        max_retries = Settings.AZURE_HTTP_MAX_RETRIES
+
+        attempt = 0
+        while True:
+            try:
+                breaker.before_request()
+            except CircuitOpenError as e:
+                if attempt >= max_retries:
+                    raise
+                # Wait out the cool-down instead of failing fast, so a host that
+                # is recovering still gets served once the breaker half-opens.
+                delay = max(
+                    e.retry_in,
+                    compute_backoff(
+                        attempt, Settings.AZURE_HTTP_BACKOFF_BASE, Settings.AZURE_HTTP_BACKOFF_MAX
+                    ),
+                )
+                logger.warning(
+                    f"[HTTP] {method} {url} waiting {delay:.1f}s for circuit to half-open "
+                    f"({attempt + 1}/{max_retries})"
+                )
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            with HttpClient._lock:
+                HttpClient._requests_sent += 1
+
+            throttling.limiter.acquire()
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                breaker.record_failure()
+                safe_to_retry = idempotent or isinstance(
+                    e, requests.exceptions.ConnectTimeout
+                )
+                if attempt >= max_retries or not safe_to_retry:
+                    raise
+                delay = compute_backoff(
+                    attempt, Settings.AZURE_HTTP_BACKOFF_BASE, Settings.AZURE_HTTP_BACKOFF_MAX
+                )
+                logger.warning(
+                    f"[HTTP] {method} {url} failed ({e.__class__.__name__}), "
+                    f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+                )
+            else:
+                status = response.status_code
+                if status not in RETRYABLE_STATUS:
+                    if method.upper() not in ("GET", "HEAD", "OPTIONS") and status < 400:
+                        HttpClient._response_cache.invalidate_prefix(url)
+                    breaker.record_success()
+                    if HttpClient._is_near_rate_limit(response):
+                        throttling.limiter.on_throttle()
+                    else:
+                        throttling.limiter.on_success()
+                    return response
+
+                # A 429 means the host is up and pacing us, so only the limiter
+                # backs off. A 503 may be an outage too: it also counts toward the
+                # breaker, which a success in between resets.
+                if status in THROTTLE_STATUS:
+                    throttling.limiter.on_throttle()
+                if status == 429:
+                    breaker.release_trial()
+                else:
+                    breaker.record_failure()
+
+                safe_to_retry = idempotent or status in THROTTLE_STATUS
+                if attempt >= max_retries or not safe_to_retry:
+                    return response
+
+                delay = compute_backoff(
+                    attempt,
+                    Settings.AZURE_HTTP_BACKOFF_BASE,
+                    Settings.AZURE_HTTP_BACKOFF_MAX,
+                    retry_after=parse_retry_after(response.headers),
+                )
+                logger.warning(
+                    f"[HTTP] {method} {url} returned {status}, "
+                    f"retry {attempt + 1}/{max_retries} in {delay:.1f}s"
+                )
+                response.close()
+            finally:
+                throttling.limiter.release()
+
+            time.sleep(delay)
+            attempt += 1
+
+    @staticmethod
+    def _is_near_rate_limit(response: requests.Response) -> bool:
+        try:
+            remaining = float(response.headers.get("X-RateLimit-Remaining", ""))
+            limit = float(response.headers.get("X-RateLimit-Limit", ""))
+        except ValueError:
+            return False
+        return limit > 0 and remaining / limit < 0.1
+
+    @staticmethod
+    def get(url: str, **kwargs: Any) -> requests.Response:
+        return HttpClient.request("GET", url, **kwargs)
+
+    @staticmethod
+    def get_json(url: str, ttl: float, headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> Any:
+        cache = HttpClient._response_cache
+        entry = cache.get(url)
+
+        if entry is not None and entry.age() < ttl:
+            cache.record("fresh_hits")
+            return copy.deepcopy(entry.body)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+
+        response = HttpClient.get(url, headers=request_headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            logger.debug(f"[HTTP] 304 Not Modified, serving cached body for {url}")
+            cache.touch(entry)
+            cache.record("revalidated")
+            return copy.deepcopy(entry.body)
+
+        response.raise_for_status()
+        body = response.json()
+        cache.record("misses")
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified or ttl > 0:
+            cache.put(url, body, etag, last_modified)
+
+        return body
+
+    @staticmethod
+    def post(url: str, **kwargs: Any) -> requests.Response:
+        return HttpClient.request("POST", url, **kwargs)
+
+    @staticmethod
+    def patch(url: str, **kwargs: Any) -> requests.Response:
+        return HttpClient.request("PATCH", url, **kwargs)
+
+    @staticmethod
+    def get_pool_metrics() -> Dict[str, Any]:
+        metrics: Dict[str, Any] = {
+            "requests_sent": HttpClient._requests_sent,
+            "pool_maxsize": Settings.AZURE_HTTP_POOL_MAXSIZE,
+            "hosts": {},
+        }
+
+        if HttpClient._throttling is not None:
+            metrics["throttling"] = HttpClient._throttling.get_metrics()
+
+        metrics["response_cache"] = HttpClient._response_cache.get_metrics()
+
+        adapter = HttpClient._adapter
+        if adapter is None:
+            return metrics
+
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+
+            num_connections = pool.num_connections
+            num_requests = pool.num_requests
+            metrics["hosts"][f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": num_connections,
+                "requests": num_requests,
+                "idle_connections": sum(
+                    1 for conn in list(pool.pool.queue) if conn is not None
+                ),
+                "reuse_ratio": (
+                    round(1 - num_connections / num_requests, 3)
+                    if num_requests
+                    else 0.0
+                ),
+            }
+
+        return metrics
+
+    @staticmethod
+    def close() -> None:
+        with HttpClient._lock:
+            if HttpClient._session is not None:
+                logger.info(f"[HTTP] Closing shared session: {HttpClient.get_pool_metrics()}")
+                HttpClient._session.close()
+            HttpClient._session = None
+            HttpClient._adapter = None
@@ -0,0 +1,173 @@
+import logging
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+MIN_FUZZY_SCORE = 0.5
+
+
+def normalize_code_line(line: str) -> str:
+    return _WHITESPACE_PATTERN.sub(" ", line).strip()
+
+
+def strip_diff_marker(line: str) -> str:
+    # Models often quote evidence straight from the diff, "+"/"-" included.
+    if line[:1] in ("+", "-", " ") and not line.startswith(("+++", "---")):
+        return line[1:]
+    return line
+
+
+def trigrams(text: str) -> List[str]:
+    if len(text) < 3:
+        return [text] if text else []
+    return [text[i : i + 3] for i in range(len(text) - 2)]
+
+
+class LineIndex:
+    def __init__(self, added: Iterable[Tuple[int, str]], hunk_ranges: Iterable[Tuple[int, int]]):
+        self._by_content: Dict[str, List[int]] = {}
+        for line_number, content in added:
+            normalized = normalize_code_line(content)
+            if normalized:
+                self._by_content.setdefault(normalized, []).append(line_number)
+
+        for line_numbers in self._by_content.values():
+            line_numbers.sort()
+
+        self._contents: List[str] = list(self._by_content)
+        self._trigram_postings: Dict[str, List[int]] = {}
+        self._trigram_counts: List[int] = []
+        for content_id, content in enumerate(self._contents):
+            grams = set(trigrams(content))
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._trigram_postings.setdefault(gram, []).append(content_id)
+
+        self._added_lines: List[int] = sorted(
+            line for line_numbers in self._by_content.values() for line in line_numbers
+        )
+
+        ranges = sorted(hunk_ranges)
+        self._hunk_starts: List[int] = [start for start, _ in ranges]
+        self._hunk_ends: List[int] = [end for _, end in ranges]
+
+    @staticmethod
+    def _nearest(candidates: List[int], near: Optional[int]) -> int:
+        if near is None or len(candidates) == 1:
+            return candidates[0]
+        position = bisect_left(candidates, near)
+        if position == 0:
+            return candidates[0]
+        if position == len(candidates):
+            return candidates[-1]
+        before, after = candidates[position - 1], candidates[position]
+        return before if near - before <= after - near else after
+
+    def hunk_for_line(self, line: int) -> Optional[Tuple[int, int]]:
+        position = bisect_right(self._hunk_starts, line) - 1
+        if position >= 0 and line <= self._hunk_ends[position]:
+            return self._hunk_starts[position], self._hunk_ends[position]
+        return None
+
+    def in_reach(self, candidate: int, line: int, max_distance: Optional[int] = None) -> bool:
+        hunk = self.hunk_for_line(line)
+        if hunk is not None and hunk[0] <= candidate <= hunk[1]:
+            return True
+        max_distance = Settings.LINE_SNAP_MAX_DISTANCE if max_distance is None else max_distance
+        return abs(candidate - line) <= max_distance
+
+    def _candidates(self, content: str, bound: Optional[int]) -> List[int]:
+        candidates = self._by_content.get(content, [])
+        if bound is None:
+            return candidates
+        return [candidate for candidate in candidates if self.in_reach(candidate, bound)]
+
+    def exact(
+        self, code_line: str, near: Optional[int] = None, bound: Optional[int] = None
+    ) -> Optional[int]:
+        candidates = self._candidates(normalize_code_line(code_line), bound)
+        return self._nearest(candidates, near) if candidates else None
+
+    def fuzzy(
+        self, code_line: str, near: Optional[int] = None, bound: Optional[int] = None
+    ) -> Optional[int]:
+        grams = set(trigrams(normalize_code_line(code_line)))
+        if not grams:
+            return None
+
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._trigram_postings.get(gram, ()))
+        if not shared:
+            return None
+
+        best_score = 0.0
+        best_ids: List[int] = []
+        for content_id, overlap in shared.items():
+            if bound is not None and not self._candidates(self._contents[content_id], bound):
+                continue
+            score = overlap / (len(grams) + self._trigram_counts[content_id] - overlap)
+            if score > best_score:
+                best_score, best_ids = score, [content_id]
+            elif score == best_score:
+                best_ids.append(content_id)
+
+        if best_score < MIN_FUZZY_SCORE:
+            return None
+
+        candidates = sorted(
+            line
+            for content_id in best_ids
+            for line in self._candidates(self._contents[content_id], bound)
+        )
+        return self._nearest(candidates, near)
+
+    def lookup(
+        self, code_snippet: str, near: Optional[int] = None, bound: Optional[int] = None
+    ) -> Optional[int]:
+        snippet_lines = [
+            strip_diff_marker(line) for line in code_snippet.splitlines() if line.strip()
+        ]
+        for line in snippet_lines:
+            found = self.exact(line, near, bound)
+            if found is not None:
+                return found
+        for line in snippet_lines:
+            found = self.fuzzy(line, near, bound)
+            if found is not None:
+                return found
+        return None
+
+    def snap(self, line: int, max_distance: Optional[int] = None) -> int:
+        hunk = self.hunk_for_line(line)
+        if hunk is not None:
+            candidates = self._added_lines[
+                bisect_left(self._added_lines, hunk[0]) : bisect_right(self._added_lines, hunk[1])
+            ]
+            return self._nearest(candidates, line) if candidates else line
+
+        # Outside every hunk the nearest added line may belong to unrelated
+        # code, so only move the comment when it is a near miss.
+        if not self._added_lines:
+            return line
+        max_distance = Settings.LINE_SNAP_MAX_DISTANCE if max_distance is None else max_distance
+        nearest = self._nearest(self._added_lines, line)
+        return nearest if abs(nearest - line) <= max_distance else line
+
+    def resolve(self, line: Optional[int], evidence: Optional[str] = None) -> Optional[int]:
+        if evidence:
+            # With a reported line, evidence may only refine it locally: generic
+            # snippets such as "return None" match all over a file.
+            found = self.lookup(evidence, near=line, bound=line)
+            if found is not None:
+                return found
+        if line is None:
+            return None
+        return self.snap(line)
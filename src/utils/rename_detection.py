@@ -0,0 +1,162 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+MIN_SIGNIFICANT_LINE_LENGTH = 3
+
+
+def original_path(change: Dict) -> Optional[str]:
+    return change.get("originalPath") or change.get("sourceServerItem")
+
+
+def is_rename(change: Dict) -> bool:
+    return "rename" in (change.get("changeType") or "").lower() and bool(original_path(change))
+
+
+def is_pure_rename(change: Dict) -> bool:
+    item = change.get("item", {})
+    return (
+        is_rename(change)
+        and bool(item.get("objectId"))
+        and item.get("objectId") == item.get("originalObjectId")
+    )
+
+
+def split_rename_candidates(changes: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
+    # Adds and deletes may pair up as renames with a change on a later diff
+    # page, so callers hold them back until every page has been seen.
+    if not Settings.RENAME_DETECTION_ENABLED:
+        return changes, []
+    ready, candidates = [], []
+    for change in changes:
+        change_type = (change.get("changeType") or "").lower()
+        (candidates if change_type in ("add", "delete") else ready).append(change)
+    return ready, candidates
+
+
+def merge_exact_renames(changes: List[Dict]) -> List[Dict]:
+    deleted_by_blob: Dict[str, int] = {}
+    for position, change in enumerate(changes):
+        change_type = (change.get("changeType") or "").lower()
+        item = change.get("item", {})
+        blob_id = item.get("originalObjectId") or item.get("objectId")
+        if change_type == "delete" and blob_id:
+            deleted_by_blob.setdefault(blob_id, position)
+
+    if not deleted_by_blob:
+        return changes
+
+    consumed: Set[int] = set()
+    merged: Dict[int, Dict] = {}
+    for position, change in enumerate(changes):
+        item = change.get("item", {})
+        if (change.get("changeType") or "").lower() != "add":
+            continue
+
+        source = deleted_by_blob.pop(item.get("objectId"), None)
+        if source is None:
+            continue
+
+        consumed.add(source)
+        merged[position] = {
+            **change,
+            "changeType": "rename",
+            "originalPath": changes[source]["item"]["path"],
+            "item": {**item, "originalObjectId": item.get("objectId")},
+        }
+
+    if merged:
+        logger.info(f"[RENAME] Paired {len(merged)} add/delete change(s) by blob id")
+
+    return [
+        merged.get(position, change)
+        for position, change in enumerate(changes)
+        if position not in consumed
+    ]
+
+
+def build_rename_entry(change: Dict) -> Dict:
+    item = change.get("item", {})
+    return {
+        "path": item.get("path", ""),
+        "original_path": original_path(change),
+        "change_type": "renamed",
+        "old_lines": 0,
+        "new_lines": 0,
+        "diff": "",
+        "additions": 0,
+        "deletions": 0,
+        "change_type_azure": change.get("changeType"),
+        "object_id": item.get("objectId"),
+        "skipped_reason": "renamed",
+    }
+
+
+def mark_renamed(diff_result: Dict, old_path: str) -> Dict:
+    new_path = diff_result["path"]
+    diff_text = diff_result.get("diff") or ""
+    if diff_text.startswith(f"--- a{new_path}"):
+        diff_result["diff"] = f"--- a{old_path}" + diff_text[len(f"--- a{new_path}"):]
+
+    diff_result["change_type"] = "renamed"
+    diff_result["original_path"] = old_path
+    return diff_result
+
+
+def _line_hashes(content: str) -> Counter:
+    return Counter(
+        hash(stripped)
+        for stripped in (line.strip() for line in content.splitlines())
+        if len(stripped) >= MIN_SIGNIFICANT_LINE_LENGTH
+    )
+
+
+def find_similar_renames(
+    deleted: Dict[int, str], added: Dict[int, str], threshold: Optional[float] = None
+) -> List[Tuple[int, int, float]]:
+    threshold = Settings.RENAME_SIMILARITY_THRESHOLD if threshold is None else threshold
+    if not deleted or not added:
+        return []
+
+    deleted_hashes = {slot: _line_hashes(content) for slot, content in deleted.items()}
+    deleted_totals = {slot: sum(hashes.values()) for slot, hashes in deleted_hashes.items()}
+    postings: Dict[int, List[int]] = {}
+    for slot, hashes in deleted_hashes.items():
+        for line_hash in hashes:
+            postings.setdefault(line_hash, []).append(slot)
+
+    candidates: List[Tuple[float, int, int]] = []
+    for added_slot, content in added.items():
+        added_hashes = _line_hashes(content)
+        added_total = sum(added_hashes.values())
+        if not added_total:
+            continue
+
+        shared: Counter = Counter()
+        for line_hash, count in added_hashes.items():
+            for deleted_slot in postings.get(line_hash, ()):
+                shared[deleted_slot] += min(count, deleted_hashes[deleted_slot][line_hash])
+
+        for deleted_slot, common in shared.items():
+            score = 2 * common / (added_total + deleted_totals[deleted_slot])
+            if score >= threshold:
+                candidates.append((score, deleted_slot, added_slot))
+
+    pairs = []
+    used_deleted: Set[int] = set()
+    used_added: Set[int] = set()
+    for score, deleted_slot, added_slot in sorted(candidates, reverse=True):
+        if deleted_slot in used_deleted or added_slot in used_added:
+            continue
+        used_deleted.add(deleted_slot)
+        used_added.add(added_slot)
+        pairs.append((deleted_slot, added_slot, score))
+
+    if pairs:
+        logger.info(f"[RENAME] Paired {len(pairs)} add/delete change(s) by content similarity")
+
+    return pairs
@@ -0,0 +1,85 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+
+def normalize_url(url: str) -> str:
+    # Azure DevOps treats scheme, host and path case-insensitively, so URLs
+    # built from differently-cased repository or project names share an entry.
+    parts = urlsplit(url)
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.lower(), parts.query, "")
+    )
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, body: Any, etag: Optional[str], last_modified: Optional[str]):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"fresh_hits": 0, "revalidated": 0, "misses": 0, "invalidated": 0}
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        url = normalize_url(url)
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def put(self, url: str, body: Any, etag: Optional[str], last_modified: Optional[str]) -> None:
+        url = normalize_url(url)
+        with self._lock:
+            self._entries[url] = CachedResponse(copy.deepcopy(body), etag, last_modified)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, entry: CachedResponse) -> None:
+        entry.fetched_at = time.monotonic()
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def invalidate_prefix(self, url: str) -> None:
+        target = urlsplit(normalize_url(url))
+        path = target.path.rstrip("/")
+        with self._lock:
+            stale = []
+            for cached_url in self._entries:
+                cached = urlsplit(cached_url)
+                if cached.netloc == target.netloc and f"{path}/".startswith(
+                    cached.path.rstrip("/") + "/"
+                ):
+                    stale.append(cached_url)
+            for cached_url in stale:
+                del self._entries[cached_url]
+            self.stats["invalidated"] += len(stale)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), **self.stats}
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_PROPERTY = "PRAnalyzer.IdempotencyKey"
+FINGERPRINT_PROPERTY = "PRAnalyzer.Fingerprint"
+AGENT_TYPE_PROPERTY = "PRAnalyzer.AgentType"
+
+ACTIVE_THREAD_STATUSES = {1, "active"}
+
+# Threads that received replies carry one key and fingerprint per comment.
+PROPERTY_LIST_SEPARATOR = ","
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_path(file_path: str) -> str:
+    return file_path if file_path.startswith("/") else f"/{file_path}"
+
+
+def location_key(file_path: Optional[str], line: Optional[int]) -> Tuple[str, Optional[int]]:
+    # Mirrors create_pr_thread: only line comments carry a threadContext, so
+    # anything without a line is a PR-level thread with no file at all.
+    if not file_path or line is None:
+        return ("", None)
+    return (normalize_path(file_path), line)
+
+
+def comment_fingerprint(message: str) -> str:
+    normalized = _WHITESPACE_PATTERN.sub(" ", message or "").strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+def get_thread_property(thread: Dict, name: str) -> Optional[str]:
+    prop = (thread.get("properties") or {}).get(name)
+    if isinstance(prop, dict):
+        return prop.get("$value")
+    return prop
+
+
+def get_thread_property_values(thread: Dict, name: str) -> List[str]:
+    value = get_thread_property(thread, name)
+    if not value:
+        return []
+    return [item for item in value.split(PROPERTY_LIST_SEPARATOR) if item]
+
+
+class ThreadIndex:
+    def __init__(self, threads: List[Dict]):
+        self._by_fingerprint: Dict[Tuple[str, Optional[int], str], Dict] = {}
+        self._by_location: Dict[Tuple[str, Optional[int]], List[Dict]] = {}
+        self._by_key: Dict[str, Dict] = {}
+        self._claimed: Set[int] = set()
+
+        indexed = 0
+        for thread in threads:
+            if thread.get("isDeleted"):
+                continue
+            self.add(thread)
+            indexed += 1
+
+        logger.info(
+            f"[THREAD_INDEX] Indexed {indexed} existing thread(s) "
+            f"at {len(self._by_location)} location(s)"
+        )
+
+    @staticmethod
+    def _location(thread: Dict) -> Tuple[str, Optional[int]]:
+        context = thread.get("threadContext") or {}
+        line = (context.get("rightFileStart") or {}).get("line")
+        return location_key(context.get("filePath"), line)
+
+    @staticmethod
+    def _first_comment(thread: Dict) -> str:
+        comments = thread.get("comments") or []
+        return comments[0].get("content", "") if comments else ""
+
+    @staticmethod
+    def is_ours(thread: Dict) -> bool:
+        return bool(
+            get_thread_property(thread, IDEMPOTENCY_PROPERTY)
+            or get_thread_property(thread, FINGERPRINT_PROPERTY)
+        )
+
+    def add(self, thread: Dict) -> None:
+        location = self._location(thread)
+        fingerprints = get_thread_property_values(thread, FINGERPRINT_PROPERTY) or [
+            comment_fingerprint(self._first_comment(thread))
+        ]
+
+        for fingerprint in fingerprints:
+            self._by_fingerprint[(*location, fingerprint)] = thread
+        self._by_location.setdefault(location, []).append(thread)
+
+        for key in get_thread_property_values(thread, IDEMPOTENCY_PROPERTY):
+            self._by_key[key] = thread
+
+    def attach(self, thread: Dict, properties: Dict[str, str]) -> Dict[str, str]:
+        # Append rather than replace, so every comment already in the thread
+        # keeps deduplicating on later runs.
+        location = self._location(thread)
+        merged = dict(properties)
+        thread_properties = thread.setdefault("properties", {})
+        for name in (IDEMPOTENCY_PROPERTY, FINGERPRINT_PROPERTY):
+            values = get_thread_property_values(thread, name)
+            value = properties.get(name)
+            if value and value not in values:
+                values.append(value)
+            merged[name] = PROPERTY_LIST_SEPARATOR.join(values)
+            thread_properties[name] = {"$value": merged[name]}
+
+        if properties.get(FINGERPRINT_PROPERTY):
+            self._by_fingerprint[(*location, properties[FINGERPRINT_PROPERTY])] = thread
+        if properties.get(IDEMPOTENCY_PROPERTY):
+            self._by_key[properties[IDEMPOTENCY_PROPERTY]] = thread
+        self._claimed.add(id(thread))
+        return merged
+
+    def find_duplicate(
+        self, file_path: str, line: Optional[int], fingerprint: str, key: str
+    ) -> Optional[Dict]:
+        return self._by_key.get(key) or self._by_fingerprint.get(
+            (*location_key(file_path, line), fingerprint)
+        )
+
+    def find_updatable(
+        self, file_path: str, line: Optional[int], agent_type: Optional[str]
+    ) -> Optional[Dict]:
+        location = location_key(file_path, line)
+        if location == ("", None):
+            # PR-level threads all share one location; dedupe them, never merge.
+            return None
+        for thread in self._by_location.get(location, []):
+            if not self.is_ours(thread):
+                continue
+            # A thread opened or already answered in this run belongs to another
+            # finding; a distinct one on the same line gets its own thread.
+            if "pending" in thread or id(thread) in self._claimed:
+                continue
+            if get_thread_property(thread, AGENT_TYPE_PROPERTY) != agent_type:
+                continue
+            return thread
+        return None
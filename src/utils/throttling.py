@@ -0,0 +1,179 @@
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def compute_backoff(
+    attempt: int,
+    base: float,
+    cap: float,
+    retry_after: Optional[float] = None,
+) -> float:
+    if retry_after is not None:
+        return min(cap, retry_after) + random.uniform(0, base)
+
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"Circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, host: str, failure_threshold: int, reset_timeout: float):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+
+            elapsed = time.monotonic() - self._opened_at
+            if self.state == self.OPEN and elapsed >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info(f"[CIRCUIT] {self.host} half-open, allowing a trial request")
+
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            raise CircuitOpenError(self.host, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"[CIRCUIT] {self.host} closed again")
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(
+                        f"[CIRCUIT] {self.host} opened after {self._failures} failure(s), "
+                        f"cooling down for {self.reset_timeout}s"
+                    )
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial_limit: int, min_limit: int, max_limit: int):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self._limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self._in_flight >= int(self._limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify()
+
+    def on_success(self) -> None:
+        with self._condition:
+            previous = int(self._limit)
+            self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            if int(self._limit) > previous:
+                self._condition.notify()
+
+    def on_throttle(self) -> None:
+        with self._condition:
+            previous = int(self._limit)
+            self._limit = max(float(self.min_limit), self._limit / 2)
+            if int(self._limit) < previous:
+                logger.warning(
+                    f"[THROTTLE] Concurrency limit decreased {previous} → {int(self._limit)}"
+                )
+
+
+class ThrottlingState:
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        initial_limit: int,
+        max_limit: int,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=initial_limit, min_limit=1, max_limit=max_limit
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker_for(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def get_metrics(self) -> Dict:
+        return {
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+            "circuits": {host: breaker.state for host, breaker in self._breakers.items()},
+        }
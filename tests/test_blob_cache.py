@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from src.settings import Settings
+from src.utils import blob_cache
+from src.utils.azure_requests import AzureManager
+from src.utils.blob_cache import BlobCache
+
+KEY = "ab" + "0" * 38
+
+
+def test_round_trip_counts_hits_and_misses(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=1024)
+    assert cache.get_text(KEY) is None
+    cache.put_text(KEY, "conteúdo")
+    assert cache.get_text(KEY) == "conteúdo"
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_counters_are_exact_under_concurrency(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=1024)
+    cache.put(KEY, b"x")
+    keys = [KEY, "cd" + "1" * 38] * 2000
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(cache.get, keys))
+    assert cache.hits == 2000
+    assert cache.misses == 2000
+
+
+def test_eviction_keeps_the_cache_within_budget(tmp_path):
+    cache = BlobCache(str(tmp_path), max_bytes=10)
+    for position in range(4):
+        cache.put(f"{position:02d}" + "0" * 38, b"12345")
+    assert cache.evictions == 2
+    assert cache._total_bytes <= 10
+
+
+def test_stale_compression_variant_is_removed_on_load(tmp_path):
+    folder = tmp_path / KEY[:2]
+    folder.mkdir()
+    (folder / KEY).write_bytes(b"plain")
+    (folder / f"{KEY}.zst").write_bytes(b"compressed")
+
+    cache = BlobCache(str(tmp_path), max_bytes=1024, compress=False)
+
+    assert sorted(os.listdir(folder)) == [KEY]
+    assert cache._total_bytes == len(b"plain")
+    assert cache.get(KEY) == b"plain"
+
+
+def test_rewriting_a_blob_removes_the_other_variant(tmp_path):
+    folder = tmp_path / KEY[:2]
+    folder.mkdir()
+    (folder / f"{KEY}.zst").write_bytes(b"compressed")
+
+    cache = BlobCache(str(tmp_path), max_bytes=1024, compress=False)
+    cache.put(KEY, b"plain")
+
+    assert sorted(os.listdir(folder)) == [KEY]
+    assert cache._total_bytes == len(b"plain")
+
+
+def test_diff_pages_are_cached_apart_from_blobs(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "BLOB_CACHE_ENABLED", True)
+    monkeypatch.setattr(Settings, "BLOB_CACHE_DIR", str(tmp_path / "blobs"))
+    monkeypatch.setattr(Settings, "DIFF_CACHE_DIR", str(tmp_path / "diffs"))
+    monkeypatch.setattr(blob_cache, "_blob_cache", None)
+    monkeypatch.setattr(blob_cache, "_diff_cache", None)
+    requested = []
+
+    def iter_diff_pages(**kwargs):
+        requested.append(kwargs)
+        yield {"commonCommit": "c", "targetCommit": "t", "changes": [{"item": {"path": "/a"}}]}
+
+    monkeypatch.setattr(AzureManager, "iter_diff_pages", staticmethod(iter_diff_pages))
+
+    first = list(AzureManager.iter_commit_diff_pages("base", "head"))
+    second = list(AzureManager.iter_commit_diff_pages("base", "head"))
+
+    assert len(requested) == 1
+    assert second[0]["changes"] == first[0]["changes"]
+    assert blob_cache.get_blob_cache()._sizes == {}
+    assert len(blob_cache.get_diff_cache()._sizes) == 1
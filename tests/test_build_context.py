@@ -0,0 +1,25 @@
+from src.core.nodes.build_context_node import _list_routed
+from src.settings import Settings
+
+FILES = [
+    {"path": "/auth.py", "change_type": "edit", "additions": 4, "deletions": 1, "diff": "@@"},
+    {"path": "/README.md", "change_type": "edit", "additions": 2, "deletions": 0, "diff": "@@"},
+    {"path": "/logo.png", "change_type": "added", "additions": 0, "deletions": 0, "diff": "",
+     "skipped_reason": "binary"},
+    {"path": "/dist/app.min.js", "change_type": "modified", "additions": 0, "deletions": 0,
+     "diff": "", "skipped_reason": "ignored"},
+]
+
+
+def test_listing_names_every_file_outside_the_route(monkeypatch):
+    monkeypatch.setattr(Settings, "MAP_REDUCE_MODE", "never")
+
+    listing, shards = _list_routed(FILES, [0], "Total de arquivos modificados: 4\n")
+
+    focus, others = listing.split("## Demais arquivos do PR")
+    assert "/auth.py (edit) +4 -1" in focus
+    assert "/README.md (edit) +2 -0" in others
+    assert "/logo.png (added) +0 -0 — sem diff (binary)" in others
+    assert "/dist/app.min.js (modified) +0 -0 — sem diff (ignored)" in others
+    assert "e mais" not in listing
+    assert shards == []
@@ -0,0 +1,80 @@
+from src.utils.context_packer import (
+    ContextPacker,
+    TokenCounter,
+    default_priority,
+    llm_diff,
+    render_file_section,
+)
+
+
+class WordCounter:
+    def count(self, text):
+        return len(text.split())
+
+
+def _file(path, additions, diff_lines=20, deletions=0, change_type="edit"):
+    return {
+        "path": path,
+        "change_type": change_type,
+        "additions": additions,
+        "deletions": deletions,
+        "diff": "\n".join(f"+line {n} of {path}" for n in range(diff_lines)),
+    }
+
+
+def test_token_counter_estimates_without_an_encoding():
+    counter = TokenCounter()
+    counter._encoding = None
+    assert counter.count("") == 0
+    assert counter.count("abcdefgh") == 2
+    assert counter.count("abcdefghi") == 3
+
+
+def test_llm_diff_prefers_the_compact_diff():
+    assert llm_diff({"diff": "full", "compact_diff": "short"}) == "short"
+    assert llm_diff({"diff": "full"}) == "full"
+
+
+def test_default_priority_discounts_deleted_files():
+    assert default_priority(_file("/a.py", 10)) > default_priority(
+        _file("/b.py", 0, deletions=20, change_type="deleted")
+    )
+
+
+def test_everything_fits_in_a_generous_budget():
+    files = [_file("/a.py", 5), _file("/b.py", 3)]
+    packed = ContextPacker(10_000, WordCounter()).pack(files, header="# PR")
+    assert packed.packed_files == ["/a.py", "/b.py"]
+    assert packed.dropped_files == []
+    assert "Outros arquivos" not in packed.text
+
+
+def test_lower_priority_diffs_become_stubs_within_budget():
+    counter = WordCounter()
+    files = [_file("/small.py", 1), _file("/big.py", 50)]
+    budget = counter.count(render_file_section(files[1])) + 60
+    packed = ContextPacker(budget, counter).pack(files)
+    assert packed.packed_files == ["/big.py"]
+    assert packed.dropped_files == ["/small.py"]
+    assert "  • /small.py (edit) +1 -0" in packed.text
+    assert packed.total_tokens <= budget
+
+
+def test_stub_overflow_collapses_into_one_line():
+    counter = WordCounter()
+    files = [_file(f"/pkg/module_{n}.py", n) for n in range(200)]
+    packed = ContextPacker(300, counter).pack(files, header="# PR")
+    assert packed.total_tokens <= 300
+    assert packed.packed_files == []
+    assert "/pkg/module_199.py" in packed.text
+    assert "/pkg/module_0.py" not in packed.text
+    omitted = [line for line in packed.text.splitlines() if "omitido(s)" in line]
+    assert len(omitted) == 1
+    listed = packed.text.count("  • /pkg/")
+    assert f"e mais {200 - listed} arquivo(s)" in omitted[0]
+
+
+def test_footer_is_kept_and_counted():
+    files = [_file("/a.py", 5)]
+    packed = ContextPacker(10_000, WordCounter()).pack(files, footer="-- fim --")
+    assert packed.text.endswith("-- fim --")
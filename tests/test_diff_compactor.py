@@ -0,0 +1,74 @@
+from src.utils.diff_compactor import (
+    collapse_deleted_file,
+    compact_file,
+    compact_unified_diff,
+    is_indent_sensitive,
+)
+
+
+def _diff(path, body, old_start=1, new_start=1):
+    old_len = sum(1 for line in body if line[:1] in (" ", "-"))
+    new_len = sum(1 for line in body if line[:1] in (" ", "+"))
+    header = f"@@ -{old_start},{old_len} +{new_start},{new_len} @@"
+    return "\n".join([f"--- a{path}", f"+++ b{path}", header, *body])
+
+
+def test_indent_sensitive_paths():
+    assert is_indent_sensitive("/src/app.py")
+    assert is_indent_sensitive("/deploy/values.YAML")
+    assert is_indent_sensitive("/Makefile")
+    assert not is_indent_sensitive("/src/app.ts")
+
+
+def test_whitespace_only_changes_are_folded_in_brace_languages():
+    diff = _diff("/app.js", [" a();", "-if (x){", "+if (x) {", "-  b();", "+    b();", " c();"])
+    compact = compact_unified_diff(diff)
+    assert "+if (x) {" not in compact
+    assert "4 linha(s) com mudanças só de espaço" in compact
+
+
+def test_indentation_changes_are_kept_in_python():
+    body = [" for item in items:", "     check(item)", "-save(item)", "+    save(item)"]
+    compact = compact_unified_diff(_diff("/app.py", body), indent_sensitive=True)
+    assert "+    save(item)" in compact
+    assert "-save(item)" in compact
+
+
+def test_trailing_whitespace_is_folded_in_python():
+    body = [" x = 1", "-y = 2   ", "+y = 2", " z = 3"]
+    compact = compact_unified_diff(_diff("/app.py", body), indent_sensitive=True)
+    assert "+y = 2" not in compact
+    assert "só de espaço" in compact
+
+
+def test_compact_file_detects_indent_sensitivity_from_the_path():
+    body = [" def run():", "-return 1", "+    return 1"]
+    compact = compact_file({"path": "/job.py", "diff": _diff("/job.py", body)})
+    assert "+    return 1" in compact
+
+
+def test_import_only_groups_are_elided():
+    body = ["-import os", "+import os, sys", " ", " x = compute()", "+y = x * 2"]
+    compact = compact_unified_diff(_diff("/app.py", body))
+    assert "import" not in compact.replace("imports", "")
+    assert "+y = x * 2" in compact
+    assert "2 linha(s) de imports" in compact
+
+
+def test_distant_context_is_trimmed_and_hunk_headers_recomputed():
+    body = [f" line{n}" for n in range(1, 11)] + ["-old", "+new"]
+    body += [f" tail{n}" for n in range(5)]
+    compact = compact_unified_diff(_diff("/app.js", body))
+    assert "@@ -9,5 +9,5 @@" in compact
+    assert " line1\n" not in compact
+    assert "linha(s) de contexto" in compact
+
+
+def test_deleted_files_collapse_to_their_definitions():
+    diff = "\n".join(["--- a/old.py", "+++ /dev/null", "@@ -1,3 +0,0 @@",
+                      "-class Legacy:", "-    def run(self):", "-        pass"])
+    collapsed = collapse_deleted_file({"path": "/old.py", "diff": diff, "deletions": 3})
+    assert "Arquivo removido (3 linhas)" in collapsed
+    assert "- class Legacy:" in collapsed
+    assert "- def run(self):" in collapsed
+    assert "pass" not in collapsed
@@ -0,0 +1,82 @@
+import shutil
+
+import pytest
+
+from src.settings import Settings
+from src.utils import diff_engine
+from src.utils.diff_engine import (
+    DiffEngineError,
+    compute_diff,
+    difflib_diff,
+    git_diff,
+    select_engine,
+)
+
+OLD = "".join(f"line {n}\n" for n in range(1, 21))
+NEW = OLD.replace("line 10\n", "line ten\n").replace("line 20\n", "line 20\nline 21\n")
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _lines(text):
+    return text.splitlines(keepends=True)
+
+
+def test_difflib_diff_counts_changes():
+    diff, additions, deletions = difflib_diff(_lines(OLD), _lines(NEW), "/app.py")
+    assert diff.startswith("--- a/app.py\n+++ b/app.py\n@@ ")
+    assert (additions, deletions) == (2, 1)
+
+
+@requires_git
+def test_git_diff_matches_difflib_format():
+    assert git_diff(_lines(OLD), _lines(NEW), "/app.py") == difflib_diff(
+        _lines(OLD), _lines(NEW), "/app.py"
+    )
+
+
+@requires_git
+def test_git_diff_of_identical_content_is_empty():
+    assert git_diff(_lines(OLD), _lines(OLD), "/app.py") == ("", 0, 0)
+
+
+@requires_git
+def test_git_diff_handles_files_without_trailing_newline():
+    old, new = "a\nb", "a\nc"
+    diff, additions, deletions = git_diff(_lines(old), _lines(new), "/x.txt")
+    assert (additions, deletions) == (1, 1)
+    assert diff.splitlines()[-2:] == ["-b", "+c"]
+
+
+def test_select_engine_honours_an_explicit_setting(monkeypatch):
+    monkeypatch.setattr(Settings, "DIFF_ENGINE", "difflib")
+    assert select_engine(OLD, NEW, _lines(OLD), _lines(NEW)) == "difflib"
+
+
+def test_auto_engine_uses_git_only_for_large_lf_content(monkeypatch):
+    monkeypatch.setattr(Settings, "DIFF_ENGINE", "auto")
+    monkeypatch.setattr(Settings, "DIFF_ENGINE_MIN_LINES", 10)
+    monkeypatch.setattr(diff_engine, "git_available", lambda: True)
+    assert select_engine(OLD, NEW, _lines(OLD), _lines(NEW)) == "git"
+    assert select_engine("a\n", "b\n", ["a\n"], ["b\n"]) == "difflib"
+    crlf = OLD.replace("\n", "\r\n")
+    assert select_engine(crlf, NEW, _lines(crlf), _lines(NEW)) == "difflib"
+
+
+def test_compute_diff_falls_back_to_difflib_on_engine_errors(monkeypatch):
+    def broken(old_lines, new_lines, file_path):
+        raise DiffEngineError("boom")
+
+    monkeypatch.setitem(diff_engine.DIFF_ENGINES, "git", broken)
+    _, _, result = compute_diff(OLD, NEW, "/app.py", engine="git")
+    assert result == difflib_diff(_lines(OLD), _lines(NEW), "/app.py")
+
+
+def test_compute_diff_never_sends_non_lf_content_to_git(monkeypatch):
+    def unexpected(old_lines, new_lines, file_path):
+        raise AssertionError("git engine used")
+
+    monkeypatch.setitem(diff_engine.DIFF_ENGINES, "git", unexpected)
+    old = "a\r\nb\r\n"
+    _, _, (diff, additions, deletions) = compute_diff(old, "a\r\nc\r\n", "/w.txt", engine="git")
+    assert (additions, deletions) == (1, 1)
@@ -0,0 +1,64 @@
+from src.utils.diff_parser import DiffParser, ParsedDiff
+
+DIFF = "\n".join([
+    "--- a/app.py",
+    "+++ b/app.py",
+    "@@ -1,4 +1,5 @@",
+    " import os",
+    "-x = 1",
+    "+x = 2",
+    "+y = compute(x)",
+    " ",
+    " def run():",
+    "@@ -20,2 +21,3 @@ def run():",
+    "     start()",
+    "+    stop()",
+    "     return",
+])
+
+
+def test_parse_tracks_new_line_numbers_per_hunk():
+    parsed = DiffParser.parse(DIFF)
+    assert parsed.total_chunks == 2
+    assert [list(hunk.iter_changes()) for hunk in parsed.hunks] == [
+        [("remove", 2, "x = 1"), ("add", 2, "x = 2"), ("add", 3, "y = compute(x)")],
+        [("add", 22, "stop()")],
+    ]
+
+
+def test_line_map_and_changed_ranges():
+    parsed = DiffParser.parse(DIFF)
+    assert parsed.line_map == {"x = 2": 2, "y = compute(x)": 3, "stop()": 22}
+    assert parsed.changed_line_ranges() == [(2, 3), (22, 22)]
+
+
+def test_hunk_ranges_cover_the_new_side():
+    parsed = DiffParser.parse(DIFF)
+    assert [hunk.new_range() for hunk in parsed.hunks] == [(1, 5), (21, 23)]
+
+
+def test_to_dict_keeps_the_legacy_shape():
+    data = DiffParser.parse_diff(DIFF)
+    assert data["total_chunks"] == 2
+    assert data["chunks"][1]["header"] == "@@ -20,2 +21,3 @@ def run():"
+    assert data["chunks"][1]["changes"] == [{"type": "add", "line": 22, "content": "stop()"}]
+
+
+def test_for_file_parses_once_and_caches():
+    file_info = {"diff": DIFF}
+    parsed = DiffParser.for_file(file_info)
+    assert isinstance(parsed, ParsedDiff)
+    assert DiffParser.for_file(file_info) is parsed
+    assert DiffParser.ensure_parsed(parsed) is parsed
+
+
+def test_find_line_for_code_accepts_text_or_parsed_diffs():
+    assert DiffParser.find_line_for_code(DIFF, "y = compute(x)") == 3
+    assert DiffParser.find_line_for_code(DiffParser.parse(DIFF), "    stop()") == 22
+    assert DiffParser.find_line_for_code(DIFF, "nothing similar here at all") is None
+
+
+def test_empty_diffs_parse_to_nothing():
+    parsed = DiffParser.ensure_parsed(None)
+    assert parsed.total_chunks == 0
+    assert parsed.changed_line_ranges() == []
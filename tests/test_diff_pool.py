@@ -0,0 +1,65 @@
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.settings import Settings
+from src.utils.diff_pool import DiffProcessPool, job_size
+
+
+def _diff(old_content, new_content, file_path):
+    return {"path": file_path, "size": len(old_content or "") + len(new_content or "")}
+
+
+class BrokenExecutor:
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def pool_settings(monkeypatch):
+    monkeypatch.setattr(Settings, "DIFF_PROCESS_POOL_ENABLED", True)
+    monkeypatch.setattr(Settings, "DIFF_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(Settings, "DIFF_PROCESS_MIN_BYTES", 10)
+    yield
+    DiffProcessPool._executor = None
+
+
+def test_job_size_ignores_missing_sides():
+    assert job_size((None, "abc", "/a.py")) == 3
+
+
+def test_small_batches_stay_in_process(pool_settings, monkeypatch):
+    monkeypatch.setattr(
+        DiffProcessPool, "get_executor", staticmethod(lambda: pytest.fail("pool used"))
+    )
+    jobs = [("a" * 20, "b", "/big.py"), ("x", "y", "/small.py")]
+    assert DiffProcessPool.compute(_diff, jobs) == [_diff(*job) for job in jobs]
+
+
+def test_broken_pool_falls_back_in_process_and_is_retired(pool_settings):
+    broken = BrokenExecutor()
+    DiffProcessPool._executor = broken
+    jobs = [("a" * 20, "b", "/one.py"), ("c" * 20, "d", "/two.py"), ("x", "y", "/small.py")]
+
+    assert DiffProcessPool.compute(_diff, jobs) == [_diff(*job) for job in jobs]
+    assert broken.shut_down
+    assert DiffProcessPool._executor is None
+
+
+def test_discard_leaves_a_replacement_pool_alone(pool_settings):
+    broken, replacement = BrokenExecutor(), BrokenExecutor()
+    DiffProcessPool._executor = replacement
+
+    DiffProcessPool.discard(broken)
+
+    assert DiffProcessPool._executor is replacement
+    assert not replacement.shut_down
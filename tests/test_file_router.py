@@ -0,0 +1,69 @@
+import pytest
+
+from src.settings import Settings
+from src.utils.file_router import AGENTS, route_files, score_file
+
+
+def _file(path, *added):
+    body = "\n".join(f"+{line}" for line in added)
+    return {
+        "path": path,
+        "change_type": "edit",
+        "additions": len(added),
+        "deletions": 0,
+        "diff": f"--- a{path}\n+++ b{path}\n@@ -1 +1,{len(added)} @@\n{body}",
+    }
+
+
+@pytest.fixture
+def routing(monkeypatch):
+    monkeypatch.setattr(Settings, "FILE_ROUTING_ENABLED", True)
+    monkeypatch.setattr(Settings, "FILE_ROUTING_MIN_SCORE", 1.0)
+
+
+def test_auth_code_scores_for_security():
+    scores = score_file(_file("/src/auth/login.py", "digest = hashlib.md5(password)"))
+    assert scores["security"] >= 2.0
+    assert set(scores) == set(AGENTS)
+
+
+def test_query_inside_a_loop_scores_for_performance():
+    scores = score_file(_file("/src/report.py", "for user in users:", "    cur.execute(query)"))
+    assert scores["performance"] >= 4.0
+
+
+def test_code_base_score_alone_does_not_route():
+    scores = score_file(_file("/src/constants.py", "LIMIT = 10"))
+    assert scores["logical"] < Settings.FILE_ROUTING_MIN_SCORE
+    assert scores["clean_code"] < Settings.FILE_ROUTING_MIN_SCORE
+
+
+def test_config_files_lean_towards_security():
+    assert score_file(_file("/deploy/app.yaml", "replicas: 2"))["security"] >= 1.0
+
+
+def test_route_files_sends_each_file_to_matching_agents(routing):
+    files = [
+        _file("/src/auth/login.py", "if not verify(password):", "    raise Denied()"),
+        _file("/src/report.py", "for user in users:", "    cur.execute(query)"),
+        _file("/docs/readme.md", "Texto novo"),
+        {"path": "/logo.png", "change_type": "add", "additions": 0, "deletions": 0,
+         "diff": "", "skipped_reason": "binary"},
+    ]
+    routes = route_files(files)
+    assert routes["security"] == [0]
+    assert routes["performance"] == [1]
+    assert 0 in routes["logical"]
+    assert 3 not in {position for routed in routes.values() for position in routed}
+
+
+def test_route_files_falls_back_when_nothing_matches(routing):
+    files = [_file("/docs/a.md", "texto"), _file("/docs/b.md", "mais texto")]
+    routes = route_files(files)
+    assert all(routes[agent] == [0, 1] for agent in AGENTS)
+
+
+def test_disabled_routing_sends_everything_everywhere(monkeypatch):
+    monkeypatch.setattr(Settings, "FILE_ROUTING_ENABLED", False)
+    files = [_file("/src/auth/login.py", "token = 1"), _file("/docs/a.md", "texto")]
+    assert route_files(files) == {agent: [0, 1] for agent in AGENTS}
@@ -0,0 +1,161 @@
+import shutil
+import subprocess
+
+import pytest
+
+from src.settings import Settings
+from src.utils.file_filters import SkippedBlob
+from src.utils import git_mirror
+from src.utils.git_mirror import GitMirrorError, GitMirrorManager
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+def _commit(repo, files, message):
+    for name, content in files.items():
+        path = repo / name
+        if content is None:
+            path.unlink()
+            continue
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(content, bytes):
+            path.write_bytes(content)
+        else:
+            path.write_text(content)
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-q", "-m", message)
+    return _git(repo, "rev-parse", "HEAD")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    path = tmp_path / "origin"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+
+    base = _commit(
+        path,
+        {
+            "app.py": "def main():\n    return 1\n",
+            "old_name.py": "".join(f"line {i}\n" for i in range(50)),
+            "gone.txt": "bye\n",
+        },
+        "base",
+    )
+    _git(path, "checkout", "-q", "-b", "feature")
+    _git(path, "mv", "old_name.py", "new_name.py")
+    source = _commit(
+        path,
+        {
+            "app.py": "def main():\n    return 2\n",
+            "gone.txt": None,
+            "big.py": "x" * 4096,
+            "logo.bin": b"\x89PNG\x00\x00binary",
+        },
+        "feature",
+    )
+    return path, base, source
+
+
+@pytest.fixture
+def mirror(repo, tmp_path):
+    path, _, _ = repo
+    return GitMirrorManager(remote_url=str(path), mirror_dir=str(tmp_path / "mirror.git"))
+
+
+def test_list_changes_reports_adds_deletes_and_edits(repo, mirror):
+    _, base, source = repo
+    mirror.sync([base, source])
+
+    changes = {c["item"]["path"]: c["changeType"] for c in mirror.list_changes(base, source)}
+
+    assert changes["/app.py"] == "edit"
+    assert changes["/gone.txt"] == "delete"
+    assert changes["/big.py"] == "add"
+    assert changes["/old_name.py"] == "delete"
+    assert changes["/new_name.py"] == "add"
+
+
+def test_read_blobs_skips_oversized_and_binary_blobs(repo, mirror, monkeypatch):
+    _, base, source = repo
+    mirror.sync([base, source])
+    monkeypatch.setattr(Settings, "MAX_FILE_BYTES", 1024)
+
+    ids = {c["item"]["path"]: c["item"]["objectId"] for c in mirror.list_changes(base, source)}
+    blobs = mirror.read_blobs([ids["/app.py"], ids["/big.py"], ids["/logo.bin"], "f" * 40])
+
+    assert blobs[ids["/app.py"]] == "def main():\n    return 2\n"
+    assert isinstance(blobs[ids["/big.py"]], SkippedBlob)
+    assert blobs[ids["/big.py"]].reason == "too_large"
+    assert blobs[ids["/logo.bin"]].reason == "binary"
+    assert "f" * 40 not in blobs
+
+
+def test_blob_sizes_uses_batch_check(repo, mirror):
+    _, base, source = repo
+    mirror.sync([base, source])
+
+    ids = {c["item"]["path"]: c["item"]["objectId"] for c in mirror.list_changes(base, source)}
+
+    assert mirror.blob_sizes([ids["/big.py"], "f" * 40]) == {ids["/big.py"]: 4096}
+
+
+def test_consolidated_changes_pair_renames_and_diff_edits(repo, mirror, monkeypatch):
+    _, base, source = repo
+    monkeypatch.setattr(Settings, "MAX_FILE_BYTES", 1024)
+    pr_info = {
+        "sourceRefName": "refs/heads/feature",
+        "targetRefName": "refs/heads/main",
+        "lastMergeSourceCommit": {"commitId": source},
+        "lastMergeTargetCommit": {"commitId": base},
+    }
+
+    pr_data = mirror.get_pr_consolidated_changes(7, pr_info)
+
+    files = {f["path"]: f for f in pr_data["files"]}
+    assert files["/app.py"]["additions"] == 1
+    assert files["/app.py"]["deletions"] == 1
+    assert "+    return 2" in files["/app.py"]["diff"]
+    assert files["/new_name.py"]["change_type"] == "renamed"
+    assert "/old_name.py" not in files
+    assert files["/big.py"]["skipped_reason"] == "too_large"
+    assert pr_data["cache_key"] == f"{base}..{source}"
+
+
+def test_diff_paths_splits_long_path_lists(repo, mirror, monkeypatch):
+    _, base, source = repo
+    mirror.sync([base, source])
+    monkeypatch.setattr(git_mirror, "MAX_PATHSPEC_BYTES", 8)
+    calls = []
+    run = mirror._git
+    monkeypatch.setattr(mirror, "_git", lambda *args, **kw: calls.append(args) or run(*args, **kw))
+
+    diffs = mirror.diff_paths(base, source, ["/missing.py", "/app.py", "/other.py"])
+
+    assert len(calls) == 3
+    assert set(diffs) == {"/app.py"}
+    assert diffs["/app.py"][1:] == (1, 1)
+
+
+def test_hung_git_commands_time_out(mirror, monkeypatch):
+    def hang(args, **kwargs):
+        assert kwargs["timeout"] == Settings.GIT_MIRROR_TIMEOUT_SECONDS
+        raise subprocess.TimeoutExpired(args, kwargs["timeout"])
+
+    monkeypatch.setattr(git_mirror.subprocess, "run", hang)
+
+    with pytest.raises(GitMirrorError, match="timed out"):
+        mirror.sync(["f" * 40])
+    assert mirror.get_pr_consolidated_changes(
+        7,
+        {"lastMergeSourceCommit": {"commitId": "a" * 40},
+         "lastMergeTargetCommit": {"commitId": "b" * 40}},
+    ) is None
@@ -0,0 +1,99 @@
+import pytest
+
+from src.core.nodes.aggregate_analyses_node import _carry_forward_findings
+from src.core.router import should_continue_or_end
+from src.utils.azure_requests import AzureManager
+
+ITERATIONS = [
+    {"id": 1, "sourceRefCommit": {"commitId": "c1"}},
+    {"id": 2, "sourceRefCommit": {"commitId": "c2"}},
+    {"id": 3, "sourceRefCommit": {"commitId": "c3"}},
+]
+
+
+@pytest.fixture
+def fake_azure(monkeypatch):
+    calls = {"iteration_changes": []}
+
+    def iteration_changes(pr_id, iteration_id, compare_to):
+        calls["iteration_changes"].append((iteration_id, compare_to))
+        return [
+            {"changeType": "edit", "item": {"path": "/app.py"}},
+            {"changeType": "edit", "item": {"path": "/src", "isFolder": True}},
+        ]
+
+    def fetch_file_changes(file_changes, common_commit, target_commit, max_workers=None):
+        calls["fetched"] = (common_commit, target_commit)
+        return [
+            {"path": c["item"]["path"], "additions": 1, "deletions": 0} for c in file_changes
+        ]
+
+    monkeypatch.setattr(AzureManager, "get_pr_info", staticmethod(lambda pr_id: {
+        "sourceRefName": "refs/heads/feature",
+        "targetRefName": "refs/heads/main",
+    }))
+    monkeypatch.setattr(AzureManager, "get_pr_iterations", staticmethod(lambda pr_id: ITERATIONS))
+    monkeypatch.setattr(AzureManager, "get_iteration_changes", staticmethod(iteration_changes))
+    monkeypatch.setattr(AzureManager, "fetch_file_changes", staticmethod(fetch_file_changes))
+    return calls
+
+
+def test_delta_is_taken_from_base_iteration_to_latest(fake_azure):
+    pr_data = AzureManager.get_pr_incremental_changes(1, "c1")
+
+    assert fake_azure["iteration_changes"] == [(3, 1)]
+    assert fake_azure["fetched"] == ("c1", "c3")
+    assert [f["path"] for f in pr_data["files"]] == ["/app.py"]
+    assert (pr_data["base_iteration_id"], pr_data["iteration_id"]) == (1, 3)
+
+
+def test_unknown_base_commit_disables_incremental(fake_azure):
+    assert AzureManager.get_pr_incremental_changes(1, "rewritten") is None
+
+
+def test_base_equal_to_latest_yields_empty_delta(fake_azure):
+    pr_data = AzureManager.get_pr_incremental_changes(1, "c3")
+
+    assert fake_azure["iteration_changes"] == []
+    assert pr_data["files"] == []
+    assert pr_data["incremental"] is True
+
+
+def test_empty_delta_skips_agents():
+    state = {"pr_data": {"incremental": True, "files": []}}
+
+    assert should_continue_or_end(state) == "publish_comments"
+    assert should_continue_or_end({"pr_data": {"files": []}}) == "reviewer_agent"
+    assert should_continue_or_end({"error": "falhou", **state}) == "END"
+
+
+def test_findings_on_untouched_files_are_carried_forward():
+    pr_data = {
+        "files": [{"path": "/app.py"}],
+        "previous_findings": {
+            "security_analysis": {"issues": [
+                {"file": "app.py", "line": 3, "description": "stale"},
+                {"file": "/lib/db.py", "line": 9, "description": "still valid"},
+                {"line": 1, "description": "no file"},
+            ]},
+        },
+    }
+    state = {"security_analysis": {"issues": [{"file": "/app.py", "line": 4}]}}
+
+    updates = _carry_forward_findings(state, pr_data)
+
+    issues = updates["security_analysis"]["issues"]
+    assert [i.get("description") for i in issues] == [None, "still valid"]
+    assert issues[1]["carried_forward"] is True
+    assert "carried_forward" not in issues[0]
+    assert set(updates) == {"security_analysis"}
+
+
+def test_empty_delta_carries_every_previous_finding():
+    previous = {"logical_analysis": {"issues": [{"file": "/a.py", "line": 1}]}}
+
+    updates = _carry_forward_findings({}, {"files": [], "previous_findings": previous})
+
+    assert updates["logical_analysis"]["issues"] == [
+        {"file": "/a.py", "line": 1, "carried_forward": True}
+    ]
@@ -0,0 +1,72 @@
+from src.utils.line_index import LineIndex, normalize_code_line
+
+
+def _index():
+    added = [
+        (10, "    total = compute_total(items)"),
+        (11, "    return total"),
+        (40, "    user = db.query(User).filter(User.id == user_id).first()"),
+    ]
+    return LineIndex(added=added, hunk_ranges=[(8, 14), (38, 42)])
+
+
+def test_normalize_code_line_collapses_whitespace():
+    assert normalize_code_line("  a =\t 1  ") == "a = 1"
+
+
+def test_exact_ignores_indentation():
+    assert _index().exact("total = compute_total(items)") == 10
+
+
+def test_fuzzy_matches_a_close_paraphrase():
+    assert _index().fuzzy("user = db.query(User).filter(User.id == uid).first()") == 40
+
+
+def test_fuzzy_rejects_unrelated_code():
+    assert _index().fuzzy("print('hello world')") is None
+
+
+def test_lookup_prefers_exact_over_fuzzy():
+    assert _index().lookup("\n    return total\n") == 11
+
+
+def test_snap_stays_within_the_containing_hunk():
+    index = _index()
+    assert index.snap(13) == 11
+    assert index.snap(38) == 40
+
+
+def test_snap_leaves_lines_far_from_any_hunk_alone():
+    assert _index().snap(25) == 25
+
+
+def test_snap_moves_near_misses_within_the_distance():
+    index = _index()
+    assert index.snap(16, max_distance=5) == 11
+    assert index.snap(16, max_distance=2) == 16
+
+
+def test_snap_keeps_lines_in_hunks_without_additions():
+    index = LineIndex(added=[(50, "x = 1")], hunk_ranges=[(5, 9), (50, 50)])
+    assert index.snap(7) == 7
+
+
+def test_resolve_uses_evidence_then_falls_back_to_snap():
+    index = _index()
+    assert index.resolve(13, "return total") == 11
+    assert index.resolve(12, "nothing like this") == 11
+    assert index.resolve(None, "return total") == 11
+    assert index.resolve(None, None) is None
+
+
+def test_resolve_strips_diff_markers_from_evidence():
+    assert _index().resolve(9, "+    total = compute_total(items)\n+    return total") == 10
+
+
+def test_resolve_ignores_evidence_far_from_the_reported_line():
+    added = [(5, "return None"), (80, "result = fetch()"), (81, "return None")]
+    index = LineIndex(added=added, hunk_ranges=[(3, 7), (78, 83)])
+    assert index.resolve(80, "return None") == 81
+    assert index.resolve(6, "return None") == 5
+    assert index.resolve(40, "return None") == 40
+    assert index.resolve(40, "+result = fetch_all()") == 40
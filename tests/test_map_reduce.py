@@ -0,0 +1,82 @@
+import logging
+
+import pytest
+
+from src.core.nodes.map_reduce import merge_issues, partition_shards, split_file_windows
+from src.settings import Settings
+from src.utils.context_packer import get_token_counter
+
+
+def _file(index, hunks):
+    body = "".join(
+        f"@@ -{k},1 +{k},1 @@\n-{'x' * 40}\n+{'y' * 40} {index}\n" for k in range(1, hunks + 1)
+    )
+    return {
+        "path": f"/f{index}.py",
+        "change_type": "edit",
+        "additions": hunks,
+        "deletions": hunks,
+        "diff": f"--- a/f{index}.py\n+++ b/f{index}.py\n{body}",
+    }
+
+
+@pytest.fixture
+def shard_settings(monkeypatch):
+    monkeypatch.setattr(Settings, "MAP_REDUCE_SHARD_TOKENS", 400)
+    monkeypatch.setattr(Settings, "MAP_REDUCE_MAX_SHARDS", 12)
+
+
+def test_small_files_are_not_split(shard_settings):
+    file_info = _file(0, 1)
+    assert split_file_windows(file_info, 400) == [file_info]
+
+
+def test_large_files_are_split_on_hunk_boundaries(shard_settings):
+    windows = split_file_windows(_file(0, 12), 150)
+    assert len(windows) > 1
+    assert [window["window"] for window in windows] == list(range(1, len(windows) + 1))
+    assert all(window["compact_diff"].startswith("--- a/f0.py") for window in windows)
+
+
+def test_every_shard_stays_within_budget(shard_settings):
+    files = [_file(index, 1 + index * 3) for index in range(8)]
+    shards = partition_shards(files, header="# PR")
+    count = get_token_counter().count
+
+    assert len(shards) > 1
+    assert all(count(shard.text) <= Settings.MAP_REDUCE_SHARD_TOKENS for shard in shards)
+    assert all(not shard.dropped_files for shard in shards)
+    packed = {path for shard in shards for path in shard.packed_files}
+    assert packed == {file_info["path"] for file_info in files}
+
+
+def test_shard_cap_drops_lowest_priority_sections(shard_settings, monkeypatch, caplog):
+    monkeypatch.setattr(Settings, "MAP_REDUCE_MAX_SHARDS", 2)
+    files = [_file(index, 1 + index * 3) for index in range(8)]
+
+    with caplog.at_level(logging.WARNING):
+        shards = partition_shards(files, header="# PR")
+
+    count = get_token_counter().count
+    assert len(shards) <= 2
+    assert all(count(shard.text) <= Settings.MAP_REDUCE_SHARD_TOKENS for shard in shards)
+    assert "/f7.py" in {path for shard in shards for path in shard.packed_files}
+    assert "Shard cap (2) reached" in caplog.text
+
+
+def test_files_without_diffs_produce_no_shards(shard_settings):
+    files = [{**_file(0, 1), "diff": "", "skipped_reason": "binary"}]
+    assert partition_shards(files) == []
+
+
+def test_merge_issues_keeps_the_highest_priority_duplicate():
+    merged = merge_issues([
+        [{"file": "app.py", "line": 3, "title": "SQL injection!", "priority": "Média"}],
+        [
+            {"file": "/app.py", "line": 3, "title": "sql  injection", "priority": "Crítica"},
+            {"file": "/app.py", "line": 9, "title": "SQL injection", "priority": "Baixa"},
+        ],
+    ])
+    assert sorted((issue["line"], issue["priority"]) for issue in merged) == [
+        (3, "Crítica"), (9, "Baixa")
+    ]
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.core.nodes.streaming_pipeline import RAGManager, StreamingPRPipeline
+from src.settings import Settings
+from src.utils.azure_requests import AzureManager
+
+BLOBS = {
+    "old-app": "def main():\n    return 1\n",
+    "new-app": "def main():\n    return 2\n",
+    "moved": "".join(f"value_{n} = compute({n})\n" for n in range(30)),
+    "moved-edited": "".join(f"value_{n} = compute({n})\n" for n in range(30)) + "extra = 1\n",
+    "fresh": "print('novo')\n",
+}
+
+PAGES = [
+    [
+        {"changeType": "edit", "item": {"path": "/app.py", "objectId": "new-app",
+                                        "originalObjectId": "old-app"}},
+        {"changeType": "delete", "item": {"path": "/old/util.py", "originalObjectId": "moved"}},
+        {"changeType": "delete", "item": {"path": "/old/core.py", "originalObjectId": "moved"}},
+    ],
+    [
+        {"changeType": "add", "item": {"path": "/new/util.py", "objectId": "moved"}},
+        {"changeType": "add", "item": {"path": "/new/core.py", "objectId": "moved-edited"}},
+        {"changeType": "add", "item": {"path": "/fresh.py", "objectId": "fresh"}},
+        {"changeType": "add", "item": {"path": "/logo.png", "objectId": "png"}},
+    ],
+]
+
+
+@pytest.fixture
+def fake_azure(monkeypatch):
+    monkeypatch.setattr(Settings, "RENAME_DETECTION_ENABLED", True)
+    monkeypatch.setattr(Settings, "BLOB_CACHE_ENABLED", False)
+    monkeypatch.setattr(Settings, "DIFF_PROCESS_POOL_ENABLED", False)
+    calls = {"pages": [], "fetched": []}
+
+    def pages(base_commit, target_commit):
+        for skip, changes in enumerate(PAGES):
+            calls["pages"].append(skip)
+            yield {"commonCommit": "common", "targetCommit": "source", "skip": skip,
+                   "truncated": False, "changes": changes}
+
+    def fetch_file_changes(file_changes, common_commit, target_commit, max_workers=None):
+        calls["fetched"].append(([c["item"]["path"] for c in file_changes], list(calls["pages"])))
+        return original(file_changes, common_commit, target_commit, max_workers)
+
+    def content(commit, path, object_id=None):
+        return BLOBS.get(object_id)
+
+    original = AzureManager.fetch_file_changes
+    monkeypatch.setattr(AzureManager, "get_pr_info", staticmethod(lambda pr_id: {
+        "sourceRefName": "refs/heads/feature",
+        "targetRefName": "refs/heads/main",
+        "lastMergeSourceCommit": {"commitId": "source"},
+        "lastMergeTargetCommit": {"commitId": "target"},
+    }))
+    monkeypatch.setattr(AzureManager, "iter_commit_diff_pages", staticmethod(pages))
+    monkeypatch.setattr(AzureManager, "fetch_file_changes", staticmethod(fetch_file_changes))
+    monkeypatch.setattr(AzureManager, "get_old_file_content", staticmethod(content))
+    monkeypatch.setattr(AzureManager, "get_target_file_content", staticmethod(content))
+    monkeypatch.setattr(AzureManager, "get_blobs_bulk", staticmethod(
+        lambda object_ids: {oid: BLOBS[oid] for oid in object_ids if oid in BLOBS}
+    ))
+    return calls
+
+
+def test_pages_are_diffed_as_they_arrive(fake_azure):
+    AzureManager.get_pr_consolidated_changes(1)
+
+    first, *rest = fake_azure["fetched"]
+    assert first == (["/app.py"], [0])
+    assert all(pages == [0, 1] for _, pages in rest)
+
+
+def test_renames_pair_across_pages(fake_azure):
+    pr_data = AzureManager.get_pr_consolidated_changes(1)
+
+    files = {f["path"]: f for f in pr_data["files"]}
+    assert files["/new/util.py"]["original_path"] in ("/old/util.py", "/old/core.py")
+    assert files["/new/core.py"]["change_type"] == "renamed"
+    assert "/old/util.py" not in files and "/old/core.py" not in files
+    assert files["/fresh.py"]["change_type"] == "added"
+    assert files["/app.py"]["additions"] == 1
+
+
+class FakeRAG:
+    def __init__(self):
+        self.chunks = []
+
+    def add_chunks(self, chunks):
+        self.chunks.extend(chunks)
+
+
+@pytest.mark.parametrize("bulk", [True, False])
+def test_streaming_and_staged_fetch_agree(fake_azure, monkeypatch, bulk):
+    monkeypatch.setattr(Settings, "AZURE_BULK_FETCH", bulk)
+    monkeypatch.setattr(RAGManager, "document_for_file", staticmethod(lambda file_info: None))
+    fields = ("path", "change_type", "original_path", "additions", "deletions", "diff",
+              "skipped_reason")
+
+    staged = AzureManager.get_pr_consolidated_changes(1)
+    streamed, _ = asyncio.run(StreamingPRPipeline(1, rag_manager=FakeRAG()).run())
+
+    def summary(pr_data):
+        return [tuple(f.get(field) for field in fields) for f in pr_data["files"]]
+
+    assert summary(streamed) == summary(staged)
+    files = {f["path"]: f for f in streamed["files"]}
+    assert files["/new/core.py"]["change_type"] == "renamed"
@@ -0,0 +1,64 @@
+from src.utils.rename_detection import (
+    build_rename_entry,
+    find_similar_renames,
+    is_pure_rename,
+    mark_renamed,
+    merge_exact_renames,
+)
+
+
+def _change(change_type, path, object_id=None, original_object_id=None):
+    item = {"path": path}
+    if object_id:
+        item["objectId"] = object_id
+    if original_object_id:
+        item["originalObjectId"] = original_object_id
+    return {"changeType": change_type, "item": item}
+
+
+def test_add_and_delete_of_the_same_blob_become_a_rename():
+    changes = [
+        _change("delete", "/old_name.py", original_object_id="blob-1"),
+        _change("edit", "/app.py", "blob-2", "blob-3"),
+        _change("add", "/new_name.py", object_id="blob-1"),
+    ]
+    merged = merge_exact_renames(changes)
+    assert [change["item"]["path"] for change in merged] == ["/app.py", "/new_name.py"]
+    rename = merged[1]
+    assert rename["changeType"] == "rename"
+    assert rename["originalPath"] == "/old_name.py"
+    assert is_pure_rename(rename)
+
+
+def test_unmatched_changes_are_left_alone():
+    changes = [_change("delete", "/a.py", original_object_id="x"), _change("add", "/b.py", "y")]
+    assert merge_exact_renames(changes) == changes
+
+
+def test_build_rename_entry_skips_the_diff():
+    change = {**_change("rename", "/new.py", "b", "b"), "originalPath": "/old.py"}
+    entry = build_rename_entry(change)
+    assert entry["original_path"] == "/old.py"
+    assert entry["skipped_reason"] == "renamed"
+
+
+def test_mark_renamed_rewrites_the_old_header():
+    result = mark_renamed({"path": "/new.py", "diff": "--- a/new.py\n+++ b/new.py\n@@"}, "/old.py")
+    assert result["diff"].startswith("--- a/old.py\n+++ b/new.py")
+    assert result["change_type"] == "renamed"
+
+
+def test_similar_content_pairs_best_match_first():
+    body = "\n".join(f"value_{n} = compute({n})" for n in range(20))
+    deleted = {0: body, 1: "completely = different\nunrelated = content\n"}
+    added = {5: body + "\nextra_line = 1", 6: "something = else\n"}
+    pairs = find_similar_renames(deleted, added, threshold=0.5)
+    assert [(old, new) for old, new, _ in pairs] == [(0, 5)]
+    assert pairs[0][2] > 0.9
+
+
+def test_similarity_threshold_rejects_weak_matches():
+    deleted = {0: "alpha_line = 1\nbeta_line = 2\ngamma_line = 3\ndelta_line = 4"}
+    added = {1: "alpha_line = 1\nother = 2\nmore = 3\nstuff = 4"}
+    assert find_similar_renames(deleted, added, threshold=0.5) == []
+    assert find_similar_renames(deleted, added, threshold=0.2) != []
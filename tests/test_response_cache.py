@@ -0,0 +1,48 @@
+from src.utils.response_cache import ResponseCache, normalize_url
+
+BASE = "https://dev.azure.com/org/project/_apis/git/repositories/repo"
+
+
+def test_normalize_url_lowercases_scheme_host_and_path_only():
+    assert normalize_url("HTTPS://Dev.Azure.com/Org/Repo?api-version=7.1-Preview#x") == (
+        "https://dev.azure.com/org/repo?api-version=7.1-Preview"
+    )
+
+
+def test_differently_cased_urls_share_an_entry():
+    cache = ResponseCache(max_entries=4)
+    cache.put(f"{BASE}/pullRequests/1?api-version=7.1", {"id": 1}, '"etag"', None)
+    shouting = "HTTPS://Dev.Azure.com/Org/Project/_apis/git/repositories/Repo"
+    entry = cache.get(f"{shouting}/PullRequests/1?api-version=7.1")
+    assert entry is not None and entry.body == {"id": 1}
+
+
+def test_invalidation_matches_regardless_of_case():
+    cache = ResponseCache(max_entries=4)
+    cache.put(f"{BASE}/pullRequests/1?api-version=7.1", {"id": 1}, None, None)
+    cache.put(f"{BASE}/pullRequests/1/threads?api-version=7.1", {"value": []}, None, None)
+    cache.put(f"{BASE}/pullRequests/2?api-version=7.1", {"id": 2}, None, None)
+
+    cache.invalidate_prefix(f"{BASE}/PullRequests/1/Threads?api-version=7.1")
+
+    assert cache.get(f"{BASE}/pullRequests/1/threads?api-version=7.1") is None
+    assert cache.get(f"{BASE}/pullRequests/1?api-version=7.1") is None
+    assert cache.get(f"{BASE}/pullRequests/2?api-version=7.1") is not None
+    assert cache.get_metrics()["invalidated"] == 2
+
+
+def test_invalidation_ignores_other_hosts():
+    cache = ResponseCache(max_entries=4)
+    cache.put("https://other.example.com/org/project/_apis/git", {}, None, None)
+    cache.invalidate_prefix(f"{BASE}/pullRequests/1/threads")
+    assert cache.get("https://other.example.com/org/project/_apis/git") is not None
+
+
+def test_entries_are_evicted_least_recently_used_first():
+    cache = ResponseCache(max_entries=2)
+    cache.put(f"{BASE}/a", 1, None, None)
+    cache.put(f"{BASE}/b", 2, None, None)
+    cache.get(f"{BASE}/a")
+    cache.put(f"{BASE}/c", 3, None, None)
+    assert cache.get(f"{BASE}/b") is None
+    assert cache.get(f"{BASE}/a").body == 1
@@ -0,0 +1,120 @@
+from src.utils.azure_requests import AzureManager
+from src.utils.thread_index import (
+    AGENT_TYPE_PROPERTY,
+    FINGERPRINT_PROPERTY,
+    IDEMPOTENCY_PROPERTY,
+    ThreadIndex,
+    comment_fingerprint,
+    location_key,
+)
+
+
+def _thread(message, file_path=None, line=None, agent_type="security", key="k"):
+    thread = {
+        "id": 1,
+        "comments": [{"content": message}],
+        "properties": {
+            IDEMPOTENCY_PROPERTY: {"$value": key},
+            AGENT_TYPE_PROPERTY: {"$value": agent_type},
+        },
+    }
+    if line is not None:
+        thread["threadContext"] = {"filePath": file_path, "rightFileStart": {"line": line}}
+    return thread
+
+
+def test_location_key_matches_how_threads_are_created():
+    assert location_key("src/app.py", 3) == ("/src/app.py", 3)
+    assert location_key("", None) == ("", None)
+    assert location_key("src/app.py", None) == ("", None)
+
+
+def test_pr_level_threads_are_found_as_duplicates():
+    index = ThreadIndex([_thread("Resumo geral")])
+    fingerprint = comment_fingerprint("resumo   GERAL")
+    assert index.find_duplicate("", None, fingerprint, "other") is not None
+
+
+def test_pr_level_threads_are_never_merged():
+    index = ThreadIndex([_thread("Resumo geral")])
+    assert index.find_updatable("", None, "security") is None
+
+
+def test_updates_require_the_same_agent():
+    index = ThreadIndex([_thread("SQL injection", "/app.py", 10, agent_type="security")])
+    assert index.find_updatable("app.py", 10, "security") is not None
+    assert index.find_updatable("app.py", 10, "performance") is None
+    assert index.find_updatable("app.py", 10, None) is None
+
+
+def test_added_threads_are_visible_to_later_lookups():
+    index = ThreadIndex([])
+    thread = _thread("N+1 query", "/repo.py", 4, agent_type="performance", key="abc")
+    thread["properties"][FINGERPRINT_PROPERTY] = {"$value": comment_fingerprint("N+1 query")}
+    index.add(thread)
+    assert index.find_duplicate("repo.py", 4, comment_fingerprint("n+1 QUERY"), "x") is thread
+    assert index.find_updatable("/repo.py", 4, "performance") is thread
+
+
+def test_threads_without_our_properties_are_not_updated():
+    foreign = {"id": 2, "comments": [{"content": "lgtm"}], "properties": {},
+               "threadContext": {"filePath": "/app.py", "rightFileStart": {"line": 1}}}
+    assert ThreadIndex([foreign]).find_updatable("app.py", 1, None) is None
+
+
+def test_every_fingerprint_of_a_replied_thread_is_a_duplicate():
+    thread = _thread("SQL injection", "/app.py", 10, key="k1,k2")
+    fingerprints = [comment_fingerprint("SQL injection"), comment_fingerprint("Ainda vulnerável")]
+    thread["properties"][FINGERPRINT_PROPERTY] = {"$value": ",".join(fingerprints)}
+    index = ThreadIndex([thread])
+
+    assert index.find_duplicate("app.py", 10, fingerprints[0], "x") is thread
+    assert index.find_duplicate("app.py", 10, fingerprints[1], "x") is thread
+    assert index.find_duplicate("app.py", 11, "other", "k1") is thread
+
+
+def test_attach_appends_key_and_fingerprint():
+    thread = _thread("SQL injection", "/app.py", 10, key="k1")
+    thread["properties"][FINGERPRINT_PROPERTY] = {"$value": "f1"}
+    index = ThreadIndex([thread])
+
+    merged = index.attach(thread, {IDEMPOTENCY_PROPERTY: "k2", FINGERPRINT_PROPERTY: "f2",
+                                   AGENT_TYPE_PROPERTY: "security"})
+
+    assert merged[IDEMPOTENCY_PROPERTY] == "k1,k2"
+    assert merged[FINGERPRINT_PROPERTY] == "f1,f2"
+    assert merged[AGENT_TYPE_PROPERTY] == "security"
+    assert index.find_duplicate("app.py", 10, "f1", "x") is thread
+    assert index.find_duplicate("app.py", 10, "f2", "x") is thread
+
+
+def test_a_thread_takes_one_reply_per_run():
+    thread = _thread("SQL injection", "/app.py", 10)
+    index = ThreadIndex([thread])
+
+    index.attach(thread, {IDEMPOTENCY_PROPERTY: "k2", FINGERPRINT_PROPERTY: "f2"})
+
+    assert index.find_updatable("app.py", 10, "security") is None
+
+
+def test_distinct_findings_on_one_line_stay_separate_threads(monkeypatch):
+    created = []
+
+    def create_pr_thread(pr_id, file_path, line_number, comment_text, properties):
+        created.append((comment_text, properties))
+        return {"id": len(created)}
+
+    monkeypatch.setattr(AzureManager, "get_pr_threads", staticmethod(lambda pr_id: []))
+    monkeypatch.setattr(AzureManager, "create_pr_thread", staticmethod(create_pr_thread))
+    comments = [
+        {"file": "app.py", "line": 10, "message": "SQL injection", "agent_type": "security"},
+        {"file": "app.py", "line": 10, "message": "Senha em texto puro", "agent_type": "security"},
+        {"file": "app.py", "line": 10, "message": "sql   INJECTION", "agent_type": "security"},
+    ]
+
+    stats = AzureManager.publish_analysis_comments(1, comments)
+
+    assert [text for text, _ in created] == ["SQL injection", "Senha em texto puro"]
+    assert stats["threads_created"] == [1, 2]
+    assert stats["skipped"] == 1
+    assert [c["thread_id"] for c in stats["published_comments"]] == [1, 2, 1]
@@ -0,0 +1,174 @@
+from email.utils import formatdate
+
+import pytest
+
+from src.settings import Settings
+from src.utils import http_client, throttling
+from src.utils.http_client import HttpClient
+from src.utils.throttling import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ThrottlingState,
+    parse_retry_after,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return FakeResponse(self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(throttling.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def client(monkeypatch):
+    state = ThrottlingState(failure_threshold=3, reset_timeout=30, initial_limit=4, max_limit=8)
+    monkeypatch.setattr(HttpClient, "_throttling", state)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(Settings, "AZURE_HTTP_MAX_RETRIES", 2)
+
+    def use(statuses):
+        session = FakeSession(statuses)
+        monkeypatch.setattr(HttpClient, "get_session", staticmethod(lambda: session))
+        return session, state
+
+    return use
+
+
+def test_breaker_opens_half_opens_and_closes(clock):
+    breaker = CircuitBreaker("dev.azure.com", failure_threshold=2, reset_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request()
+    assert error.value.retry_in == pytest.approx(30)
+
+    clock.now += 30
+    breaker.before_request()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_failed_trial_reopens_the_breaker(clock):
+    breaker = CircuitBreaker("dev.azure.com", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_released_trial_lets_another_request_probe(clock):
+    breaker = CircuitBreaker("dev.azure.com", failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+    breaker.before_request()
+
+    breaker.release_trial()
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+
+
+def test_retry_after_in_seconds():
+    assert parse_retry_after({"Retry-After": "7"}) == 7.0
+    assert parse_retry_after({"Retry-After": "-3"}) == 0.0
+    assert parse_retry_after({}) is None
+    assert parse_retry_after({"Retry-After": "amanhã"}) is None
+
+
+def test_retry_after_as_http_date():
+    in_two_minutes = formatdate(throttling.time.time() + 120, usegmt=True)
+    in_the_past = formatdate(throttling.time.time() - 120, usegmt=True)
+
+    assert parse_retry_after({"Retry-After": in_two_minutes}) == pytest.approx(120, abs=2)
+    assert parse_retry_after({"Retry-After": in_the_past}) == 0.0
+
+
+def test_limiter_halves_on_throttle_and_grows_additively():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, min_limit=1, max_limit=8)
+
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    for _ in range(3):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+    limiter.on_success()
+    assert limiter.limit == 2
+    limiter.on_success()
+    assert limiter.limit == 2
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+
+
+def test_retries_exhausted_returns_last_response(client):
+    session, _ = client([500])
+
+    response = HttpClient.request("GET", "https://dev.azure.com/org/_apis/x")
+
+    assert response.status_code == 500
+    assert session.calls == Settings.AZURE_HTTP_MAX_RETRIES + 1
+
+
+def test_throttling_429_does_not_open_the_breaker(client):
+    _, state = client([429, 429, 429, 200])
+    breaker = state.breaker_for("dev.azure.com")
+
+    HttpClient.request("GET", "https://dev.azure.com/org/_apis/x")
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert state.limiter.limit < 4
+
+
+def test_repeated_503_opens_the_breaker(client):
+    _, state = client([503])
+    breaker = state.breaker_for("dev.azure.com")
+
+    response = HttpClient.request("GET", "https://dev.azure.com/org/_apis/x")
+
+    assert response.status_code == 503
+    assert breaker.state == CircuitBreaker.OPEN